@@ -0,0 +1,113 @@
+"""
+Benchmark critical-path enumeration on synthetic organizations.
+
+Compares the single-pass DFS engine in ``src.graph_analysis`` against the
+previous all-pairs ``nx.all_simple_paths`` loop on the topologies produced
+by ``generate_data.py``.
+
+The legacy loop is O(|C| * |V|) path searches, so on large graphs it is
+timed on a sample of critical sources and extrapolated to the full set.
+Both engines are checked to produce identical paths on that sample.
+
+Usage:
+    python experiments/benchmark_critical_paths.py
+    python experiments/benchmark_critical_paths.py --sizes 1000 5000 --legacy-sources 20
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import networkx as nx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.hrg import HumanRiskGraph
+from src.graph_analysis import find_critical_paths
+from generate_data import generate_synthetic_organization
+
+
+def legacy_find_critical_paths(graph, critical_nodes, edge_types, cutoff=5):
+    """Reference implementation: one all_simple_paths call per (source, target)."""
+    critical_paths = []
+
+    for source in critical_nodes:
+        for target in graph.nodes():
+            if source == target:
+                continue
+
+            for path in nx.all_simple_paths(graph, source, target, cutoff=cutoff):
+                for i in range(len(path) - 1):
+                    if edge_types.get((path[i], path[i + 1])) == "approval":
+                        critical_paths.append(path)
+                        break
+
+    return critical_paths
+
+
+def benchmark(topology: str, size: int, legacy_sources: int, seed: int = 42) -> dict:
+    """Time both engines on one synthetic organization."""
+    people, dependencies = generate_synthetic_organization(size, topology, seed)
+    hrg = HumanRiskGraph(people, dependencies)
+    critical = [node for node, crit in hrg.criticality.items() if crit >= 0.7]
+
+    start = time.perf_counter()
+    paths = find_critical_paths(hrg.graph, set(critical), hrg.edge_types)
+    dfs_time = time.perf_counter() - start
+
+    sample = random.Random(seed).sample(critical, min(legacy_sources, len(critical)))
+
+    start = time.perf_counter()
+    legacy = legacy_find_critical_paths(hrg.graph, sample, hrg.edge_types)
+    legacy_sample_time = time.perf_counter() - start
+
+    assert find_critical_paths(hrg.graph, sample, hrg.edge_types) == legacy
+
+    legacy_time = legacy_sample_time * len(critical) / max(len(sample), 1)
+
+    return {
+        "topology": topology,
+        "nodes": size,
+        "edges": hrg.graph.number_of_edges(),
+        "critical": len(critical),
+        "paths": len(paths),
+        "dfs_s": dfs_time,
+        "legacy_s": legacy_time,
+        "speedup": legacy_time / dfs_time if dfs_time > 0 else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000])
+    parser.add_argument(
+        "--topologies", nargs="+", default=["hierarchical", "flat", "star", "random"]
+    )
+    parser.add_argument(
+        "--legacy-sources",
+        type=int,
+        default=10,
+        help="Critical sources to time the legacy loop on (default: 10)",
+    )
+    args = parser.parse_args()
+
+    header = f"{'topology':<13}{'nodes':>7}{'edges':>8}{'critical':>9}{'paths':>9}"
+    header += f"{'dfs (s)':>10}{'legacy (s)':>12}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for size in args.sizes:
+        for topology in args.topologies:
+            r = benchmark(topology, size, args.legacy_sources)
+            print(
+                f"{r['topology']:<13}{r['nodes']:>7}{r['edges']:>8}{r['critical']:>9}"
+                f"{r['paths']:>9}{r['dfs_s']:>10.3f}{r['legacy_s']:>12.2f}{r['speedup']:>9.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
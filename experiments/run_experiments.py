@@ -4,7 +4,6 @@ Run HRG experiments and collect results.
 Compares HRG metrics across different organizational topologies
 and validates against baseline methods.
 """
-import json
 import pandas as pd
 from pathlib import Path
 import sys
@@ -12,17 +11,10 @@ import sys
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.hrg import HumanRiskGraph
+from src.loaders import load_graph
 from src.graph_analysis import compute_betweenness_centrality
 
 
-def load_data(filename: str):
-    """Load organization data from JSON."""
-    with open(filename, 'r') as f:
-        data = json.load(f)
-    return data["people"], data["dependencies"]
-
-
 def run_experiment(data_file: str) -> dict:
     """
     Run HRG analysis on a dataset.
@@ -33,10 +25,8 @@ def run_experiment(data_file: str) -> dict:
     Returns:
         Dict with results
     """
-    people, dependencies = load_data(data_file)
-    
-    # Create HRG
-    hrg = HumanRiskGraph(people, dependencies)
+    # Create HRG, streaming the file instead of loading it whole
+    hrg = load_graph(data_file)
     
     # Calculate metrics
     results = hrg.calculate()
@@ -3,25 +3,79 @@ Human Risk Graph (HRG) - A quantitative model for organizational security risk.
 
 This package provides tools for modeling and analyzing security risks
 arising from human dependencies in organizations.
+
+Public names are imported on first access (PEP 562), so ``import src``
+and the CLI's ``--help`` do not load numpy or networkx.
 """
 
-from .hrg import HumanRiskGraph
-from .metrics import (
-    bus_factor_score,
-    decision_concentration_score,
-    bypass_risk_score,
-    composite_hrg_score,
-    interpret_risk_level,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.3"
 __author__ = "Aleksei Aleinikov"
 
+# Public name -> submodule defining it
+_EXPORTS = {
+    "HumanRiskGraph": ".hrg",
+    "AnalysisContext": ".context",
+    "CSRGraph": ".csr",
+    "EdgeType": ".encoding",
+    "GraphBuilder": ".loaders",
+    "load_graph": ".loaders",
+    "Snapshot": ".snapshot",
+    "load_snapshot": ".snapshot",
+    "save_snapshot": ".snapshot",
+    "NoiseModel": ".uncertainty",
+    "bus_factor_score": ".metrics",
+    "decision_concentration_score": ".metrics",
+    "bypass_risk_score": ".metrics",
+    "composite_hrg_score": ".metrics",
+    "interpret_risk_level": ".metrics",
+}
+
 __all__ = [
     "HumanRiskGraph",
+    "AnalysisContext",
+    "CSRGraph",
+    "EdgeType",
+    "GraphBuilder",
+    "load_graph",
+    "Snapshot",
+    "load_snapshot",
+    "save_snapshot",
+    "NoiseModel",
     "bus_factor_score",
     "decision_concentration_score",
     "bypass_risk_score",
     "composite_hrg_score",
     "interpret_risk_level",
 ]
+
+if TYPE_CHECKING:
+    from .hrg import HumanRiskGraph
+    from .context import AnalysisContext
+    from .csr import CSRGraph
+    from .encoding import EdgeType
+    from .loaders import GraphBuilder, load_graph
+    from .snapshot import Snapshot, load_snapshot, save_snapshot
+    from .uncertainty import NoiseModel
+    from .metrics import (
+        bus_factor_score,
+        decision_concentration_score,
+        bypass_risk_score,
+        composite_hrg_score,
+        interpret_risk_level,
+    )
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
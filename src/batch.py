@@ -0,0 +1,366 @@
+"""
+Batch analysis of many organization files on a pool of worker processes.
+
+Each worker imports the package once and then analyzes file after file,
+so a run over thousands of files does not pay interpreter start-up and
+import costs per file. A file that raises is recorded as an 'error' row,
+a worker that dies as 'crashed', and a file that exceeds the timeout has
+its worker killed and replaced ('timeout'); the rest of the run carries on.
+"""
+
+import csv
+import glob
+import json
+import multiprocessing
+import time
+from collections import Counter, deque
+from datetime import datetime
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .loaders import load_graph
+from .snapshot import SUFFIX as SNAPSHOT_SUFFIX
+from .snapshot import load_snapshot
+from .parallel import resolve_n_jobs
+from .reports import generate_html_report, generate_json_report, generate_markdown_report
+
+# Files picked up when a directory is given
+FILE_SUFFIXES = (".json", ".ndjson", ".jsonl", ".hrgs")
+
+# Columns of the fleet summary, in order
+SUMMARY_FIELDS = (
+    "file",
+    "status",
+    "error",
+    "people",
+    "dependencies",
+    "bus_factor",
+    "decision_concentration",
+    "bypass_risk",
+    "composite_score",
+    "risk_level",
+    "bypass_risk_method",
+    "approximate",
+    "seconds",
+    "reports",
+)
+
+REPORT_EXTENSIONS = {"json": ".json", "markdown": ".md", "html": ".html"}
+
+
+def find_org_files(target) -> List[Path]:
+    """
+    Expand a directory or glob pattern to organization files.
+
+    Args:
+        target: Directory (its files with a suffix in ``FILE_SUFFIXES``)
+            or glob pattern (``**`` matches subdirectories)
+
+    Returns:
+        Sorted list of file paths
+    """
+    path = Path(target)
+    if path.is_dir():
+        files = [p for p in path.iterdir() if p.is_file() and p.suffix.lower() in FILE_SUFFIXES]
+    else:
+        files = [Path(p) for p in glob.glob(str(target), recursive=True) if Path(p).is_file()]
+    return sorted(files)
+
+
+def _report_names(files: Sequence[Path]) -> List[str]:
+    """Unique report base names: the file stem, numbered when stems repeat."""
+    counts = Counter(path.stem for path in files)
+    seen: Counter = Counter()
+    names = []
+    for path in files:
+        seen[path.stem] += 1
+        suffix = f"_{seen[path.stem]}" if counts[path.stem] > 1 else ""
+        names.append(f"{path.stem}{suffix}")
+    return names
+
+
+def _failure(path, status: str, error: str, seconds: float) -> Dict:
+    row = dict.fromkeys(SUMMARY_FIELDS)
+    row.update(file=str(path), status=status, error=error, seconds=round(seconds, 3))
+    return row
+
+
+def _calculate(path, time_budget: Optional[float]) -> Tuple[Dict, int, int]:
+    """Results, people and dependency counts for one file."""
+    if Path(path).suffix.lower() == SNAPSHOT_SUFFIX:
+        # Metrics come from the mapped CSR arrays; no DiGraph is built
+        snapshot = load_snapshot(path)
+        results = snapshot.calculate(time_budget=time_budget)
+        return results, snapshot.n_people, snapshot.number_of_edges()
+    hrg = load_graph(path)
+    results = hrg.calculate(time_budget=time_budget)
+    return results, len(hrg.criticality), hrg.graph.number_of_edges()
+
+
+def analyze_file(
+    path,
+    output_dir,
+    report_name: str,
+    formats: Sequence[str] = ("json",),
+    time_budget: Optional[float] = None,
+) -> Dict:
+    """
+    Analyze one file and write its reports.
+
+    Exceptions are caught and returned as an 'error' row, so one bad file
+    cannot stop a batch.
+
+    Args:
+        path: Organization file (anything ``load_graph`` reads; snapshots
+            are analyzed on their CSR arrays, see ``Snapshot.calculate``)
+        output_dir: Directory for the reports
+        report_name: Base name of the reports ('<name>_report.<ext>')
+        formats: Report formats among 'json', 'markdown' and 'html'
+        time_budget: Seconds for ``calculate`` (default: no limit)
+
+    Returns:
+        Summary row with the keys in ``SUMMARY_FIELDS``
+    """
+    generators = {
+        "json": generate_json_report,
+        "markdown": generate_markdown_report,
+        "html": generate_html_report,
+    }
+    start = time.perf_counter()
+    try:
+        results, people, dependencies = _calculate(path, time_budget)
+
+        metadata = {
+            "input_file": str(Path(path).absolute()),
+            "analysis_date": datetime.now().isoformat(),
+            "organization_size": people,
+            "dependencies_count": dependencies,
+        }
+        reports = []
+        for fmt in formats:
+            output_file = Path(output_dir) / f"{report_name}_report{REPORT_EXTENSIONS[fmt]}"
+            output_file.write_text(generators[fmt](results, metadata))
+            reports.append(str(output_file))
+    except Exception as e:
+        return _failure(path, "error", f"{type(e).__name__}: {e}", time.perf_counter() - start)
+
+    return {
+        "file": str(path),
+        "status": "ok",
+        "error": None,
+        "people": metadata["organization_size"],
+        "dependencies": metadata["dependencies_count"],
+        "bus_factor": results["bus_factor"],
+        "decision_concentration": results["decision_concentration"],
+        "bypass_risk": results["bypass_risk"],
+        "composite_score": results["composite_score"],
+        "risk_level": results["risk_level"],
+        "bypass_risk_method": results.get("bypass_risk_method"),
+        "approximate": results.get("approximate", False),
+        "seconds": round(time.perf_counter() - start, 3),
+        "reports": ";".join(reports),
+    }
+
+
+def _worker_main(conn):
+    """Analyze tasks received on conn until told to stop."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        conn.send(analyze_file(*task))
+
+
+class _Worker:
+    """A worker process, its end of the pipe and the task it is running."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[int] = None
+        self.started = 0.0
+
+    def stop(self, kill: bool = False):
+        if not kill:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def _worker_row(worker: _Worker, path: str, ready, timeout: Optional[float], now: float):
+    """The row for a busy worker's task, or None while it is still within its timeout."""
+    if worker.conn in ready:
+        try:
+            return worker.conn.recv()
+        except EOFError:
+            worker.process.join()
+            error = f"Worker exited with code {worker.process.exitcode}"
+            return _failure(path, "crashed", error, now - worker.started)
+    if timeout is None or now - worker.started < timeout:
+        return None
+    return _failure(path, "timeout", f"Exceeded {timeout:g}s", now - worker.started)
+
+
+def _run_pool(
+    tasks: List[Tuple], n_jobs: int, timeout: Optional[float], finish: Callable[[int, Dict], None]
+):
+    """Feed tasks to worker processes, replacing any that crash or time out."""
+    context = multiprocessing.get_context()
+    pending = deque(enumerate(tasks))
+    workers = [_Worker(context) for _ in range(min(n_jobs, len(tasks)))]
+    try:
+        while True:
+            for worker in workers:
+                if worker.task is None and pending:
+                    worker.task, task = pending.popleft()
+                    worker.conn.send(task)
+                    worker.started = time.monotonic()
+            busy = {w: w.task for w in workers if w.task is not None}
+            if not busy:
+                break
+
+            wait_time = None
+            if timeout is not None:
+                now = time.monotonic()
+                wait_time = max(0.0, min(w.started + timeout - now for w in busy))
+            ready = wait([w.conn for w in busy], wait_time)
+
+            now = time.monotonic()
+            for worker, i in busy.items():
+                row = _worker_row(worker, tasks[i][0], ready, timeout, now)
+                if row is None:
+                    continue
+                worker.task = None
+                if row["status"] in ("crashed", "timeout"):
+                    worker.stop(kill=True)
+                    workers[workers.index(worker)] = _Worker(context)
+                finish(i, row)
+    finally:
+        for worker in workers:
+            worker.stop(kill=worker.task is not None)
+
+
+def run_batch(
+    files: Sequence,
+    output_dir,
+    formats: Sequence[str] = ("json",),
+    n_jobs: Optional[int] = None,
+    timeout: Optional[float] = None,
+    time_budget: Optional[float] = None,
+    callback: Optional[Callable[[Dict], None]] = None,
+) -> List[Dict]:
+    """
+    Analyze files on a pool of worker processes.
+
+    Without a timeout and with one job, files are analyzed in this process.
+    Otherwise each worker is a long-lived process fed one file at a time;
+    a worker still busy after ``timeout`` seconds is killed and replaced.
+
+    Args:
+        files: Organization files
+        output_dir: Directory for the reports (created if needed)
+        formats: Report formats among 'json', 'markdown' and 'html'
+        n_jobs: Worker processes (default: 1, -1 for all CPUs)
+        timeout: Seconds a single file may take (default: no limit)
+        time_budget: Seconds for each ``calculate``; results may then be
+            approximate instead of timing out
+        callback: Called with each row as it completes
+
+    Returns:
+        Summary rows (see ``analyze_file``) in the order of ``files``
+    """
+    unknown = set(formats) - set(REPORT_EXTENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown report formats: {sorted(unknown)}")
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive")
+    n_jobs = resolve_n_jobs(n_jobs)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = [Path(f) for f in files]
+    tasks = [
+        (str(path), str(output_dir), name, tuple(formats), time_budget)
+        for path, name in zip(paths, _report_names(paths))
+    ]
+    rows: Dict[int, Dict] = {}
+
+    def finish(i: int, row: Dict):
+        rows[i] = row
+        if callback is not None:
+            callback(row)
+
+    if n_jobs == 1 and timeout is None:
+        for i, task in enumerate(tasks):
+            finish(i, analyze_file(*task))
+    else:
+        _run_pool(tasks, n_jobs, timeout, finish)
+    return [rows[i] for i in range(len(tasks))]
+
+
+def summarize(rows: Sequence[Dict]) -> Dict:
+    """
+    Aggregate batch rows into fleet-level statistics.
+
+    Args:
+        rows: Summary rows from ``run_batch``
+
+    Returns:
+        Dict with file counts by status and risk level, composite score
+        statistics over the analyzed files and the ten highest-scoring files
+    """
+    ok = [row for row in rows if row["status"] == "ok"]
+    scores = [row["composite_score"] for row in ok]
+    highest = sorted(ok, key=lambda row: row["composite_score"], reverse=True)[:10]
+    return {
+        "files": len(rows),
+        "status_counts": dict(Counter(row["status"] for row in rows)),
+        "risk_levels": dict(Counter(row["risk_level"] for row in ok)),
+        "approximate": sum(1 for row in ok if row["approximate"]),
+        "mean_composite_score": sum(scores) / len(scores) if scores else None,
+        "max_composite_score": max(scores) if scores else None,
+        "highest_risk": [
+            {"file": row["file"], "composite_score": row["composite_score"]} for row in highest
+        ],
+    }
+
+
+def write_fleet_summary(rows: Sequence[Dict], output_dir) -> Tuple[Path, Path]:
+    """
+    Write the fleet summary as CSV (one row per file) and JSON (aggregates plus rows).
+
+    Args:
+        rows: Summary rows from ``run_batch``
+        output_dir: Directory for fleet_summary.csv and fleet_summary.json
+
+    Returns:
+        Tuple (csv_path, json_path)
+    """
+    output_dir = Path(output_dir)
+    csv_path = output_dir / "fleet_summary.csv"
+    json_path = output_dir / "fleet_summary.json"
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    summary = {
+        "generated_at": datetime.now().isoformat(),
+        **summarize(rows),
+        "results": list(rows),
+    }
+    json_path.write_text(json.dumps(summary, indent=2, default=str))
+    return csv_path, json_path
@@ -5,6 +5,9 @@ Usage:
     hrg analyze data/example_organization.json
     hrg analyze data/example_organization.json --format html
     hrg analyze data/example_organization.json --output report.html
+    hrg snapshot data/example_organization.json
+    hrg batch data/ --jobs -1 --output-dir hrg_reports
+    hrg serve --port 8765
 """
 
 import click
@@ -13,9 +16,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
-from src.hrg import HumanRiskGraph
-from src.reports import generate_json_report, generate_markdown_report, generate_html_report
-from src.visualization import generate_graph_visualization
+# Analysis, report and visualization modules are imported by the commands
+# that use them: numpy and networkx take longer to import than --help takes
+# to run, and pyvis alone takes longer than a small JSON-only analysis.
 
 
 @click.group()
@@ -25,6 +28,19 @@ def cli():
     pass
 
 
+def _echo_bypass_risk(results):
+    """Print the bypass risk summary line, noting how it was estimated."""
+    if results["bypass_risk"] is None:
+        click.echo("  • Bypass Risk Score: n/a (time budget ran out before any path was counted)")
+        return
+    click.echo(f"  • Bypass Risk Score: {results['bypass_risk']:.3f}")
+    if results.get("bypass_risk_method") == "sampled":
+        low, high = results["bypass_risk_ci"]
+        click.echo(f"    (sampled, 95% CI {low:.3f}-{high:.3f})")
+    elif results.get("bypass_risk_method") == "partial":
+        click.echo(f"    (partial, {results['coverage']:.0%} of critical people covered)")
+
+
 @cli.command()
 @click.argument("input_file", type=click.Path(exists=True))
 @click.option(
@@ -37,22 +53,37 @@ def cli():
 @click.option(
     "--visualize/--no-visualize", default=True, help="Generate graph visualization (default: True)"
 )
-def analyze(input_file, format, output, visualize):
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Worker processes for path enumeration and betweenness (-1: all CPUs)",
+)
+@click.option(
+    "--time-budget",
+    type=float,
+    default=None,
+    help="Seconds to spend on the analysis; bypass risk may then be approximate",
+)
+def analyze(input_file, format, output, visualize, jobs, time_budget):
     """
     Analyze an organization's human risk graph.
 
-    INPUT_FILE: JSON file containing organization data with people and dependencies.
+    INPUT_FILE: JSON file containing organization data with people and dependencies,
+    NDJSON (.ndjson/.jsonl) with one person or dependency per line, or a .hrgs
+    snapshot (see the snapshot command).
 
     Example:
         hrg analyze data/example_organization.json
         hrg analyze data/example_organization.json --format html --output report.html
     """
     click.echo(f"🔍 Analyzing: {input_file}")
+    from src.loaders import load_graph
 
-    # Load data
+    # Load data, streaming records straight into the graph
     try:
-        with open(input_file, "r") as f:
-            data = json.load(f)
+        hrg = load_graph(input_file)
     except json.JSONDecodeError as e:
         click.echo(f"❌ Error: Invalid JSON file - {e}", err=True)
         sys.exit(1)
@@ -60,16 +91,10 @@ def analyze(input_file, format, output, visualize):
         click.echo(f"❌ Error loading file: {e}", err=True)
         sys.exit(1)
 
-    # Validate data structure
-    if "people" not in data or "dependencies" not in data:
-        click.echo("❌ Error: JSON must contain 'people' and 'dependencies' keys", err=True)
-        sys.exit(1)
-
-    # Create HRG and run analysis
+    # Run analysis
     click.echo("⚙️  Running Human Risk Graph analysis...")
     try:
-        hrg = HumanRiskGraph(data["people"], data["dependencies"])
-        results = hrg.calculate()
+        results = hrg.calculate(n_jobs=jobs, time_budget=time_budget)
     except Exception as e:
         click.echo(f"❌ Analysis failed: {e}", err=True)
         sys.exit(1)
@@ -83,11 +108,13 @@ def analyze(input_file, format, output, visualize):
     metadata = {
         "input_file": str(input_path.absolute()),
         "analysis_date": datetime.now().isoformat(),
-        "organization_size": len(data["people"]),
-        "dependencies_count": len(data["dependencies"]),
+        "organization_size": len(hrg.criticality),
+        "dependencies_count": hrg.graph.number_of_edges(),
     }
 
     # Generate reports
+    from src.reports import generate_json_report, generate_markdown_report, generate_html_report
+
     formats_to_generate = ["json", "markdown", "html"] if format == "all" else [format]
     generated_files = []
 
@@ -119,8 +146,10 @@ def analyze(input_file, format, output, visualize):
     # Generate visualization
     if visualize:
         try:
+            from src.visualization import generate_graph_visualization
+
             viz_file = output_dir / f"{base_name}_graph.html"
-            generate_graph_visualization(hrg, results, str(viz_file))
+            generate_graph_visualization(hrg, results, str(viz_file), n_jobs=jobs)
             generated_files.append(str(viz_file))
             click.echo(f"✅ Generated: {viz_file}")
         except Exception as e:
@@ -133,7 +162,7 @@ def analyze(input_file, format, output, visualize):
     click.echo(f"Composite HRG Score: {results['composite_score']:.3f}")
     click.echo(f"  • Bus Factor Score: {results['bus_factor']:.3f}")
     click.echo(f"  • Decision Concentration: {results['decision_concentration']:.3f}")
-    click.echo(f"  • Bypass Risk Score: {results['bypass_risk']:.3f}")
+    _echo_bypass_risk(results)
 
     critical = results.get("articulation_points", [])
     if critical:
@@ -149,21 +178,27 @@ def analyze(input_file, format, output, visualize):
 @cli.command()
 @click.argument("input_file", type=click.Path(exists=True))
 @click.option("--output", type=click.Path(), help="Output HTML file")
-def visualize(input_file, output):
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Worker processes for path enumeration and betweenness (-1: all CPUs)",
+)
+def visualize(input_file, output, jobs):
     """
     Generate interactive graph visualization only.
 
-    INPUT_FILE: JSON file containing organization data.
+    INPUT_FILE: JSON, NDJSON or .hrgs snapshot file containing organization data.
     """
     click.echo(f"🎨 Generating visualization for: {input_file}")
+    from src.loaders import load_graph
+    from src.visualization import generate_graph_visualization
 
     # Load data
     try:
-        with open(input_file, "r") as f:
-            data = json.load(f)
-
-        hrg = HumanRiskGraph(data["people"], data["dependencies"])
-        results = hrg.calculate()
+        hrg = load_graph(input_file)
+        results = hrg.calculate(n_jobs=jobs)
 
         # Determine output file
         if output:
@@ -172,7 +207,7 @@ def visualize(input_file, output):
             input_path = Path(input_file)
             output_file = input_path.parent / f"{input_path.stem}_graph.html"
 
-        generate_graph_visualization(hrg, results, output_file)
+        generate_graph_visualization(hrg, results, output_file, n_jobs=jobs)
         click.echo(f"✅ Visualization saved: {output_file}")
 
     except Exception as e:
@@ -180,6 +215,234 @@ def visualize(input_file, output):
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("input_file", type=click.Path(exists=True))
+@click.argument("node_id")
+@click.option(
+    "--betweenness-samples",
+    type=click.IntRange(min=1),
+    help="Sample betweenness from this many pivot sources instead of computing it exactly",
+)
+@click.option(
+    "--betweenness-epsilon",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Sample betweenness adaptively until the error bound is at most this value",
+)
+@click.option("--seed", type=int, default=42, help="Random seed for sampling (default: 42)")
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Worker processes for path enumeration and betweenness (-1: all CPUs)",
+)
+def node(input_file, node_id, betweenness_samples, betweenness_epsilon, seed, jobs):
+    """
+    Analyze the risk contribution of a single person.
+
+    INPUT_FILE: JSON, NDJSON or .hrgs snapshot file containing organization data.
+    NODE_ID: ID of the person to analyze.
+
+    Example:
+        hrg node data/example_organization.json A --betweenness-samples 100
+    """
+    if betweenness_samples is not None and betweenness_epsilon is not None:
+        click.echo(
+            "❌ Error: --betweenness-samples and --betweenness-epsilon are exclusive", err=True
+        )
+        sys.exit(1)
+
+    from src.loaders import load_graph
+
+    try:
+        hrg = load_graph(input_file)
+        analysis = hrg.analyze_node(
+            node_id,
+            betweenness_k=betweenness_samples,
+            betweenness_epsilon=betweenness_epsilon,
+            seed=seed,
+            n_jobs=jobs,
+        )
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(json.dumps({"node_id": node_id, **analysis}, indent=2))
+
+
+@cli.command()
+@click.argument("input_file", type=click.Path(exists=True))
+@click.option("--output", type=click.Path(), help="Snapshot file (default: INPUT_FILE with .hrgs)")
+def snapshot(input_file, output):
+    """
+    Convert an organization file to a binary snapshot.
+
+    The other commands accept the .hrgs file in place of the JSON file and
+    skip parsing it.
+
+    INPUT_FILE: JSON or NDJSON file containing organization data.
+
+    Example:
+        hrg snapshot data/example_organization.json
+        hrg analyze data/example_organization.hrgs
+    """
+    from src.loaders import load_graph
+    from src.snapshot import SUFFIX as SNAPSHOT_SUFFIX
+    from src.snapshot import save_snapshot
+
+    output_file = Path(output) if output else Path(input_file).with_suffix(SNAPSHOT_SUFFIX)
+
+    try:
+        hrg = load_graph(input_file)
+        save_snapshot(hrg, output_file)
+    except json.JSONDecodeError as e:
+        click.echo(f"❌ Error: Invalid JSON file - {e}", err=True)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"✅ Snapshot saved: {output_file} ({len(hrg.criticality)} people, "
+        f"{hrg.graph.number_of_edges()} dependencies)"
+    )
+
+
+@cli.command()
+@click.argument("target")
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    default="hrg_reports",
+    help="Directory for per-file reports and the fleet summary (default: hrg_reports)",
+)
+@click.option(
+    "--format",
+    type=click.Choice(["json", "markdown", "html", "all", "none"], case_sensitive=False),
+    default="json",
+    help="Per-file report format (default: json)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Worker processes analyzing files in parallel (-1: all CPUs)",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=300.0,
+    help="Seconds before a file is abandoned and its worker replaced (default: 300)",
+)
+@click.option(
+    "--time-budget",
+    type=float,
+    default=None,
+    help="Seconds to spend on each analysis; bypass risk may then be approximate",
+)
+def batch(target, output_dir, format, jobs, timeout, time_budget):
+    """
+    Analyze many organization files in parallel.
+
+    TARGET: Directory (its .json, .ndjson, .jsonl and .hrgs files) or a glob
+    pattern such as 'orgs/**/*.json'.
+
+    Writes one report per file plus fleet_summary.csv and fleet_summary.json
+    to the output directory. Files that fail or time out are listed in the
+    summary and do not stop the run.
+
+    Example:
+        hrg batch data/ --jobs -1 --timeout 120
+        hrg batch 'orgs/**/*.ndjson' --format none --output-dir nightly
+    """
+    # Imported here so forked workers start with the analysis modules loaded
+    from src.batch import find_org_files, run_batch, summarize, write_fleet_summary
+
+    files = find_org_files(target)
+    if not files:
+        click.echo(f"❌ Error: No organization files match {target}", err=True)
+        sys.exit(1)
+
+    formats = {"all": ["json", "markdown", "html"], "none": []}.get(format, [format])
+    click.echo(f"🔍 Analyzing {len(files)} file(s)...")
+
+    def report(row):
+        if row["status"] == "ok":
+            click.echo(f"✅ {row['file']}: {row['composite_score']:.3f} ({row['risk_level']})")
+        else:
+            click.echo(f"❌ {row['file']}: {row['status']} - {row['error']}", err=True)
+
+    try:
+        rows = run_batch(
+            files,
+            output_dir,
+            formats=formats,
+            n_jobs=jobs,
+            timeout=timeout,
+            time_budget=time_budget,
+            callback=report,
+        )
+    except ValueError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    csv_path, json_path = write_fleet_summary(rows, output_dir)
+    summary = summarize(rows)
+
+    click.echo("\n" + "=" * 60)
+    click.echo("📊 FLEET SUMMARY")
+    click.echo("=" * 60)
+    for status, count in sorted(summary["status_counts"].items()):
+        click.echo(f"  • {status}: {count}")
+    if summary["mean_composite_score"] is not None:
+        click.echo(f"Mean Composite HRG Score: {summary['mean_composite_score']:.3f}")
+        for level, count in sorted(summary["risk_levels"].items()):
+            click.echo(f"  • {level}: {count}")
+    click.echo(f"\n✅ Fleet summary: {csv_path}, {json_path}")
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+@click.option("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Worker processes running analyses (-1: all CPUs)",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=8,
+    help="Organizations kept parsed between requests (default: 8)",
+)
+def serve(host, port, jobs, cache_size):
+    """
+    Run a local HTTP server that keeps organizations parsed between requests.
+
+    Upload a file once with POST /graphs and query it with
+    GET /graphs/<graph_id>/calculate, /nodes/<id> or /removal/<id>, or send
+    it to POST /calculate in one step. See src/server.py for the full API.
+
+    Example:
+        hrg serve --port 8765 --jobs 2
+        curl --data-binary @data/example_organization.json localhost:8765/calculate
+    """
+    from src.server import run_server
+
+    def ready(server):
+        click.echo(f"🚀 Serving on http://{host}:{server.port} ({server.n_jobs} worker(s))")
+
+    try:
+        run_server(host, port, n_jobs=jobs, cache_size=cache_size, ready=ready)
+    except KeyboardInterrupt:
+        click.echo("👋 Server stopped")
+    except (OSError, ValueError) as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+
+
 def main():
     """Entry point for CLI."""
     cli()
@@ -0,0 +1,548 @@
+"""
+Shared analysis context for Human Risk Graph.
+
+This module caches graph artifacts that several metrics derive from the
+same graph (undirected view, articulation points, betweenness centrality,
+bypass index, per-source path counts), so they are computed once per graph
+version. Small edits can patch the cached artifacts instead of dropping them.
+"""
+
+import networkx as nx
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple, overload
+
+from .graph_analysis import (
+    BypassIndex,
+    approximate_betweenness_centrality,
+    betweenness_error_bound,
+    build_bypass_index,
+    compute_betweenness_centrality,
+    find_articulation_points,
+)
+from .store import EdgeStore
+
+# Artifacts that apply_edge_changes() and friends patch in place; all other
+# artifacts are dropped when the graph is edited.
+_MAINTAINED = ("undirected", "articulation_points", "bypass_index", "path_counts")
+
+# Key stored in ``graph.__networkx_cache__``. NetworkX clears that cache on
+# every structural mutation, so a missing token means the graph changed.
+_CACHE_TOKEN_KEY = "hrg_analysis_context"
+
+
+class AnalysisContext:
+    """
+    Cache of derived artifacts for one graph.
+
+    Artifacts are computed lazily on first access and reused until the
+    graph changes. Given the graph's EdgeStore, every edit that goes through
+    it (including retypes and reweights) is detected from its version
+    counter. Structural edits are also detected through NetworkX's
+    per-graph cache, which is cleared by every node/edge mutation; on
+    NetworkX versions without it, the node and edge counts are compared
+    instead, which misses edge swaps.
+
+    Example:
+        >>> context = AnalysisContext(hrg.graph, hrg.edge_types)
+        >>> articulation_points = context.articulation_points
+    """
+
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        edge_types: Optional[Mapping[Tuple[str, str], str]] = None,
+        store: Optional[EdgeStore] = None,
+    ):
+        """
+        Initialize an analysis context.
+
+        Args:
+            graph: NetworkX directed graph
+            edge_types: Dict mapping (u, v) -> edge type (needed for bypass_index)
+            store: EdgeStore holding the graph's edges, whose ``version`` is
+                then checked as well (default: none)
+        """
+        self.graph = graph
+        self.edge_types = edge_types
+        self.store = store
+        self._artifacts: Dict[Hashable, Any] = {}
+        self._token: Optional[object] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._version: Optional[int] = None
+        self._stamp()
+
+    def _stamp(self):
+        """Record the graph version the cached artifacts belong to."""
+        if self.store is not None:
+            self._version = self.store.version
+        cache = getattr(self.graph, "__networkx_cache__", None)
+        if cache is not None:
+            self._token = cache.setdefault(_CACHE_TOKEN_KEY, object())
+        else:
+            self._signature = (self.graph.number_of_nodes(), self.graph.number_of_edges())
+
+    def is_stale(self) -> bool:
+        """Return True if the graph changed since the artifacts were computed."""
+        if self.store is not None and self.store.version != self._version:
+            return True
+        cache = getattr(self.graph, "__networkx_cache__", None)
+        if cache is not None:
+            return cache.get(_CACHE_TOKEN_KEY) is not self._token
+        return self._signature != (self.graph.number_of_nodes(), self.graph.number_of_edges())
+
+    def invalidate(self):
+        """Drop all cached artifacts."""
+        self._artifacts.clear()
+        self._stamp()
+
+    def _get(self, key: Hashable, compute):
+        if self.is_stale():
+            self.invalidate()
+        if key not in self._artifacts:
+            self._artifacts[key] = compute()
+        return self._artifacts[key]
+
+    def is_current(self) -> bool:
+        """Return True if artifacts are cached and match the graph."""
+        return bool(self._artifacts) and not self.is_stale()
+
+    @property
+    def undirected(self) -> nx.Graph:
+        """Undirected copy of the graph."""
+        return self._get("undirected", self.graph.to_undirected)
+
+    @property
+    def articulation_points(self) -> Set[str]:
+        """Articulation points of the undirected graph."""
+        return self._get(
+            "articulation_points",
+            lambda: find_articulation_points(self.graph, undirected=self.undirected),
+        )
+
+    @property
+    def betweenness(self) -> Dict[str, float]:
+        """Exact betweenness centrality of every node."""
+        return self.betweenness_centrality()[0]
+
+    def betweenness_centrality(
+        self,
+        k: Optional[int] = None,
+        epsilon: Optional[float] = None,
+        delta: float = 0.1,
+        seed: int = 42,
+        n_jobs: Optional[int] = None,
+    ) -> Tuple[Dict[str, float], Dict]:
+        """
+        Exact or sampled betweenness centrality with its error bound.
+
+        Args:
+            k: Number of pivot sources to sample (see compute_betweenness_centrality)
+            epsilon: Target error for adaptive sampling
+                (see approximate_betweenness_centrality)
+            delta: Failure probability of the reported bound (default 0.1)
+            seed: Random seed for pivot sampling (default 42)
+            n_jobs: Worker processes for exact betweenness (default: serial)
+
+        Returns:
+            Tuple (scores, info) where info contains method ('exact', 'pivots'
+            or 'adaptive'), samples, epsilon and delta
+        """
+        if k is not None and epsilon is not None:
+            raise ValueError("Specify at most one of k and epsilon")
+
+        if epsilon is not None:
+            return self._get(
+                ("betweenness", "adaptive", epsilon, delta, seed),
+                lambda: approximate_betweenness_centrality(self.graph, epsilon, delta, seed),
+            )
+
+        n = self.graph.number_of_nodes()
+        if k is None or k >= n:
+            key: Tuple = ("betweenness", "exact", n_jobs not in (None, 1))
+            info = {"method": "exact", "samples": n, "epsilon": 0.0, "delta": delta}
+        else:
+            key = ("betweenness", "pivots", k, seed)
+            info = {
+                "method": "pivots",
+                "samples": k,
+                "epsilon": betweenness_error_bound(n, k, delta),
+                "delta": delta,
+            }
+        scores = self._get(
+            key, lambda: compute_betweenness_centrality(self.graph, k, seed, n_jobs=n_jobs)
+        )
+        return scores, info
+
+    def _typed_edges(self) -> Mapping[Tuple[str, str], str]:
+        """edge_types, which the bypass index and path counts need."""
+        if self.edge_types is None:
+            raise ValueError("bypass_index requires edge_types")
+        return self.edge_types
+
+    @property
+    def bypass_index(self) -> BypassIndex:
+        """Bypass shortcut index (see ``build_bypass_index``)."""
+        edge_types = self._typed_edges()
+        return self._get("bypass_index", lambda: build_bypass_index(self.graph, edge_types))
+
+    @overload
+    def source_path_counts(
+        self, sources: Iterable[str], n_jobs: Optional[int] = None, path_limit: None = None
+    ) -> Dict[str, Tuple[int, int]]: ...
+
+    @overload
+    def source_path_counts(
+        self, sources: Iterable[str], n_jobs: Optional[int] = None, path_limit: Optional[int] = None
+    ) -> Optional[Dict[str, Tuple[int, int]]]: ...
+
+    def source_path_counts(
+        self,
+        sources: Iterable[str],
+        n_jobs: Optional[int] = None,
+        path_limit: Optional[int] = None,
+    ) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Critical and bypassable path counts per source node.
+
+        Counts are cached per source, so calls with different critical
+        thresholds share work, and graph edits only recount the sources
+        near the edit (see ``apply_edge_changes``).
+
+        Args:
+            sources: Source node IDs
+            n_jobs: Worker processes for counting uncached sources (default: serial)
+            path_limit: Give up once the sources have more critical paths
+                than this (default: no limit)
+
+        Returns:
+            Dict mapping source -> (bypassable_count, total_count), or None
+            if the total path count exceeds path_limit
+        """
+        from .metrics import _iter_source_path_counts
+
+        if path_limit is not None:
+            bounded, finished = self.bounded_path_counts(sources, n_jobs, path_limit)
+            return bounded if finished else None
+
+        cache = self._get("path_counts", dict)
+        sources = list(sources)
+        missing = [source for source in sources if source not in cache]
+        if missing:
+            bypass_index = self.bypass_index
+            edge_types = self._typed_edges()
+            counts: Iterable[Tuple[str, int, int]]
+            if n_jobs is not None and n_jobs != 1:
+                from .parallel import parallel_path_counts
+
+                counts = parallel_path_counts(self.graph, missing, edge_types, n_jobs, bypass_index)
+            else:
+                counts = _iter_source_path_counts(self.graph, missing, edge_types, bypass_index)
+            for source, bypassable, total in counts:
+                cache[source] = (bypassable, total)
+        return {source: cache[source] for source in sources}
+
+    def bounded_path_counts(
+        self,
+        sources: Iterable[str],
+        n_jobs: Optional[int] = None,
+        path_limit: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[Dict[str, Tuple[int, int]], bool]:
+        """
+        Path counts per source, stopping at a path limit or a deadline.
+
+        Like ``source_path_counts``, but counting stops once the sources
+        have more than ``path_limit`` critical paths or when ``deadline``
+        (a ``time.monotonic()`` value) passes, even inside a single source.
+        Sources counted in full are cached either way.
+
+        Args:
+            sources: Source node IDs
+            n_jobs: Worker processes for counting uncached sources (default: serial)
+            path_limit: Maximum total number of critical paths (default: no limit)
+            deadline: ``time.monotonic()`` value to stop at (default: none)
+
+        Returns:
+            Tuple (counts, finished): dict mapping each source counted in
+            full -> (bypassable_count, total_count), and whether every
+            source was counted within the limits
+        """
+        from .metrics import _bounded_path_counts
+
+        cache = self._get("path_counts", dict)
+        sources = list(sources)
+        missing = [source for source in sources if source not in cache]
+        budget = None
+        if path_limit is not None:
+            budget = path_limit - sum(cache[source][1] for source in sources if source in cache)
+            if budget < 0:
+                return {source: cache[source] for source in sources if source in cache}, False
+
+        finished = True
+        if missing:
+            bypass_index = self.bypass_index
+            edge_types = self._typed_edges()
+            if n_jobs is not None and n_jobs != 1:
+                from .parallel import parallel_bounded_path_counts
+
+                counts, finished = parallel_bounded_path_counts(
+                    self.graph, missing, edge_types, n_jobs, bypass_index, budget, deadline
+                )
+            else:
+                counts, finished = _bounded_path_counts(
+                    self.graph, missing, edge_types, bypass_index, budget, deadline
+                )
+            for source, bypassable, total in counts:
+                cache[source] = (bypassable, total)
+        return {source: cache[source] for source in sources if source in cache}, finished
+
+    def _restamp(self):
+        """Keep maintained artifacts after an edit and drop the rest."""
+        for key in list(self._artifacts):
+            if key not in _MAINTAINED:
+                del self._artifacts[key]
+        self._stamp()
+
+    def apply_node_added(self, node: str):
+        """
+        Patch cached artifacts after an isolated node was added to the graph.
+
+        Call only if ``is_current()`` was True before the edit.
+        """
+        undirected = self._artifacts.get("undirected")
+        if undirected is not None:
+            undirected.add_node(node)
+        self._restamp()
+
+    def apply_node_removed(self, node: str):
+        """
+        Patch cached artifacts after an isolated node was removed from the graph.
+
+        Remove the node's edges first (see ``apply_edge_changes``). Call only
+        if ``is_current()`` was True before the edit.
+        """
+        undirected = self._artifacts.get("undirected")
+        if undirected is not None and node in undirected:
+            undirected.remove_node(node)
+        articulation_points = self._artifacts.get("articulation_points")
+        if articulation_points is not None:
+            articulation_points.discard(node)
+        path_counts = self._artifacts.get("path_counts")
+        if path_counts is not None:
+            path_counts.pop(node, None)
+        self._restamp()
+
+    def apply_edge_changes(self, edges: Iterable[Tuple[str, str]], cutoff: int = 5):
+        """
+        Patch cached artifacts after edges were added, removed or retyped.
+
+        Call right after the graph and ``edge_types`` were edited, and only
+        if ``is_current()`` was True before the edit. Work is limited to
+        the neighbourhood of the edited edges:
+        - articulation points are recomputed for the affected components,
+          and not at all when the undirected adjacency did not change
+        - bypass index entries are recomputed for shortcuts through the edge
+        - path counts are dropped for sources within ``cutoff`` hops of an
+          endpoint, the only sources whose critical paths can change
+
+        Args:
+            edges: Edited (u, v) pairs
+            cutoff: Maximum critical path length in edges (default 5)
+        """
+        edges = list(edges)
+        graph = self.graph
+        undirected = self._artifacts.get("undirected")
+        articulation_points = self._artifacts.get("articulation_points")
+        bypass_index = self._artifacts.get("bypass_index")
+        path_counts = self._artifacts.get("path_counts")
+
+        if undirected is not None:
+            changed = _patch_undirected(undirected, graph, edges, articulation_points)
+            if articulation_points is not None and changed:
+                _patch_articulation_points(articulation_points, undirected, changed)
+        elif articulation_points is not None:
+            del self._artifacts["articulation_points"]
+
+        if bypass_index is not None:
+            _patch_bypass_index(bypass_index, graph, self._typed_edges(), edges)
+
+        if path_counts:
+            for source in _reverse_neighbourhood(
+                graph, {n for edge in edges for n in edge}, cutoff
+            ):
+                path_counts.pop(source, None)
+
+        self._restamp()
+
+
+def _patch_undirected(
+    undirected: nx.Graph,
+    graph: nx.DiGraph,
+    edges: List[Tuple[str, str]],
+    articulation_points: Optional[Set[str]],
+) -> Set[str]:
+    """
+    Bring the undirected view in line with the edited edges.
+
+    New leaves are added to ``articulation_points`` directly.
+
+    Returns:
+        Endpoints of the other undirected edges that appeared or disappeared,
+        whose components need their articulation points recomputed
+    """
+    changed: Set[str] = set()
+    for u, v in edges:
+        linked = graph.has_edge(u, v) or graph.has_edge(v, u)
+        if linked and not undirected.has_edge(u, v):
+            isolated = [node for node in (u, v) if not undirected.adj[node]]
+            undirected.add_edge(u, v)
+            if u != v and len(isolated) == 1 and articulation_points is not None:
+                # A new leaf only makes its neighbour a cut vertex
+                (leaf,) = isolated
+                anchor = v if leaf == u else u
+                if len(undirected.adj[anchor]) - (anchor in undirected.adj[anchor]) > 1:
+                    articulation_points.add(anchor)
+            else:
+                changed.update((u, v))
+        elif not linked and undirected.has_edge(u, v):
+            undirected.remove_edge(u, v)
+            changed.update((u, v))
+    return changed
+
+
+def _patch_articulation_points(
+    articulation_points: Set[str], undirected: nx.Graph, changed: Set[str]
+):
+    """Recompute the articulation points of the components containing changed nodes."""
+    seen: Set[str] = set()
+    for node in changed:
+        if node in seen:
+            continue
+        points, component = _component_articulation_points(undirected.adj, node)
+        seen |= component
+        articulation_points -= component
+        articulation_points |= points
+
+
+def _patch_bypass_index(
+    bypass_index: BypassIndex,
+    graph: nx.DiGraph,
+    edge_types: Mapping,
+    edges: List[Tuple[str, str]],
+):
+    """Recompute the bypass index entries of shortcuts through the edited edges."""
+    # Edited edges are candidate legs too, in case both legs were removed
+    out_edited: Dict[str, Set[str]] = {}
+    in_edited: Dict[str, Set[str]] = {}
+    for u, v in edges:
+        out_edited.setdefault(u, set()).add(v)
+        in_edited.setdefault(v, set()).add(u)
+    for u, v in edges:
+        heads = set(graph.succ[v]) | out_edited.get(v, set()) | {v}
+        tails = set(graph.pred[u]) | in_edited.get(u, set()) | {u}
+        _update_bypass_index(bypass_index, graph, edge_types, u, v, heads, tails)
+
+
+def _update_bypass_index(
+    bypass_index: BypassIndex,
+    graph: nx.DiGraph,
+    edge_types: Mapping,
+    u: str,
+    v: str,
+    heads: Set[str],
+    tails: Set[str],
+):
+    """
+    Recompute the bypass index entries that depend on edge (u, v).
+
+    ``heads`` must include every w with a (current or just removed) edge
+    v -> w, and ``tails`` every t with an edge t -> u.
+    """
+    if graph.has_edge(u, v) and edge_types.get((u, v)) == "bypass":
+        bypass_index.direct.add((u, v))
+    else:
+        bypass_index.direct.discard((u, v))
+
+    def is_shortcut(a, m, c):
+        return (
+            graph.has_edge(a, m)
+            and graph.has_edge(m, c)
+            and (edge_types.get((a, m)) == "bypass" or edge_types.get((m, c)) == "bypass")
+        )
+
+    def set_entry(pair, mid, present):
+        mids = bypass_index.two_hop.get(pair)
+        if present:
+            if mids is None:
+                bypass_index.two_hop[pair] = {mid}
+            else:
+                mids.add(mid)
+        elif mids is not None:
+            mids.discard(mid)
+            if not mids:
+                del bypass_index.two_hop[pair]
+
+    # u -> v -> w through v, and t -> u -> v through u
+    for w in heads:
+        set_entry((u, w), v, is_shortcut(u, v, w))
+    for t in tails:
+        set_entry((t, v), u, is_shortcut(t, u, v))
+
+
+def _component_articulation_points(adj, root: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Articulation points of the connected component containing ``root``.
+
+    Iterative Tarjan DFS over an undirected adjacency mapping; it visits
+    only the component, so edits elsewhere in the graph cost nothing.
+
+    Returns:
+        Tuple (articulation_points, component_nodes)
+    """
+    disc = {root: 0}
+    low = {root: 0}
+    parent: Dict[str, Optional[str]] = {root: None}
+    points: Set[str] = set()
+
+    stack = [(root, iter(adj[root]))]
+    while stack:
+        v, neighbours = stack[-1]
+        for w in neighbours:
+            if w == v:
+                continue
+            if w not in disc:
+                parent[w] = v
+                disc[w] = low[w] = len(disc)
+                stack.append((w, iter(adj[w])))
+                break
+            if w != parent[v] and disc[w] < low[v]:
+                low[v] = disc[w]
+        else:
+            stack.pop()
+            p = parent[v]
+            if p is None:
+                continue
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if p != root and low[v] >= disc[p]:
+                points.add(p)
+
+    # The root is a cut vertex if it has several DFS tree children
+    if sum(1 for p in parent.values() if p == root) >= 2:
+        points.add(root)
+    return points, set(disc)
+
+
+def _reverse_neighbourhood(graph: nx.DiGraph, seeds: Set[str], depth: int) -> Set[str]:
+    """Nodes with a path of at most ``depth`` edges to any seed, seeds included."""
+    seen = {node for node in seeds if node in graph}
+    frontier = deque((node, 0) for node in seen)
+    while frontier:
+        node, dist = frontier.popleft()
+        if dist == depth:
+            continue
+        for pred in graph.pred[node]:
+            if pred not in seen:
+                seen.add(pred)
+                frontier.append((pred, dist + 1))
+    return seen
@@ -0,0 +1,388 @@
+"""
+Compact integer-indexed graph backend for Human Risk Graph.
+
+``CSRGraph`` stores a dependency graph as NumPy arrays instead of a
+NetworkX dict-of-dicts: node IDs are interned to integers, adjacency is
+kept in CSR form (``indptr``/``indices``) and edge type codes and weights
+are parallel arrays. It needs a few tens of bytes per edge instead of about
+1 KB, and the metrics in ``metrics.py`` accept it in place of a DiGraph.
+"""
+
+import networkx as nx
+import numpy as np
+from typing import Dict, Hashable, Iterator, List, Mapping, Sequence, Set, Tuple
+
+from .encoding import EDGE_TYPE_NAMES, EdgeType
+from .graph_analysis import BypassIndex
+from .store import EdgeStore, EdgeTypeView
+
+
+class CSRGraph:
+    """
+    Immutable directed graph in compressed sparse row form.
+
+    Out-edges of node i are ``indices[indptr[i]:indptr[i + 1]]`` (sorted by
+    target), with aligned ``edge_types`` (EdgeType codes) and ``weights``.
+    Codes past the EdgeType values name other dependency types: code
+    ``len(EdgeType) + i`` is ``type_names[i]``. Nodes are referred to by
+    position; ``ids`` maps positions back to node IDs and ``index`` maps IDs
+    to positions.
+
+    Example:
+        >>> csr = hrg.to_csr()
+        >>> bus_factor_score(csr, hrg.criticality)
+    """
+
+    def __init__(
+        self,
+        ids: List[Hashable],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        edge_types: np.ndarray,
+        weights: np.ndarray,
+        type_names: Sequence[Hashable] = (),
+    ):
+        """
+        Initialize from prebuilt CSR arrays (see from_arrays for raw edge lists).
+
+        Args:
+            ids: Node IDs by position
+            indptr: Row pointer array of length len(ids) + 1
+            indices: Target positions, grouped by source
+            edge_types: EdgeType code of each edge
+            weights: Weight of each edge
+            type_names: Dependency type names outside EdgeType (default: none)
+        """
+        self.ids = list(ids)
+        self.index = {node: i for i, node in enumerate(self.ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_types = edge_types
+        self.weights = weights
+        self.type_names = list(type_names)
+        self._cache: Dict[str, object] = {}
+
+    @classmethod
+    def from_arrays(
+        cls, ids: List[Hashable], src, dst, type_codes, weight, type_names: Sequence[Hashable] = ()
+    ) -> "CSRGraph":
+        """
+        Build a CSR graph from edge columns.
+
+        Repeated (src, dst) pairs keep the last type and weight, as with
+        the dict-based constructor.
+
+        Args:
+            ids: Node IDs
+            src: Integer positions in ids of each edge's source
+            dst: Integer positions in ids of each edge's target
+            type_codes: EdgeType code of each edge, or
+                ``len(EdgeType) + i`` for type_names[i]
+            weight: Edge weights
+            type_names: Dependency type names outside EdgeType (default: none)
+
+        Returns:
+            CSRGraph
+        """
+        n = len(ids)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        type_codes = np.asarray(type_codes, dtype=np.int8)
+        weight = np.asarray(weight, dtype=np.float64)
+        if len(src) and (min(src.min(), dst.min()) < 0 or max(src.max(), dst.max()) >= n):
+            raise ValueError("src and dst must be integer positions in ids")
+
+        # Last occurrence of each (src, dst), in (src, dst) order
+        keys = src * n + dst
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - last
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src[keep], minlength=n), out=indptr[1:])
+        return cls(
+            ids,
+            indptr,
+            dst[keep].astype(_index_dtype(n)),
+            type_codes[keep],
+            weight[keep],
+            type_names,
+        )
+
+    @classmethod
+    def from_networkx(
+        cls,
+        graph: nx.DiGraph,
+        edge_types: Mapping[Tuple[str, str], str],
+        weights: Mapping[Tuple[str, str], float],
+    ) -> "CSRGraph":
+        """
+        Convert a NetworkX graph and its lookup dicts.
+
+        Args:
+            graph: NetworkX directed graph
+            edge_types: Dict mapping (u, v) -> edge type (missing: 'unknown');
+                names outside EdgeType get extra codes, as in ``EdgeStore.code``
+            weights: Dict mapping (u, v) -> edge weight (missing: 0.0)
+
+        Returns:
+            CSRGraph with the same nodes (in graph order) and edges
+        """
+        ids = list(graph)
+        index = {node: i for i, node in enumerate(ids)}
+        edges = list(graph.edges())
+        src = np.fromiter((index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+        # An EdgeTypeView's own store already has a code for each of its names
+        table = edge_types.store if isinstance(edge_types, EdgeTypeView) else EdgeStore()
+        type_codes = np.fromiter(
+            (table.code(edge_types.get(edge, "unknown")) for edge in edges),
+            dtype=np.int8,
+            count=len(edges),
+        )
+        weight = np.fromiter(
+            (weights.get(edge, 0.0) for edge in edges), dtype=np.float64, count=len(edges)
+        )
+        return cls.from_arrays(
+            ids, src, dst, type_codes, weight, table.names[len(EDGE_TYPE_NAMES) :]
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.index
+
+    def nodes(self) -> List[Hashable]:
+        """Node IDs by position."""
+        return self.ids
+
+    def number_of_nodes(self) -> int:
+        return len(self.ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the edge arrays and row pointers."""
+        return (
+            self.indptr.nbytes + self.indices.nbytes + self.edge_types.nbytes + self.weights.nbytes
+        )
+
+    def edge_sources(self) -> np.ndarray:
+        """Source position of every edge, aligned with ``indices``."""
+        return np.repeat(np.arange(len(self.ids), dtype=self.indices.dtype), np.diff(self.indptr))
+
+    def _cached(self, key: str, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _reverse(self) -> Tuple[np.ndarray, np.ndarray]:
+        """In-edges as CSR: (in_indptr, source positions)."""
+
+        def compute():
+            order = np.argsort(self.indices, kind="stable")
+            in_indptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=len(self.ids)), out=in_indptr[1:])
+            return in_indptr, self.edge_sources()[order]
+
+        return self._cached("reverse", compute)
+
+    def _undirected(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric adjacency without self-loops as CSR: (indptr, indices)."""
+
+        def compute():
+            n = len(self.ids)
+            src = self.edge_sources().astype(np.int64)
+            dst = self.indices.astype(np.int64)
+            loops = src == dst
+            u = np.concatenate((src[~loops], dst[~loops]))
+            v = np.concatenate((dst[~loops], src[~loops]))
+            keys = np.unique(u * n + v)
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys // n, minlength=n), out=indptr[1:])
+            return indptr, (keys % n).astype(_index_dtype(n))
+
+        return self._cached("undirected", compute)
+
+    def _traversal_lists(self) -> Tuple[List[int], List[int], List[bool]]:
+        """Python-list copies of the out-adjacency, for fast per-item DFS access."""
+        return self._cached(
+            "traversal",
+            lambda: (
+                self.indptr.tolist(),
+                self.indices.tolist(),
+                (self.edge_types == EdgeType.APPROVAL).tolist(),
+            ),
+        )
+
+    def articulation_points(self) -> Set[Hashable]:
+        """
+        Articulation points of the undirected graph.
+
+        Returns:
+            Set of node IDs
+        """
+
+        def compute():
+            indptr, indices = self._undirected()
+            points = _articulation_points(indptr.tolist(), indices.tolist())
+            return {self.ids[i] for i in points}
+
+        return self._cached("articulation_points", compute)
+
+    def approval_totals(self) -> Dict[Hashable, float]:
+        """
+        Summed approval weight per node with at least one approval edge.
+
+        Returns:
+            Dict mapping node ID -> total approval weight
+        """
+        approval = self.edge_types == EdgeType.APPROVAL
+        sources = self.edge_sources()[approval]
+        n = len(self.ids)
+        totals = np.bincount(sources, weights=self.weights[approval], minlength=n)
+        has_approval = np.bincount(sources, minlength=n) > 0
+        return dict(
+            zip(
+                [self.ids[i] for i in np.flatnonzero(has_approval)],
+                totals[has_approval].tolist(),
+            )
+        )
+
+    def bypass_index(self) -> BypassIndex:
+        """
+        Bypass shortcut index keyed by node positions (see ``build_bypass_index``).
+
+        Returns:
+            BypassIndex whose pairs and intermediates are node positions
+        """
+
+        def compute():
+            indptr, indices, _ = self._traversal_lists()
+            in_indptr, in_sources = self._reverse()
+            in_indptr = in_indptr.tolist()
+            sources = self.edge_sources()
+
+            direct = set()
+            two_hop: Dict[Tuple[int, int], Set[int]] = {}
+            for k in np.flatnonzero(self.edge_types == EdgeType.BYPASS).tolist():
+                u, v = int(sources[k]), indices[k]
+                direct.add((u, v))
+                # u -bypass-> v -> w
+                for w in indices[indptr[v] : indptr[v + 1]]:
+                    two_hop.setdefault((u, w), set()).add(v)
+                # t -> u -bypass-> v
+                for t in in_sources[in_indptr[u] : in_indptr[u + 1]].tolist():
+                    two_hop.setdefault((t, v), set()).add(u)
+
+            return BypassIndex(direct, two_hop)
+
+        return self._cached("bypass_index", compute)
+
+    def iter_critical_paths_from(self, source: Hashable, cutoff: int = 5) -> Iterator[List[int]]:
+        """
+        Lazily enumerate the critical paths starting at a single source.
+
+        Same traversal as ``graph_analysis.iter_critical_paths_from``, over
+        the CSR arrays.
+
+        Args:
+            source: Node ID to start from
+            cutoff: Maximum path length in edges (default 5)
+
+        Yields:
+            Paths as lists of node positions, each containing at least one
+            approval edge
+        """
+        if source not in self.index:
+            raise nx.NodeNotFound(f"source node {source} not in graph")
+        if cutoff < 1:
+            return
+
+        indptr, indices, approval = self._traversal_lists()
+        start = self.index[source]
+        path = [start]
+        on_path = {start}
+        has_approval = [False]
+        stack = [iter(range(indptr[start], indptr[start + 1]))]
+
+        while stack:
+            k = next(stack[-1], -1)
+            if k == -1:
+                stack.pop()
+                on_path.discard(path.pop())
+                has_approval.pop()
+                continue
+            child = indices[k]
+            if child in on_path:
+                continue
+
+            seen = has_approval[-1] or approval[k]
+            path.append(child)
+            if seen:
+                yield list(path)
+
+            if len(path) <= cutoff:
+                on_path.add(child)
+                has_approval.append(seen)
+                stack.append(iter(range(indptr[child], indptr[child + 1])))
+            else:
+                path.pop()
+
+
+def _index_dtype(n: int):
+    return np.int32 if n <= np.iinfo(np.int32).max else np.int64
+
+
+def _articulation_points(indptr: List[int], indices: List[int]) -> Set[int]:
+    """Articulation points of a symmetric CSR adjacency (iterative Tarjan DFS)."""
+    n = len(indptr) - 1
+    disc = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    points: Set[int] = set()
+    time = 0
+
+    for root in range(n):
+        if disc[root] == -1:
+            time = _tarjan_tree(indptr, indices, root, time, disc, low, parent, points)
+
+    return points
+
+
+def _tarjan_tree(indptr, indices, root: int, time: int, disc, low, parent, points) -> int:
+    """Run the DFS from root, adding its articulation points; returns the next time."""
+    disc[root] = low[root] = time
+    time += 1
+    root_children = 0
+    stack = [(root, iter(range(indptr[root], indptr[root + 1])))]
+
+    while stack:
+        v, edges = stack[-1]
+        for k in edges:
+            w = indices[k]
+            if disc[w] == -1:
+                parent[w] = v
+                disc[w] = low[w] = time
+                time += 1
+                stack.append((w, iter(range(indptr[w], indptr[w + 1]))))
+                break
+            if w != parent[v] and disc[w] < low[v]:
+                low[v] = disc[w]
+        else:
+            stack.pop()
+            p = parent[v]
+            if p == -1:
+                continue
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if p == root:
+                root_children += 1
+            elif low[v] >= disc[p]:
+                points.add(p)
+
+    if root_children >= 2:
+        points.add(root)
+    return time
@@ -0,0 +1,63 @@
+"""
+Integer encoding of dependency types for Human Risk Graph.
+
+Columnar inputs (NumPy arrays, DataFrames, binary exports) carry edge
+types as small integer codes instead of strings. This module defines the
+codes and converts between codes and the type names used by the metrics.
+"""
+
+import numpy as np
+from enum import IntEnum
+from typing import Iterable, List
+
+
+class EdgeType(IntEnum):
+    """Integer codes for dependency types."""
+
+    APPROVAL = 0
+    ESCALATION = 1
+    BYPASS = 2
+    UNKNOWN = 3
+
+    @property
+    def label(self) -> str:
+        """Type name as used in ``edge_types`` dicts (e.g. 'approval')."""
+        return self.name.lower()
+
+
+# Type names indexed by code
+EDGE_TYPE_NAMES = tuple(edge_type.label for edge_type in EdgeType)
+
+_CODES = {name: code for code, name in enumerate(EDGE_TYPE_NAMES)}
+
+
+def encode_edge_types(names: Iterable[str]) -> np.ndarray:
+    """
+    Convert dependency type names to integer codes.
+
+    Args:
+        names: Type names ('approval', 'escalation', 'bypass' or 'unknown')
+
+    Returns:
+        int8 array of EdgeType codes
+    """
+    try:
+        return np.array([_CODES[name] for name in names], dtype=np.int8)
+    except KeyError as e:
+        raise ValueError(f"Unknown dependency type: {e.args[0]!r}") from None
+
+
+def decode_edge_types(codes: Iterable[int]) -> List[str]:
+    """
+    Convert integer codes to dependency type names.
+
+    Args:
+        codes: EdgeType codes
+
+    Returns:
+        List of type names
+    """
+    codes = np.asarray(codes)
+    if codes.size and (codes.min() < 0 or codes.max() >= len(EDGE_TYPE_NAMES)):
+        raise ValueError("Dependency type codes must be EdgeType values")
+    return np.array(EDGE_TYPE_NAMES, dtype=object)[codes.astype(np.intp)].tolist()
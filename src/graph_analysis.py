@@ -7,11 +7,48 @@ This module implements core graph algorithms used in HRG metrics:
 - Graph connectivity analysis
 """
 
+import math
+import random
+from collections import deque
+
 import networkx as nx
-from typing import List, Set, Dict, Tuple
+import numpy as np
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .store import EdgeTypeView
+
+_EXHAUSTED: Any = object()
+
+_NO_EDGES: Dict = {}
+
+
+def edges_of_type(edge_types: Mapping[Tuple[str, str], str], edge_type: str) -> Iterator[Tuple]:
+    """
+    Iterate over the (u, v) edges of one type.
+
+    Uses the type index of an ``EdgeTypeView`` (as held by HumanRiskGraph),
+    which costs O(edges of that type); a plain dict is scanned.
+
+    Args:
+        edge_types: Dict mapping (u, v) -> edge type
+        edge_type: Type to select, e.g. 'approval'
+
+    Returns:
+        Iterator of (u, v) tuples
+    """
+    if isinstance(edge_types, EdgeTypeView):
+        return edge_types.edges_of_type(edge_type)
+    return (edge for edge, kind in edge_types.items() if kind == edge_type)
 
 
-def find_articulation_points(graph: nx.DiGraph) -> Set[str]:
+def type_successors(edge_types: Mapping[Tuple[str, str], str], edge_type: str) -> Optional[Dict]:
+    """Out-adjacency ``{u: {v: ...}}`` of one edge type, or None without a type index."""
+    if isinstance(edge_types, EdgeTypeView):
+        return edge_types.out_adjacency(edge_type)
+    return None
+
+
+def find_articulation_points(graph: nx.DiGraph, undirected: Optional[nx.Graph] = None) -> Set[str]:
     """
     Find all articulation points (cut vertices) in the graph.
 
@@ -22,12 +59,14 @@ def find_articulation_points(graph: nx.DiGraph) -> Set[str]:
 
     Args:
         graph: NetworkX directed graph representing HRG
+        undirected: Precomputed undirected view of ``graph`` (built if omitted)
 
     Returns:
         Set of node IDs that are articulation points
     """
     # Convert to undirected for articulation point analysis
-    undirected = graph.to_undirected()
+    if undirected is None:
+        undirected = graph.to_undirected()
 
     # Find articulation points using NetworkX
     articulation_points = set(nx.articulation_points(undirected))
@@ -51,8 +90,110 @@ def find_bridges(graph: nx.DiGraph) -> List[Tuple[str, str]]:
     return list(nx.bridges(undirected))
 
 
+def iter_critical_paths_from(
+    graph: nx.DiGraph,
+    source: str,
+    edge_types: Mapping[Tuple[str, str], str],
+    cutoff: int = 5,
+) -> Iterator[List[str]]:
+    """
+    Lazily enumerate the critical paths starting at a single source.
+
+    Walks every simple path of length <= cutoff from ``source`` in one
+    depth-first traversal. Whether the current prefix already contains an
+    approval edge is carried as DFS state, so each matching path is yielded
+    as soon as it is reached instead of being re-discovered per target.
+
+    Paths are yielded in DFS order; paths ending at the same target come out
+    in the same relative order as ``nx.all_simple_paths``.
+
+    Time complexity: O(number of simple paths of length <= cutoff)
+
+    Args:
+        graph: NetworkX directed graph
+        source: Node ID to start from
+        edge_types: Dict mapping (u, v) -> edge type
+        cutoff: Maximum path length in edges (default 5)
+
+    Yields:
+        Paths as lists of node IDs, each containing at least one approval edge
+    """
+    if source not in graph:
+        raise nx.NodeNotFound(f"source node {source} not in graph")
+    if cutoff < 1:
+        return
+
+    succ = graph.succ
+    approvals = type_successors(edge_types, "approval")
+    path = [source]
+    on_path = {source}
+    # has_approval[d] is True when path[: d + 1] contains an approval edge
+    has_approval = [False]
+    stack = [iter(succ[source])]
+
+    while stack:
+        child = next(stack[-1], _EXHAUSTED)
+        if child is _EXHAUSTED:
+            stack.pop()
+            on_path.discard(path.pop())
+            has_approval.pop()
+            continue
+        if child in on_path:
+            continue
+
+        if has_approval[-1]:
+            seen = True
+        elif approvals is not None:
+            seen = child in approvals.get(path[-1], _NO_EDGES)
+        else:
+            seen = edge_types.get((path[-1], child)) == "approval"
+        path.append(child)
+        if seen:
+            yield list(path)
+
+        if len(path) <= cutoff:
+            on_path.add(child)
+            has_approval.append(seen)
+            stack.append(iter(succ[child]))
+        else:
+            path.pop()
+
+
+def iter_critical_paths(
+    graph: nx.DiGraph,
+    critical_nodes: Set[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    cutoff: int = 5,
+) -> Iterator[List[str]]:
+    """
+    Lazily enumerate critical paths from every critical node.
+
+    Runs one depth-first walk per critical source (see
+    ``iter_critical_paths_from``). Yields the same paths as
+    ``find_critical_paths`` without materializing them.
+
+    Args:
+        graph: NetworkX directed graph
+        critical_nodes: Set of node IDs with high criticality
+        edge_types: Dict mapping (u, v) -> edge type
+        cutoff: Maximum path length in edges (default 5)
+
+    Yields:
+        Paths as lists of node IDs
+    """
+    if len(graph) == 0:
+        return
+
+    for source in critical_nodes:
+        yield from iter_critical_paths_from(graph, source, edge_types, cutoff)
+
+
 def find_critical_paths(
-    graph: nx.DiGraph, critical_nodes: Set[str], edge_types: Dict[Tuple[str, str], str]
+    graph: nx.DiGraph,
+    critical_nodes: Set[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    cutoff: int = 5,
+    n_jobs: Optional[int] = None,
 ) -> List[List[str]]:
     """
     Find all critical paths in the graph.
@@ -61,45 +202,97 @@ def find_critical_paths(
     1. It starts or ends at a critical node
     2. It contains at least one approval edge
 
+    Paths are grouped by source, then ordered by the position of their
+    target in ``graph.nodes()``.
+
     Args:
         graph: NetworkX directed graph
         critical_nodes: Set of node IDs with high criticality
         edge_types: Dict mapping (u, v) -> edge type ('approval', 'bypass', etc)
+        cutoff: Maximum path length in edges (default 5)
+        n_jobs: Worker processes to split critical sources across
+            (default: serial, -1 for all CPUs)
 
     Returns:
         List of paths, where each path is a list of node IDs
     """
+    if len(graph) == 0:
+        return []
+
+    if n_jobs is not None:
+        from .parallel import parallel_find_critical_paths, resolve_n_jobs
+
+        n_jobs = resolve_n_jobs(n_jobs)
+        if n_jobs > 1:
+            return parallel_find_critical_paths(graph, critical_nodes, edge_types, n_jobs, cutoff)
+
+    position = {node: i for i, node in enumerate(graph)}
     critical_paths = []
 
-    # For each critical node, find paths involving approval
     for source in critical_nodes:
-        for target in graph.nodes():
-            if source == target:
-                continue
-
-            # Find all simple paths between source and target
-            try:
-                paths = nx.all_simple_paths(graph, source, target, cutoff=5)
-
-                for path in paths:
-                    # Check if path contains approval edge
-                    has_approval = False
-                    for i in range(len(path) - 1):
-                        edge = (path[i], path[i + 1])
-                        if edge in edge_types and edge_types[edge] == "approval":
-                            has_approval = True
-                            break
-
-                    if has_approval:
-                        critical_paths.append(path)
-            except nx.NetworkXNoPath:
-                continue
+        paths = iter_critical_paths_from(graph, source, edge_types, cutoff)
+        # Stable sort keeps DFS order among paths that share a target
+        critical_paths.extend(sorted(paths, key=lambda path: position[path[-1]]))
 
     return critical_paths
 
 
+class BypassIndex(NamedTuple):
+    """
+    Precomputed bypass shortcuts of a graph.
+
+    Attributes:
+        direct: Bypass edges (u, w) present in the graph
+        two_hop: Dict mapping (u, w) -> set of intermediates m such that
+            u -> m and m -> w are both graph edges and at least one of
+            them is a bypass edge
+    """
+
+    direct: Set[Tuple[str, str]]
+    two_hop: Dict[Tuple[str, str], Set[str]]
+
+
+def build_bypass_index(graph: nx.DiGraph, edge_types: Mapping[Tuple[str, str], str]) -> BypassIndex:
+    """
+    Build the bypass shortcut index used by ``is_path_bypassable``.
+
+    Every two-hop shortcut goes through a bypass edge, so the index is
+    built by expanding each bypass edge over the successors of its head
+    and the predecessors of its tail.
+
+    Time complexity: O(Σ deg(v) over bypass edge endpoints), plus O(|E|)
+    to find the bypass edges when edge_types is a plain dict
+
+    Args:
+        graph: NetworkX directed graph
+        edge_types: Dict mapping (u, v) -> edge type
+
+    Returns:
+        BypassIndex with direct bypass edges and two-hop shortcut pairs
+    """
+    direct = set()
+    two_hop: Dict[Tuple[str, str], Set[str]] = {}
+
+    for u, v in edges_of_type(edge_types, "bypass"):
+        if not graph.has_edge(u, v):
+            continue
+
+        direct.add((u, v))
+        # u -bypass-> v -> w
+        for w in graph.succ[v]:
+            two_hop.setdefault((u, w), set()).add(v)
+        # t -> u -bypass-> v
+        for t in graph.pred[u]:
+            two_hop.setdefault((t, v), set()).add(u)
+
+    return BypassIndex(direct, two_hop)
+
+
 def is_path_bypassable(
-    path: List[str], graph: nx.DiGraph, edge_types: Dict[Tuple[str, str], str]
+    path: List[str],
+    graph: nx.DiGraph,
+    edge_types: Mapping[Tuple[str, str], str],
+    bypass_index: Optional[BypassIndex] = None,
 ) -> bool:
     """
     Check if a critical path can be bypassed.
@@ -107,10 +300,16 @@ def is_path_bypassable(
     A path is bypassable if there exists a bypass edge that creates
     a shortcut around any segment of the path.
 
+    Without an index each segment scans the successors of its first node,
+    O(L² · deg) for a path of length L. With a prebuilt ``bypass_index``
+    each segment is answered by set lookups in O(L²); pass the index when
+    checking many paths of the same graph.
+
     Args:
         path: List of node IDs forming a path
         graph: NetworkX directed graph
         edge_types: Dict mapping (u, v) -> edge type
+        bypass_index: Index from ``build_bypass_index`` (optional)
 
     Returns:
         True if path can be bypassed, False otherwise
@@ -118,31 +317,99 @@ def is_path_bypassable(
     if len(path) < 2:
         return False
 
+    if bypass_index is None:
+        return _scan_shortcuts(path, graph, edge_types)
+    direct, two_hop = bypass_index
+
     # Check for bypass edges that shortcut the path
     for i in range(len(path)):
         for j in range(i + 2, len(path)):
-            # Check if there's a direct bypass edge from path[i] to path[j]
-            if graph.has_edge(path[i], path[j]):
-                edge = (path[i], path[j])
-                if edge in edge_types and edge_types[edge] == "bypass":
+            pair = (path[i], path[j])
+
+            # Direct bypass edge from path[i] to path[j]
+            if pair in direct:
+                return True
+
+            # Bypass route through a node outside the segment
+            intermediates = two_hop.get(pair)
+            if intermediates:
+                if len(intermediates) > j - i + 1:
+                    return True
+                segment = path[i : j + 1]
+                if any(node not in segment for node in intermediates):
                     return True
 
-            # Check if there's any bypass edge that connects to intermediate nodes
-            for node in graph.nodes():
-                if node not in path[i : j + 1]:
-                    edge1 = (path[i], node)
-                    edge2 = (node, path[j])
+    return False
 
-                    if (edge1 in edge_types and edge_types[edge1] == "bypass") or (
-                        edge2 in edge_types and edge_types[edge2] == "bypass"
-                    ):
-                        if graph.has_edge(path[i], node) and graph.has_edge(node, path[j]):
-                            return True
 
+def _scan_shortcuts(
+    path: List[str], graph: nx.DiGraph, edge_types: Mapping[Tuple[str, str], str]
+) -> bool:
+    """is_path_bypassable without an index: look for shortcuts among the graph's edges."""
+    succ = graph.succ
+    for i in range(len(path)):
+        start = path[i]
+        for j in range(i + 2, len(path)):
+            end = path[j]
+            if end in succ[start] and edge_types.get((start, end)) == "bypass":
+                return True
+
+            segment = path[i : j + 1]
+            for node in succ[start]:
+                if node in segment or end not in succ[node]:
+                    continue
+                if (
+                    edge_types.get((start, node)) == "bypass"
+                    or edge_types.get((node, end)) == "bypass"
+                ):
+                    return True
     return False
 
 
-def compute_betweenness_centrality(graph: nx.DiGraph) -> Dict[str, float]:
+def bypass_witness(path: List[str], bypass_index: BypassIndex) -> Tuple[bool, Optional[str]]:
+    """
+    Check if a path is bypassable and whether one node carries every bypass.
+
+    Used for removal analysis: a bypassable path stops being bypassable
+    when a node is removed only if all of its shortcuts are two-hop routes
+    through that single node.
+
+    Args:
+        path: List of node IDs forming a path
+        bypass_index: Index from ``build_bypass_index``
+
+    Returns:
+        Tuple (bypassable, sole_intermediate) where sole_intermediate is the
+        only node through which the path can be bypassed, or None if the
+        path is not bypassable or has a shortcut that survives any single
+        node removal outside the path
+    """
+    direct, two_hop = bypass_index
+    sole = None
+
+    for i in range(len(path)):
+        for j in range(i + 2, len(path)):
+            pair = (path[i], path[j])
+            if pair in direct:
+                return True, None
+
+            intermediates = two_hop.get(pair)
+            if intermediates:
+                segment = path[i : j + 1]
+                for node in intermediates:
+                    if node in segment:
+                        continue
+                    if sole is None:
+                        sole = node
+                    elif node != sole:
+                        return True, None
+
+    return sole is not None, sole
+
+
+def compute_betweenness_centrality(
+    graph: nx.DiGraph, k: Optional[int] = None, seed: int = 42, n_jobs: Optional[int] = None
+) -> Dict[str, float]:
     """
     Compute betweenness centrality for all nodes.
 
@@ -150,13 +417,220 @@ def compute_betweenness_centrality(graph: nx.DiGraph) -> Dict[str, float]:
     shortest paths between other nodes. High betweenness indicates
     a potential bottleneck.
 
+    Exact computation is O(|V| * |E|). Its per-node sums are accumulated
+    exactly and rounded once, so serial and parallel runs give identical
+    scores; they can differ from ``nx.betweenness_centrality``, which adds
+    in source order, in the last bit. With ``k`` set, only k pivot sources
+    are sampled (deterministically for a given seed) and the scores are
+    rescaled, which costs O(k * |E|). See ``betweenness_error_bound`` for
+    the accuracy of a k-pivot estimate.
+
     Args:
         graph: NetworkX directed graph
+        k: Number of pivot sources to sample (default: exact)
+        seed: Random seed for pivot selection (default 42)
+        n_jobs: Worker processes for exact computation
+            (default: serial, -1 for all CPUs; see parallel_betweenness_centrality)
 
     Returns:
         Dict mapping node ID -> betweenness centrality score [0,1]
     """
-    return nx.betweenness_centrality(graph)
+    if k is None or k >= len(graph):
+        if n_jobs is not None and n_jobs != 1:
+            from .parallel import parallel_betweenness_centrality
+
+            return parallel_betweenness_centrality(graph, n_jobs)
+        return _betweenness_from_partials(graph, _betweenness_partials(graph.succ, graph))
+    return nx.betweenness_centrality(graph, k=k, seed=seed)
+
+
+def betweenness_error_bound(num_nodes: int, k: int, delta: float = 0.1) -> float:
+    """
+    Hoeffding bound on the error of a k-pivot betweenness estimate.
+
+    With probability at least 1 - delta, every node's estimate is within
+    the returned epsilon of its exact normalized betweenness.
+
+    epsilon = R * sqrt(ln(2|V| / delta) / (2k)),  R = |V| / (|V| - 1)
+
+    Args:
+        num_nodes: Number of nodes in the graph
+        k: Number of sampled pivot sources
+        delta: Failure probability (default 0.1)
+
+    Returns:
+        Maximum absolute error over all nodes
+    """
+    if k >= num_nodes or num_nodes <= 2:
+        return 0.0
+    sample_range = num_nodes / (num_nodes - 1)
+    return sample_range * math.sqrt(math.log(2 * num_nodes / delta) / (2 * k))
+
+
+def _add_partial(partials: List[float], x: float):
+    """Add x to a list of non-overlapping partial sums (Shewchuk's algorithm)."""
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+def _betweenness_partials(succ, sources: Iterable[str]) -> Dict[str, List[float]]:
+    """Per-node dependency sums over sources, kept exact as partial sums."""
+    partials: Dict[str, List[float]] = {}
+    for source in sources:
+        for node, dependency in _source_dependencies(succ, source).items():
+            _add_partial(partials.setdefault(node, []), dependency)
+    return partials
+
+
+def _betweenness_from_partials(
+    graph: nx.DiGraph, partials: Mapping[str, List[float]]
+) -> Dict[str, float]:
+    """Round each node's sum once and normalize as ``nx.betweenness_centrality`` does."""
+    betweenness = {node: math.fsum(partials.get(node, ())) for node in graph}
+    n = len(graph)
+    if n > 2:
+        scale = 1 / ((n - 1) * (n - 2))
+        for node in betweenness:
+            betweenness[node] *= scale
+    return betweenness
+
+
+def _source_dependencies(succ, source) -> Dict[str, float]:
+    """
+    Brandes single-source dependencies for an unweighted graph.
+
+    Returns:
+        Dict mapping node -> dependency of ``source`` on that node
+        (only nodes reachable from source, excluding source itself)
+    """
+    order = []
+    preds: Dict[str, List[str]] = {source: []}
+    sigma = {source: 1.0}
+    dist = {source: 0}
+    queue = deque([source])
+
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+        next_dist = dist[v] + 1
+        sigma_v = sigma[v]
+        for w in succ[v]:
+            if w not in dist:
+                dist[w] = next_dist
+                sigma[w] = 0.0
+                preds[w] = []
+                queue.append(w)
+            if dist[w] == next_dist:
+                sigma[w] += sigma_v
+                preds[w].append(v)
+
+    delta = dict.fromkeys(order, 0.0)
+    for w in reversed(order):
+        coeff = (1.0 + delta[w]) / sigma[w]
+        for v in preds[w]:
+            delta[v] += sigma[v] * coeff
+
+    del delta[source]
+    return delta
+
+
+def approximate_betweenness_centrality(
+    graph: nx.DiGraph,
+    epsilon: float = 0.01,
+    delta: float = 0.1,
+    seed: int = 42,
+    max_samples: Optional[int] = None,
+) -> Tuple[Dict[str, float], Dict]:
+    """
+    Adaptive sampled betweenness centrality with an error bound.
+
+    Pivot sources are sampled uniformly (with replacement) in geometrically
+    growing batches. After each batch an empirical Bernstein bound, union-
+    bounded over all nodes and checks, is evaluated; sampling stops once it
+    is at most ``epsilon`` or the Hoeffding sample size for ``epsilon`` is
+    reached. When that sample size would exceed |V|, the exact scores are
+    computed instead.
+
+    Args:
+        graph: NetworkX directed graph
+        epsilon: Target maximum absolute error (default 0.01)
+        delta: Failure probability of the bound (default 0.1)
+        seed: Random seed for pivot sampling (default 42)
+        max_samples: Cap on the number of sampled pivots (at least 2, as
+            the bound needs a sample variance)
+
+    Returns:
+        Tuple (scores, info) where scores maps node ID -> betweenness
+        estimate and info contains:
+            - method: 'exact' or 'adaptive'
+            - samples: Number of pivot sources used
+            - epsilon: Achieved error bound (0.0 when exact)
+            - delta: Failure probability of the bound
+    """
+    if epsilon <= 0 or not 0 < delta < 1:
+        raise ValueError("epsilon must be positive and delta in (0, 1)")
+    if max_samples is not None and max_samples < 2:
+        raise ValueError("max_samples must be at least 2")
+
+    nodes = list(graph)
+    n = len(nodes)
+    if n > 2:
+        sample_range = n / (n - 1)
+        hoeffding_k = math.ceil(sample_range**2 * math.log(4 * n / delta) / (2 * epsilon**2))
+        if max_samples is not None:
+            hoeffding_k = min(hoeffding_k, max_samples)
+
+    if n <= 2 or hoeffding_k >= n:
+        info = {"method": "exact", "samples": n, "epsilon": 0.0, "delta": delta}
+        return nx.betweenness_centrality(graph), info
+
+    # Half of delta for the empirical Bernstein checks, half for Hoeffding
+    batch = min(hoeffding_k, max(32, math.ceil(math.log(n))))
+    checks = max(1, math.ceil(math.log2(hoeffding_k / batch)) + 1)
+    log_term = math.log(4 * n * checks / (delta / 2))
+
+    index = {node: i for i, node in enumerate(nodes)}
+    scale = n / ((n - 1) * (n - 2))
+    sums = np.zeros(n)
+    squares = np.zeros(n)
+    rng = random.Random(seed)
+    succ = graph.succ
+    samples = 0
+    target = batch
+
+    while True:
+        while samples < target:
+            dependencies = _source_dependencies(succ, rng.choice(nodes))
+            if dependencies:
+                positions = np.fromiter((index[v] for v in dependencies), dtype=np.intp)
+                values = np.fromiter(dependencies.values(), dtype=float) * scale
+                sums[positions] += values
+                squares[positions] += values * values
+            samples += 1
+
+        mean = sums / samples
+        variance = np.maximum(squares / samples - mean * mean, 0.0) * samples / (samples - 1)
+        bound = float(
+            np.sqrt(2 * variance.max() * log_term / samples)
+            + 7 * sample_range * log_term / (3 * (samples - 1))
+        )
+        if bound <= epsilon or samples >= hoeffding_k:
+            break
+        target = min(2 * target, hoeffding_k)
+
+    bound = min(bound, betweenness_error_bound(n, samples, delta / 2))
+    scores = {node: float(mean[i]) for i, node in enumerate(nodes)}
+    info = {"method": "adaptive", "samples": samples, "epsilon": bound, "delta": delta}
+    return scores, info
 
 
 def compute_degree_centrality(graph: nx.DiGraph) -> Dict[str, float]:
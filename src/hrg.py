@@ -5,19 +5,48 @@ This module provides the primary API for building and analyzing
 Human Risk Graphs.
 """
 
+import time
 import networkx as nx
-from typing import Dict, List, Tuple
+import numpy as np
+from itertools import islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
 from .metrics import (
     bus_factor_score,
     decision_concentration_score,
     bypass_risk_score,
     composite_hrg_score,
+    composite_hrg_scores,
+    gini_concentration,
     interpret_risk_level,
+    interpret_risk_levels,
 )
-from .graph_analysis import (
-    find_articulation_points,
-    compute_betweenness_centrality,
-)
+from .context import AnalysisContext
+from .csr import CSRGraph
+from .graph_analysis import edges_of_type, type_successors
+from .encoding import EdgeType, EDGE_TYPE_NAMES
+from .store import EdgeStore, EdgeTypeView, EdgeWeightView
+from .uncertainty import NoiseModel
+
+# Thresholds whose critical node lists are kept by iter_critical_dependencies
+_CRITICAL_CACHE_SIZE = 8
+
+
+def _add_edges_grouped(adjacency: Dict, ids: List, keys: np.ndarray, others: np.ndarray, attrs):
+    """
+    Fill one side of a DiGraph's adjacency (``_succ`` or ``_pred``) in bulk.
+
+    Edges are grouped by ``keys`` (positions in ids) with a stable sort, so
+    each node's neighbours keep input order, exactly as repeated add_edge
+    calls would leave them, and each group is added with one dict update.
+    """
+    order = np.argsort(keys, kind="stable")
+    bounds = np.searchsorted(keys[order], np.arange(len(ids) + 1)).tolist()
+    others = others[order].tolist()
+    attrs = attrs[order].tolist()
+    for i, node in enumerate(ids):
+        lo, hi = bounds[i], bounds[i + 1]
+        if lo < hi:
+            adjacency[node].update(zip(others[lo:hi], attrs[lo:hi]))
 
 
 class HumanRiskGraph:
@@ -27,6 +56,13 @@ class HumanRiskGraph:
     A HRG represents organizational security risk through a directed
     graph where nodes are people and edges are dependency relationships.
 
+    ``edge_types`` and ``weights`` are ``(u, v) -> value`` mappings over
+    the graph's edge store, not dicts. They read, iterate and compare like
+    the dicts they replace, and assigning to an existing dependency
+    updates it. Dependencies are added with ``add_dependency`` (assigning
+    to an unknown edge raises KeyError) and removed with
+    ``remove_dependency``; ``dict(hrg.edge_types)`` gives a plain copy.
+
     Example:
         >>> people = [
         ...     {"id": "A", "role": "SRE", "criticality": 0.9},
@@ -54,8 +90,9 @@ class HumanRiskGraph:
                 - type: 'approval', 'escalation', or 'bypass' (str)
                 - weight: dependency strength [0,1] (float)
         """
-        self.people = people
-        self.dependencies = dependencies
+        self._people: Optional[List[Dict]] = None
+        self._dependencies: Optional[List[Dict]] = list(dependencies)
+        self.people = list(people)
 
         # Build NetworkX graph
         self.graph = nx.DiGraph()
@@ -68,21 +105,301 @@ class HumanRiskGraph:
                 criticality=person.get("criticality", 0.5),
             )
 
-        # Add edges with attributes
+        # Add edges; types and weights live in a compact store that also
+        # backs the graph's edge attributes
+        self._edges = EdgeStore()
         for dep in dependencies:
-            self.graph.add_edge(
+            self._edges.set_edge(
+                self.graph,
                 dep["from"],
                 dep["to"],
-                edge_type=dep.get("type", "unknown"),
-                weight=dep.get("weight", 0.5),
+                dep.get("type", "unknown"),
+                dep.get("weight", 0.5),
             )
 
         # Build lookup dictionaries for efficient access
         self.criticality = {p["id"]: p.get("criticality", 0.5) for p in people}
-        self.edge_types = {
-            (dep["from"], dep["to"]): dep.get("type", "unknown") for dep in dependencies
-        }
-        self.weights = {(dep["from"], dep["to"]): dep.get("weight", 0.5) for dep in dependencies}
+        self.edge_types = EdgeTypeView(self.graph, self._edges)
+        self.weights = EdgeWeightView(self.graph, self._edges)
+
+        self._dependencies_version = self._edges.version
+        self._columns: Tuple = ()
+        self._context: Optional[AnalysisContext] = None
+        self._approval_totals: Dict[str, float] = {}
+        self._approval_inputs: Optional[Tuple] = None
+        self._critical_nodes: Dict[float, List] = {}
+        self._critical_inputs: Dict = {}
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids,
+        roles,
+        criticality,
+        src,
+        dst,
+        type_codes,
+        weight,
+        type_names: Sequence[Hashable] = (),
+        n_people: Optional[int] = None,
+    ) -> "HumanRiskGraph":
+        """
+        Build a Human Risk Graph from columns instead of lists of dicts.
+
+        Every column is converted once and the graph and lookup dicts are
+        filled in bulk. The ``people`` and ``dependencies`` lists are only
+        materialized if accessed.
+
+        Args:
+            ids: Person IDs, one per person
+            roles: Job roles, aligned with the first n_people ids
+            criticality: Criticality scores [0,1], aligned with the first n_people ids
+            src: Integer positions in ids of each dependency's source person
+            dst: Integer positions in ids of each dependency's target person
+            type_codes: EdgeType code of each dependency, or len(EdgeType) + i
+                for type_names[i]
+            weight: Dependency strengths [0,1]
+            type_names: Dependency type names outside EdgeType (default: none)
+            n_people: Number of leading ids that are listed people (default:
+                all). The remaining ids are only named by dependencies and,
+                as in the constructor, become nodes without attributes.
+
+        Returns:
+            HumanRiskGraph equal to one built from the equivalent dicts
+        """
+        ids = np.asarray(ids, dtype=object)
+        roles = np.asarray(roles, dtype=object)
+        criticality = np.asarray(criticality, dtype=float)
+        src = np.asarray(src)
+        dst = np.asarray(dst)
+        weight = np.asarray(weight, dtype=float)
+
+        n = len(ids)
+        n_people = n if n_people is None else n_people
+        if not 0 <= n_people <= n or len(roles) != n_people or len(criticality) != n_people:
+            raise ValueError("roles and criticality must have one entry per person")
+        m = len(src)
+        if len(dst) != m or len(type_codes) != m or len(weight) != m:
+            raise ValueError("src, dst, type_codes and weight must have the same length")
+        for column in (src, dst):
+            if m and (
+                not np.issubdtype(column.dtype, np.integer) or column.min() < 0 or column.max() >= n
+            ):
+                raise ValueError("src and dst must be integer positions in ids")
+
+        id_list = ids.tolist()
+        if len(set(id_list)) != n:
+            raise ValueError("Person IDs must be unique")
+        type_codes = np.asarray(type_codes)
+        store = EdgeStore()
+        for name in type_names:
+            store.code(name)
+        if len(store.names) != len(EDGE_TYPE_NAMES) + len(type_names):
+            raise ValueError("type_names must be distinct names outside EdgeType")
+        if m and (type_codes.min() < 0 or type_codes.max() >= len(store.names)):
+            raise ValueError("Dependency type codes must be EdgeType values or index type_names")
+        role_list = roles.tolist()
+        criticality_list = criticality.tolist()
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(
+            zip(
+                id_list,
+                ({"role": r, "criticality": c} for r, c in zip(role_list, criticality_list)),
+            )
+        )
+        graph.add_nodes_from(id_list[n_people:])
+
+        # Repeated (src, dst) pairs keep their first position and last values,
+        # as when the dicts are filled one dependency at a time
+        keys = src.astype(np.int64) * n + dst
+        _, first = np.unique(keys, return_index=True)
+        _, last = np.unique(keys[::-1], return_index=True)
+        order = np.argsort(first, kind="stable")
+        first, last = first[order], (m - 1 - last)[order]
+
+        records = np.empty(len(first), dtype=object)
+        records[:] = store.extend(id_list, src[first], dst[first], type_codes[last], weight[last])
+        _add_edges_grouped(graph._succ, id_list, src[first], ids[dst[first]], records)
+        _add_edges_grouped(graph._pred, id_list, dst[first], ids[src[first]], records)
+
+        hrg = cls.__new__(cls)
+        hrg._people = None
+        hrg._dependencies = None
+        hrg._dependencies_version = store.version
+        hrg._columns = (id_list, role_list, criticality_list, src, dst, type_codes, weight)
+        hrg.graph = graph
+        hrg._edges = store
+        hrg.criticality = dict(zip(id_list, criticality_list))
+        hrg.edge_types = EdgeTypeView(graph, store)
+        hrg.weights = EdgeWeightView(graph, store)
+        hrg._context = None
+        hrg._approval_totals = {}
+        hrg._approval_inputs = None
+        hrg._critical_nodes = {}
+        hrg._critical_inputs = {}
+        return hrg
+
+    @classmethod
+    def from_dataframe(cls, people, dependencies) -> "HumanRiskGraph":
+        """
+        Build a Human Risk Graph from pandas DataFrames.
+
+        Args:
+            people: DataFrame with columns id, role (optional, default
+                'Unknown') and criticality (optional, default 0.5)
+            dependencies: DataFrame with columns from, to, type (names or
+                EdgeType codes; optional, default 'unknown') and weight
+                (optional, default 0.5)
+
+        Returns:
+            HumanRiskGraph (see from_arrays)
+        """
+        import pandas as pd
+
+        n = len(people)
+        m = len(dependencies)
+        ids = people["id"].to_numpy(dtype=object)
+        index = pd.Index(ids)
+        if not index.is_unique:
+            raise ValueError("Person IDs must be unique")
+
+        src = index.get_indexer(dependencies["from"])
+        dst = index.get_indexer(dependencies["to"])
+        if (src < 0).any() or (dst < 0).any():
+            raise ValueError("Dependencies refer to people missing from the people table")
+
+        if "type" not in dependencies:
+            type_codes = np.full(m, EdgeType.UNKNOWN, dtype=np.int8)
+        elif pd.api.types.is_integer_dtype(dependencies["type"]):
+            type_codes = dependencies["type"].to_numpy()
+        else:
+            type_codes = pd.Index(EDGE_TYPE_NAMES).get_indexer(dependencies["type"])
+            if (type_codes < 0).any():
+                raise ValueError("Unknown dependency type in dependencies table")
+
+        return cls.from_arrays(
+            ids,
+            people["role"].to_numpy(dtype=object) if "role" in people else ["Unknown"] * n,
+            people["criticality"].to_numpy(dtype=float) if "criticality" in people else [0.5] * n,
+            src,
+            dst,
+            type_codes,
+            dependencies["weight"].to_numpy(dtype=float) if "weight" in dependencies else [0.5] * m,
+        )
+
+    @property
+    def people(self) -> List[Dict]:
+        """Person dicts (materialized on first access for columnar graphs)."""
+        if self._people is None:
+            # roles and criticality stop at the last listed person
+            ids, roles, criticality = self._columns[:3]
+            self._people = [
+                {"id": i, "role": r, "criticality": c} for i, r, c in zip(ids, roles, criticality)
+            ]
+        return self._people
+
+    @people.setter
+    def people(self, people: List[Dict]):
+        self._people = people
+
+    @property
+    def dependencies(self) -> List[Dict]:
+        """
+        Dependency dicts (materialized on first access for columnar graphs).
+
+        After the edges are edited the list is rebuilt from them on the next
+        access, instead of on every edit.
+        """
+        if self._dependencies_version != self._edges.version:
+            self._dependencies = self._dependency_dicts(self._dependencies)
+            self._dependencies_version = self._edges.version
+        elif self._dependencies is None:
+            ids = np.asarray(self._columns[0], dtype=object)
+            src, dst, type_codes, weight = self._columns[3:]
+            self._dependencies = [
+                {"from": u, "to": v, "type": t, "weight": w}
+                for u, v, t, w in zip(
+                    ids[src].tolist(),
+                    ids[dst].tolist(),
+                    np.array(self._edges.names, dtype=object)[type_codes].tolist(),
+                    weight.tolist(),
+                )
+            ]
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, dependencies: List[Dict]):
+        self._dependencies = dependencies
+        self._dependencies_version = self._edges.version
+
+    def _dependency_dicts(self, previous: Optional[List[Dict]]) -> List[Dict]:
+        """Dicts for the current edges, keeping other keys of the previous dicts."""
+        store = self._edges
+        previous_by_edge = {(dep["from"], dep["to"]): dep for dep in previous or ()}
+        dependencies = []
+        for slot in store.live_slots():
+            u, v = edge = store.edge(slot)
+            dependencies.append(
+                {
+                    **previous_by_edge.get(edge, {}),
+                    "from": u,
+                    "to": v,
+                    "type": store.names[store.types[slot]],
+                    "weight": store.weights[slot],
+                }
+            )
+        return dependencies
+
+    @property
+    def context(self) -> AnalysisContext:
+        """
+        Shared cache of derived graph artifacts.
+
+        Articulation points, the undirected view, betweenness and the bypass
+        index are computed once and reused by calculate() and analyze_node()
+        until the graph changes. Edits are detected through the edge store's
+        version, so retypes and reweights made through ``edge_types``,
+        ``weights`` or the graph's edge dicts count as well.
+        """
+        context = self._context
+        if (
+            context is None
+            or context.graph is not self.graph
+            or context.edge_types is not self.edge_types
+        ):
+            context = self._context = AnalysisContext(self.graph, self.edge_types, self._edges)
+        return context
+
+    @property
+    def approval_totals(self) -> Dict[str, float]:
+        """
+        Summed approval weight per person, the input to decision concentration.
+
+        Built once from edge_types and weights and kept up to date by the
+        mutation methods, so calculate() does not rescan every edge. Edits
+        made elsewhere (through the views or the graph's edge dicts) bump
+        the edge store's version, and the totals are then rebuilt.
+        """
+        if not self._approval_totals_current():
+            totals: Dict[str, float] = {}
+            for edge in edges_of_type(self.edge_types, "approval"):
+                totals[edge[0]] = totals.get(edge[0], 0.0) + self.weights.get(edge, 0.0)
+            self._approval_totals = totals
+            self._stamp_approval_totals()
+        return self._approval_totals
+
+    def _approval_totals_current(self) -> bool:
+        inputs = self._approval_inputs
+        return (
+            inputs is not None
+            and inputs[0] is self.edge_types
+            and inputs[1] is self.weights
+            and inputs[2] == self._edges.version
+        )
+
+    def _stamp_approval_totals(self):
+        self._approval_inputs = (self.edge_types, self.weights, self._edges.version)
 
     def calculate(
         self,
@@ -90,58 +407,389 @@ class HumanRiskGraph:
         beta: float = 0.3,
         gamma: float = 0.3,
         critical_threshold: float = 0.7,
+        n_jobs: Optional[int] = None,
+        bypass_method: str = "exact",
+        path_limit: int = 200_000,
+        ci_width: float = 0.02,
+        sample_time: Optional[float] = 1.0,
+        seed: Optional[int] = 42,
+        time_budget: Optional[float] = None,
+        deadline: Optional[float] = None,
     ) -> Dict:
         """
         Calculate all HRG risk metrics.
 
+        Bypass risk counts critical paths exactly. With ``bypass_method``
+        'auto' it is instead estimated from sampled paths (see
+        ``sampling.py``) once there are more than ``path_limit`` critical
+        paths, and reported with a confidence interval; 'sample' always
+        samples.
+
+        With a ``time_budget`` or ``deadline``, BF and DC are still exact
+        but path counting stops when time runs out. BR then covers only the
+        critical sources counted so far and is flagged as approximate with
+        its coverage; sampling, if needed, gets what is left of the budget.
+
         Args:
             alpha: Weight for bus factor score (default 0.4)
             beta: Weight for decision concentration (default 0.3)
             gamma: Weight for bypass risk (default 0.3)
             critical_threshold: Minimum criticality for critical nodes (default 0.7)
+            n_jobs: Worker processes for critical-path enumeration
+                (default: serial, -1 for all CPUs)
+            bypass_method: 'exact', 'sample' or 'auto' (default 'exact')
+            path_limit: Critical paths counted before 'auto' switches to
+                sampling (default 200,000)
+            ci_width: Target confidence interval width when sampling (default 0.02)
+            sample_time: Time budget for sampling in seconds (default 1.0)
+            seed: Random seed for sampling (default 42)
+            time_budget: Seconds the call may take (default: no limit)
+            deadline: ``time.monotonic()`` value to finish by (default: none)
 
         Returns:
             Dict containing:
                 - bus_factor: Bus factor score [0,1]
                 - decision_concentration: DC score [0,1]
-                - bypass_risk: Bypass risk score [0,1]
-                - composite_score: Overall HRG score [0,1]
+                - bypass_risk: Bypass risk score [0,1], or None if time ran
+                  out before any critical source was counted
+                - composite_score: Overall HRG score [0,1] (over BF and DC
+                  only when bypass_risk is None)
                 - risk_level: 'Low', 'Moderate', 'High', or 'Critical'
                 - critical_nodes: List of critical node IDs
                 - articulation_points: List of articulation point IDs
+                - bypass_risk_method: 'exact', 'sampled' or 'partial'
+                - approximate: True unless BR is exact
+                - coverage: Fraction of critical sources BR covers
+                - bypass_risk_ci: 95% confidence interval (only when sampled)
+                - bypass_risk_samples: Number of random walks (only when sampled)
         """
-        # Calculate individual metrics
-        bf = bus_factor_score(self.graph, self.criticality, critical_threshold)
-        dc = decision_concentration_score(self.graph, self.edge_types, self.weights)
-        br = bypass_risk_score(self.graph, self.criticality, self.edge_types, critical_threshold)
+        if time_budget is not None:
+            budget_end = time.monotonic() + time_budget
+            deadline = budget_end if deadline is None else min(deadline, budget_end)
+
+        bf, dc, br, critical_nodes, articulation_pts, details = self._component_scores(
+            critical_threshold,
+            n_jobs,
+            bypass_method=bypass_method,
+            path_limit=path_limit,
+            ci_width=ci_width,
+            sample_time=sample_time,
+            seed=seed,
+            deadline=deadline,
+        )
 
         # Calculate composite score
         composite = composite_hrg_score(bf, dc, br, alpha, beta, gamma)
 
-        # Identify critical nodes
-        critical_nodes = [
-            node for node, crit in self.criticality.items() if crit >= critical_threshold
-        ]
-
-        # Find articulation points
-        articulation_pts = list(find_articulation_points(self.graph))
-
-        return {
+        results = {
             "bus_factor": bf,
             "decision_concentration": dc,
             "bypass_risk": br,
             "composite_score": composite,
             "risk_level": interpret_risk_level(composite),
             "critical_nodes": critical_nodes,
-            "articulation_points": articulation_pts,
+            "articulation_points": list(articulation_pts),
+        }
+        results.update(details)
+        return results
+
+    def calculate_sweep(
+        self,
+        weight_grid,
+        critical_threshold: float = 0.7,
+        n_jobs: Optional[int] = None,
+    ) -> Dict:
+        """
+        Calculate composite scores for a grid of metric weightings.
+
+        BF, DC and BR do not depend on the weights, so they are computed
+        once and every weighting is scored in one vectorized step.
+
+        Args:
+            weight_grid: Array-like of shape (k, 3) with rows (alpha, beta, gamma)
+            critical_threshold: Minimum criticality for critical nodes (default 0.7)
+            n_jobs: Worker processes for critical-path enumeration (default: serial)
+
+        Returns:
+            Dict containing:
+                - bus_factor: Bus factor score [0,1]
+                - decision_concentration: DC score [0,1]
+                - bypass_risk: Bypass risk score [0,1]
+                - weights: The grid as a (k, 3) float array
+                - composite_scores: Array of k composite scores
+                - risk_levels: Array of k risk levels
+        """
+        grid = np.asarray(weight_grid, dtype=float)
+        bf, dc, br, _, _, _ = self._component_scores(critical_threshold, n_jobs)
+        scores = composite_hrg_scores(bf, dc, br, grid)
+
+        return {
+            "bus_factor": bf,
+            "decision_concentration": dc,
+            "bypass_risk": br,
+            "weights": grid,
+            "composite_scores": scores,
+            "risk_levels": interpret_risk_levels(scores),
         }
 
-    def analyze_node(self, node_id: str) -> Dict:
+    def calculate_threshold_sweep(
+        self,
+        thresholds,
+        alpha: float = 0.4,
+        beta: float = 0.3,
+        gamma: float = 0.3,
+        n_jobs: Optional[int] = None,
+    ) -> Dict:
+        """
+        Calculate HRG metrics for many critical thresholds at once.
+
+        Nodes are sorted by criticality once and critical paths are counted
+        once per source that is critical at the lowest threshold. Each
+        threshold's BR and critical-node set then come from prefix sums
+        over that order. BF and DC do not depend on the threshold.
+
+        Args:
+            thresholds: Array-like of critical thresholds
+            alpha: Weight for bus factor score (default 0.4)
+            beta: Weight for decision concentration (default 0.3)
+            gamma: Weight for bypass risk (default 0.3)
+            n_jobs: Worker processes for critical-path enumeration (default: serial)
+
+        Returns:
+            Dict containing:
+                - thresholds: The thresholds as a float array
+                - bus_factor: Bus factor score [0,1]
+                - decision_concentration: DC score [0,1]
+                - bypass_risk: Array of BR scores, one per threshold
+                - composite_scores: Array of composite scores
+                - risk_levels: Array of risk levels
+                - critical_counts: Array with the number of critical nodes
+                - critical_nodes: List of critical node ID lists, sorted by
+                  decreasing criticality
+        """
+        thresholds = np.asarray(thresholds, dtype=float)
+        context = self.context
+        bf = bus_factor_score(
+            self.graph, self.criticality, articulation_points=context.articulation_points
+        )
+        dc = gini_concentration(self.approval_totals.values())
+
+        # Nodes by decreasing criticality (stable for ties)
+        nodes = list(self.criticality)
+        crit = np.fromiter(self.criticality.values(), dtype=float, count=len(nodes))
+        order = np.argsort(-crit, kind="stable")
+        ranked = [nodes[i] for i in order]
+        descending = crit[order]
+
+        # critical_counts[t] = number of nodes with criticality >= t
+        critical_counts = len(nodes) - np.searchsorted(descending[::-1], thresholds, side="left")
+
+        needed = int(critical_counts.max()) if len(thresholds) else 0
+        counts = context.source_path_counts(ranked[:needed], n_jobs=n_jobs)
+        bypassable = np.zeros(needed + 1, dtype=np.int64)
+        total = np.zeros(needed + 1, dtype=np.int64)
+        bypassable[1:] = np.cumsum([counts[node][0] for node in ranked[:needed]])
+        total[1:] = np.cumsum([counts[node][1] for node in ranked[:needed]])
+
+        total_paths = total[critical_counts]
+        br = np.divide(
+            bypassable[critical_counts],
+            total_paths,
+            out=np.zeros(len(thresholds)),
+            where=total_paths > 0,
+        )
+        scores = composite_hrg_scores(bf, dc, br, [(alpha, beta, gamma)])
+
+        return {
+            "thresholds": thresholds,
+            "bus_factor": bf,
+            "decision_concentration": dc,
+            "bypass_risk": br,
+            "composite_scores": scores,
+            "risk_levels": interpret_risk_levels(scores),
+            "critical_counts": critical_counts,
+            "critical_nodes": [ranked[:k] for k in critical_counts],
+        }
+
+    def _component_scores(
+        self,
+        critical_threshold: float,
+        n_jobs: Optional[int],
+        bypass_method: str = "exact",
+        path_limit: Optional[int] = None,
+        ci_width: float = 0.02,
+        sample_time: Optional[float] = 1.0,
+        seed: Optional[int] = 42,
+        deadline: Optional[float] = None,
+    ) -> Tuple:
+        """
+        Compute (BF, DC, BR, critical nodes, articulation points, BR details).
+
+        BR details is a dict of result keys describing how BR was obtained
+        (see ``calculate``).
+        """
+        if bypass_method not in ("exact", "sample", "auto"):
+            raise ValueError(f"Unknown bypass_method: {bypass_method}")
+        context = self.context
+        articulation_pts = context.articulation_points
+
+        bf = bus_factor_score(
+            self.graph, self.criticality, critical_threshold, articulation_points=articulation_pts
+        )
+        dc = gini_concentration(self.approval_totals.values())
+
+        # Identify critical nodes
+        critical_nodes = [
+            node for node, crit in self.criticality.items() if crit >= critical_threshold
+        ]
+
+        # Bypass risk from per-source path counts cached on the context
+        path_counts: Dict = {}
+        finished = False
+        if bypass_method != "sample":
+            limit = path_limit if bypass_method == "auto" else None
+            if limit is None and deadline is None:
+                path_counts = context.source_path_counts(critical_nodes, n_jobs)
+                finished = True
+            else:
+                path_counts, finished = context.bounded_path_counts(
+                    critical_nodes, n_jobs, limit, deadline
+                )
+
+        details = {"bypass_risk_method": "exact", "approximate": False, "coverage": 1.0}
+        if not finished:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if bypass_method == "sample" or remaining is None or remaining > 0:
+                from .sampling import estimate_bypass_risk
+
+                if remaining is not None:
+                    budget = max(remaining, 0.0)
+                    sample_time = budget if sample_time is None else min(sample_time, budget)
+                estimate = estimate_bypass_risk(
+                    self.graph,
+                    critical_nodes,
+                    self.edge_types,
+                    context.bypass_index,
+                    ci_width=ci_width,
+                    time_budget=sample_time,
+                    seed=seed,
+                )
+                details = {
+                    "bypass_risk_method": "sampled",
+                    "approximate": True,
+                    "coverage": 1.0,
+                    "bypass_risk_ci": estimate["ci"],
+                    "bypass_risk_samples": estimate["samples"],
+                }
+                return bf, dc, estimate["estimate"], critical_nodes, articulation_pts, details
+
+            # Out of time: BR over the sources counted so far
+            details = {
+                "bypass_risk_method": "partial",
+                "approximate": True,
+                "coverage": len(path_counts) / len(critical_nodes),
+            }
+            if not path_counts:
+                # Nothing counted: BR is unknown, not zero
+                return bf, dc, None, critical_nodes, articulation_pts, details
+
+        counts = path_counts.values()
+        total_paths = sum(total for _, total in counts)
+        br = sum(bypassable for bypassable, _ in counts) / total_paths if total_paths else 0.0
+
+        return bf, dc, br, critical_nodes, articulation_pts, details
+
+    def calculate_uncertainty(
+        self,
+        n_replicates: int = 1000,
+        criticality_noise=NoiseModel(),
+        weight_noise=NoiseModel(),
+        alpha: float = 0.4,
+        beta: float = 0.3,
+        gamma: float = 0.3,
+        critical_threshold: float = 0.7,
+        percentiles=(5, 50, 95),
+        seed: Optional[int] = 0,
+        n_jobs: Optional[int] = None,
+        return_samples: bool = False,
+    ) -> Dict:
+        """
+        Distribution of HRG metrics under noisy criticality and weight estimates.
+
+        Each replicate perturbs criticality and weights with the given noise
+        models (clipped to [0, 1]) and is scored on the unchanged topology.
+        Articulation points and critical path counts are computed once, so
+        replicates only cost array operations.
+
+        Args:
+            n_replicates: Number of replicates (default 1000)
+            criticality_noise: NoiseModel for criticality (None: held fixed)
+            weight_noise: NoiseModel for dependency weights (None: held fixed)
+            alpha: Weight for bus factor score (default 0.4)
+            beta: Weight for decision concentration (default 0.3)
+            gamma: Weight for bypass risk (default 0.3)
+            critical_threshold: Minimum criticality for critical nodes (default 0.7)
+            percentiles: Percentiles to report (default 5, 50, 95)
+            seed: Random seed (default 0)
+            n_jobs: Worker processes for critical-path counting (default: serial)
+            return_samples: Include the raw replicate values (default False)
+
+        Returns:
+            Dict containing:
+                - bus_factor, decision_concentration, bypass_risk,
+                  composite_score: Dicts with 'mean', 'std' and 'percentiles'
+                  (percentile -> value)
+                - risk_levels: Dict mapping risk level -> fraction of replicates
+                - n_replicates: Number of replicates
+                - samples: Dict of replicate arrays (only with return_samples)
+        """
+        from .uncertainty import monte_carlo_samples, summarize_samples
+
+        samples = monte_carlo_samples(
+            self,
+            n_replicates,
+            criticality_noise,
+            weight_noise,
+            alpha,
+            beta,
+            gamma,
+            critical_threshold,
+            seed,
+            n_jobs,
+        )
+        result = summarize_samples(samples, percentiles)
+
+        levels = interpret_risk_levels(samples["composite_score"])
+        result["risk_levels"] = {
+            level: float(np.mean(levels == level))
+            for level in ("Low", "Moderate", "High", "Critical")
+        }
+        result["n_replicates"] = n_replicates
+        if return_samples:
+            result["samples"] = samples
+        return result
+
+    def analyze_node(
+        self,
+        node_id: str,
+        betweenness_k: Optional[int] = None,
+        betweenness_epsilon: Optional[float] = None,
+        seed: int = 42,
+        n_jobs: Optional[int] = None,
+    ) -> Dict:
         """
         Analyze risk contribution of a specific node.
 
+        Betweenness is exact by default. On large graphs it can be sampled
+        from ``betweenness_k`` pivot sources, or adaptively until the error
+        bound is at most ``betweenness_epsilon``.
+
         Args:
             node_id: ID of the node to analyze
+            betweenness_k: Number of pivot sources for sampled betweenness
+            betweenness_epsilon: Target error for adaptive sampled betweenness
+            seed: Random seed for pivot sampling (default 42)
+            n_jobs: Worker processes for exact betweenness (default: serial)
 
         Returns:
             Dict with node analysis:
@@ -150,36 +798,169 @@ class HumanRiskGraph:
                 - betweenness_centrality: Centrality score
                 - in_degree: Number of incoming edges
                 - out_degree: Number of outgoing edges
+                - betweenness_error_bound: Max error with probability 0.9
+                  (only when betweenness is sampled)
         """
         if node_id not in self.graph.nodes():
             raise ValueError(f"Node {node_id} not found in graph")
 
-        articulation_pts = find_articulation_points(self.graph)
-        betweenness = compute_betweenness_centrality(self.graph)
+        articulation_pts = self.context.articulation_points
+        betweenness, info = self.context.betweenness_centrality(
+            k=betweenness_k, epsilon=betweenness_epsilon, seed=seed, n_jobs=n_jobs
+        )
 
-        return {
+        analysis = {
             "criticality": self.criticality.get(node_id, 0.0),
             "is_articulation_point": node_id in articulation_pts,
             "betweenness_centrality": betweenness.get(node_id, 0.0),
             "in_degree": self.graph.in_degree(node_id),
             "out_degree": self.graph.out_degree(node_id),
         }
+        if betweenness_k is not None or betweenness_epsilon is not None:
+            analysis["betweenness_error_bound"] = info["epsilon"]
+
+        return analysis
 
-    def get_critical_dependencies(self) -> List[Tuple[str, str, str]]:
+    def analyze_nodes(
+        self,
+        node_ids: Optional[Iterable[str]] = None,
+        betweenness_k: Optional[int] = None,
+        betweenness_epsilon: Optional[float] = None,
+        seed: int = 42,
+        n_jobs: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
         """
-        Identify all critical dependencies (edges involving critical nodes).
+        Analyze risk contribution of many nodes at once.
+
+        Articulation points and betweenness centrality are computed once for
+        the whole graph (see ``context``), so analyzing every node costs about
+        the same as a single analyze_node() call.
+
+        Args:
+            node_ids: IDs of the nodes to analyze (default: all nodes, in graph order)
+            betweenness_k: Number of pivot sources for sampled betweenness
+            betweenness_epsilon: Target error for adaptive sampled betweenness
+            seed: Random seed for pivot sampling (default 42)
+            n_jobs: Worker processes for exact betweenness (default: serial)
 
         Returns:
-            List of tuples (from_node, to_node, edge_type)
+            Columnar dict of equal-length NumPy arrays, one entry per node:
+                - node_id: Node IDs (object array)
+                - criticality: Criticality scores
+                - is_articulation_point: Booleans
+                - betweenness_centrality: Centrality scores
+                - in_degree: Number of incoming edges
+                - out_degree: Number of outgoing edges
         """
-        critical_nodes = {node for node, crit in self.criticality.items() if crit >= 0.7}
+        if node_ids is None:
+            node_ids = list(self.graph.nodes())
+        else:
+            node_ids = list(node_ids)
+            for node_id in node_ids:
+                if node_id not in self.graph:
+                    raise ValueError(f"Node {node_id} not found in graph")
+
+        articulation_pts = self.context.articulation_points
+        betweenness, _ = self.context.betweenness_centrality(
+            k=betweenness_k, epsilon=betweenness_epsilon, seed=seed, n_jobs=n_jobs
+        )
+        n = len(node_ids)
+
+        ids = np.empty(n, dtype=object)
+        ids[:] = node_ids
+
+        return {
+            "node_id": ids,
+            "criticality": np.fromiter(
+                (self.criticality.get(node, 0.0) for node in node_ids), dtype=float, count=n
+            ),
+            "is_articulation_point": np.fromiter(
+                (node in articulation_pts for node in node_ids), dtype=bool, count=n
+            ),
+            "betweenness_centrality": np.fromiter(
+                (betweenness.get(node, 0.0) for node in node_ids), dtype=float, count=n
+            ),
+            "in_degree": np.fromiter(
+                (d for _, d in self.graph.in_degree(node_ids)), dtype=np.int64, count=n
+            ),
+            "out_degree": np.fromiter(
+                (d for _, d in self.graph.out_degree(node_ids)), dtype=np.int64, count=n
+            ),
+        }
 
-        critical_deps = []
-        for (u, v), edge_type in self.edge_types.items():
-            if u in critical_nodes or v in critical_nodes:
-                critical_deps.append((u, v, edge_type))
+    def get_critical_dependencies(
+        self, threshold: float = 0.7, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Identify critical dependencies (edges involving critical nodes).
+
+        Only the edges incident to critical nodes are visited, through the
+        graph's per-node adjacency, so the cost is O(|V| + edges touching
+        critical nodes) rather than O(|E|). Use offset and limit to page
+        through a large answer, or ``iter_critical_dependencies`` to stream it.
+
+        Args:
+            threshold: Criticality at or above which a person is critical (default 0.7)
+            offset: Number of dependencies to skip (default 0)
+            limit: Maximum number of dependencies to return (default: all)
+
+        Returns:
+            List of tuples (from_node, to_node, edge_type), in the order of
+            ``iter_critical_dependencies``
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset and limit must be non-negative")
+
+        stop = None if limit is None else offset + limit
+        return list(islice(self.iter_critical_dependencies(threshold), offset, stop))
+
+    def iter_critical_dependencies(self, threshold: float = 0.7) -> Iterator[Tuple[str, str, str]]:
+        """
+        Lazily yield critical dependencies (edges involving critical nodes).
+
+        Critical nodes are visited in graph order; each yields its outgoing
+        dependencies, then incoming ones from non-critical people, so every
+        edge comes out exactly once and the order is stable between calls
+        on an unchanged graph. The critical node list is kept per threshold
+        until people or criticality scores change.
+
+        Args:
+            threshold: Criticality at or above which a person is critical (default 0.7)
+
+        Yields:
+            Tuples (from_node, to_node, edge_type)
+        """
+        edge_types = self.edge_types
+        critical_nodes = self._critical_node_list(threshold)
+        critical = set(critical_nodes)
 
-        return critical_deps
+        for node in critical_nodes:
+            for target in self.graph.succ[node]:
+                edge_type = edge_types.get((node, target))
+                if edge_type is not None:
+                    yield node, target, edge_type
+            for source in self.graph.pred[node]:
+                if source in critical:
+                    continue
+                edge_type = edge_types.get((source, node))
+                if edge_type is not None:
+                    yield source, node, edge_type
+
+    def _critical_node_list(self, threshold: float) -> List:
+        """Nodes with criticality >= threshold, in graph order, cached per threshold."""
+        cache = self._critical_nodes
+        # criticality is a public dict; a copy of it tells whether it was edited
+        if self._critical_inputs != self.criticality:
+            cache.clear()
+            self._critical_inputs = dict(self.criticality)
+        nodes = cache.get(threshold)
+        if nodes is None:
+            criticality = self.criticality
+            nodes = [node for node in self.graph if criticality.get(node, 0.0) >= threshold]
+            if len(cache) >= _CRITICAL_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[threshold] = nodes
+        return nodes
 
     def simulate_node_removal(self, node_id: str) -> Dict:
         """
@@ -196,7 +977,7 @@ class HumanRiskGraph:
                 - disconnected_nodes: Nodes that become isolated
         """
         # Calculate original score
-        original_result = self.calculate()
+        original_result = self.calculate(bypass_method="exact")
         original_score = original_result["composite_score"]
 
         # Create copy without the node
@@ -231,6 +1012,228 @@ class HumanRiskGraph:
             "disconnected_nodes": list(disconnected),
         }
 
+    def simulate_all_removals(self, n_jobs: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Simulate the removal of every node in one pass.
+
+        Gives the same results as calling simulate_node_removal() for each
+        node, but shares the work across nodes instead of rebuilding the
+        graph and rerunning every metric once per node.
+
+        Args:
+            n_jobs: Worker processes for critical-path enumeration (default: serial)
+
+        Returns:
+            Dict mapping node ID -> impact analysis, as returned by
+            simulate_node_removal() plus:
+                - bus_factor_change: Bus factor difference (new - original)
+        """
+        from .removal import (
+            removal_bus_factors,
+            removal_bypass_risks,
+            removal_decision_concentrations,
+            removal_disconnected_nodes,
+        )
+
+        original_result = self.calculate(n_jobs=n_jobs, bypass_method="exact")
+        original_score = original_result["composite_score"]
+        original_bf = original_result["bus_factor"]
+
+        context = self.context
+        disconnected = removal_disconnected_nodes(self.graph, context.undirected)
+        bus_factors = removal_bus_factors(self.graph, self.criticality, context.undirected)
+        concentrations = removal_decision_concentrations(self.graph, self.edge_types, self.weights)
+        bypass_risks = removal_bypass_risks(
+            self.graph, self.criticality, self.edge_types, context.bypass_index, n_jobs=n_jobs
+        )
+
+        impacts = {}
+        for node in self.graph.nodes():
+            new_score = composite_hrg_score(
+                bus_factors[node], concentrations[node], bypass_risks[node]
+            )
+            impacts[node] = {
+                "original_score": original_score,
+                "new_score": new_score,
+                "score_change": new_score - original_score,
+                "disconnected_nodes": disconnected[node],
+                "bus_factor_change": bus_factors[node] - original_bf,
+            }
+
+        return impacts
+
+    def add_person(self, person_id: str, role: str = "Unknown", criticality: float = 0.5):
+        """
+        Add a person with no dependencies.
+
+        Args:
+            person_id: Unique identifier of the new person
+            role: Job role (default 'Unknown')
+            criticality: Importance score [0,1] (default 0.5)
+        """
+        if person_id in self.graph:
+            raise ValueError(f"Node {person_id} already in graph")
+
+        current = self.context.is_current()
+        approvals_current = self._approval_totals_current()
+        self.graph.add_node(person_id, role=role, criticality=criticality)
+        self._edges.touch()
+        self.criticality[person_id] = criticality
+        self.people.append({"id": person_id, "role": role, "criticality": criticality})
+        self._critical_nodes.clear()
+
+        if approvals_current:
+            self._stamp_approval_totals()
+        if current:
+            self.context.apply_node_added(person_id)
+
+    def remove_person(self, person_id: str):
+        """
+        Remove a person and all of their dependencies.
+
+        Args:
+            person_id: ID of the person to remove
+        """
+        if person_id not in self.graph:
+            raise ValueError(f"Node {person_id} not found in graph")
+
+        edges = list(
+            dict.fromkeys([*self.graph.in_edges(person_id), *self.graph.out_edges(person_id)])
+        )
+        context = self.context
+        current = context.is_current()
+        approvals_current = self._approval_totals_current()
+        self._drop_edges(edges)
+        if current:
+            context.apply_edge_changes(edges)
+
+        self.graph.remove_node(person_id)
+        self._edges.touch()
+        self.criticality.pop(person_id, None)
+        self.people = [person for person in self.people if person["id"] != person_id]
+        self._critical_nodes.clear()
+        if approvals_current:
+            self._refresh_approval_totals({u for u, _ in edges} | {person_id})
+        if current:
+            context.apply_node_removed(person_id)
+
+    def add_dependency(
+        self, from_id: str, to_id: str, dep_type: str = "unknown", weight: float = 0.5
+    ):
+        """
+        Add a dependency, or replace the type and weight of an existing one.
+
+        Args:
+            from_id: Source person ID
+            to_id: Target person ID
+            dep_type: 'approval', 'escalation', or 'bypass' (default 'unknown')
+            weight: Dependency strength [0,1] (default 0.5)
+        """
+        for node_id in (from_id, to_id):
+            if node_id not in self.graph:
+                raise ValueError(f"Node {node_id} not found in graph")
+
+        context = self.context
+        current = context.is_current()
+        approvals_current = self._approval_totals_current()
+        edge = (from_id, to_id)
+        self.graph.add_edge(from_id, to_id)
+        self._edges.set_edge(self.graph, from_id, to_id, dep_type, weight)
+
+        if approvals_current:
+            self._refresh_approval_totals([from_id])
+        if current:
+            context.apply_edge_changes([edge])
+
+    def remove_dependency(self, from_id: str, to_id: str):
+        """
+        Remove a dependency.
+
+        Args:
+            from_id: Source person ID
+            to_id: Target person ID
+        """
+        edge = (from_id, to_id)
+        if not self.graph.has_edge(*edge):
+            raise ValueError(f"Dependency {from_id} -> {to_id} not found in graph")
+
+        context = self.context
+        current = context.is_current()
+        approvals_current = self._approval_totals_current()
+        self._drop_edges([edge])
+
+        if approvals_current:
+            self._refresh_approval_totals([from_id])
+        if current:
+            context.apply_edge_changes([edge])
+
+    def update_criticality(self, person_id: str, criticality: float):
+        """
+        Change a person's criticality score.
+
+        Graph structure is unchanged, so no cached artifacts are recomputed.
+
+        Args:
+            person_id: ID of the person
+            criticality: New importance score [0,1]
+        """
+        if person_id not in self.graph:
+            raise ValueError(f"Node {person_id} not found in graph")
+
+        self.graph.nodes[person_id]["criticality"] = criticality
+        self.criticality[person_id] = criticality
+        self._critical_nodes.clear()
+        self.people = [
+            {**person, "criticality": criticality} if person["id"] == person_id else person
+            for person in self.people
+        ]
+
+    def _drop_edges(self, edges: List[Tuple[str, str]]):
+        """Remove edges from the graph and the edge store."""
+        for u, v in edges:
+            self._edges.remove(self.graph, u, v)
+        self.graph.remove_edges_from(edges)
+
+    def _refresh_approval_totals(self, node_ids: Iterable[str]):
+        """Recompute the approval totals of edited people; call only if they were current."""
+        for node_id in node_ids:
+            self._refresh_approval_total(node_id)
+        self._stamp_approval_totals()
+
+    def _refresh_approval_total(self, node_id: str):
+        """Recompute one person's approval total from their remaining edges."""
+        total = None
+        if node_id in self.graph:
+            approvals = type_successors(self.edge_types, "approval")
+            targets: Iterable[Hashable]
+            if approvals is not None:
+                targets = approvals.get(node_id, ())
+            else:
+                targets = [
+                    t
+                    for t in self.graph.succ[node_id]
+                    if self.edge_types.get((node_id, t)) == "approval"
+                ]
+            for target in targets:
+                total = (total or 0.0) + self.weights.get((node_id, target), 0.0)
+
+        if total is None:
+            self._approval_totals.pop(node_id, None)
+        else:
+            self._approval_totals[node_id] = total
+
+    def to_csr(self) -> CSRGraph:
+        """
+        Export a compact integer-indexed copy of the graph.
+
+        The metrics functions accept the result in place of ``self.graph``
+        and use a fraction of the memory on large graphs.
+
+        Returns:
+            CSRGraph with the same nodes, edges, edge types and weights
+        """
+        return CSRGraph.from_networkx(self.graph, self.edge_types, self.weights)
+
     def export_graph(self) -> nx.DiGraph:
         """
         Export the underlying NetworkX graph.
@@ -0,0 +1,410 @@
+"""
+Streaming loaders for organization files.
+
+``json.load`` materializes every person and dependency dict before
+HumanRiskGraph copies them again, so a large export needs many times its
+size in memory. The readers here decode one record at a time, from either
+the ``{"people": [...], "dependencies": [...]}`` layout or NDJSON (one JSON
+object per line), and ``GraphBuilder`` packs each record into compact
+columns as it arrives. Peak memory is the graph plus those columns.
+"""
+
+import json
+import re
+from array import array
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, TextIO, Tuple
+
+import numpy as np
+
+from .encoding import EDGE_TYPE_NAMES
+from .hrg import HumanRiskGraph
+from .snapshot import SUFFIX as SNAPSHOT_SUFFIX
+from .snapshot import load_snapshot
+
+# Characters read from the file at a time
+_CHUNK_SIZE = 1 << 20
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+# Text after a decoded value that may be the rest of a number cut off by the
+# buffer ("12" of "12.5", "12." of "12.5e3"); nothing else valid can follow
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+_SECTIONS = {"people": "person", "dependencies": "dependency"}
+
+_TYPE_CODES = {name: code for code, name in enumerate(EDGE_TYPE_NAMES)}
+
+# Largest code that fits the int8 type column
+_MAX_CODE = 127
+
+_PERSON_KEYS = {"id", "role", "criticality"}
+
+
+class _Reader:
+    """Buffered reader that decodes JSON values one at a time."""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False at end of file."""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of file."""
+        while True:
+            found = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if found is not None:
+                self.pos = found.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error(f"Expecting {char!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the end of the buffer
+                if self._fill():
+                    continue
+                raise
+            # A value that ends with the buffer, or a number followed only by
+            # the start of a fraction or exponent, may continue
+            if _NUMBER_TAIL.fullmatch(self.buffer, end) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _end_of(reader: _Reader, closing: str) -> bool:
+    """Consume a ',' (returning False) or the closing bracket (returning True)."""
+    separator = reader.peek()
+    reader.pos += 1
+    if separator == closing:
+        return True
+    if separator != ",":
+        reader.pos -= 1
+        raise reader.error("Expecting ',' delimiter")
+    return False
+
+
+def _iter_array(reader: _Reader) -> Iterator:
+    """Decode the elements of the array at the reader one at a time."""
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if _end_of(reader, "]"):
+            return
+
+
+def iter_json_records(file: TextIO, chunk_size: int = _CHUNK_SIZE) -> Iterator[Tuple[str, Dict]]:
+    """
+    Stream records from a ``{"people": [...], "dependencies": [...]}`` document.
+
+    Only one array element is decoded at a time; other top-level keys are
+    decoded and skipped.
+
+    Args:
+        file: Text file positioned at the start of the document
+        chunk_size: Characters read at a time
+
+    Yields:
+        Tuples (kind, record) with kind 'person' or 'dependency'
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+        ValueError: If the 'people' or 'dependencies' array is missing
+    """
+    reader = _Reader(file, chunk_size)
+    seen = set()
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader.error("Expecting property name")
+            reader.expect(":")
+
+            if key in _SECTIONS and reader.peek() == "[":
+                kind = _SECTIONS[key]
+                for record in _iter_array(reader):
+                    yield kind, record
+                seen.add(key)
+            else:
+                reader.value()
+
+            if _end_of(reader, "}"):
+                break
+
+    if reader.peek():
+        raise reader.error("Extra data")
+    if len(seen) < len(_SECTIONS):
+        raise ValueError("JSON must contain 'people' and 'dependencies' keys")
+
+
+def iter_ndjson_records(file: TextIO) -> Iterator[Tuple[str, Dict]]:
+    """
+    Stream records from NDJSON, one person or dependency object per line.
+
+    Objects with 'from'/'to' keys are dependencies and objects with an 'id'
+    key are people; the two may be interleaved. Blank lines are skipped.
+
+    Args:
+        file: Text file
+
+    Yields:
+        Tuples (kind, record) with kind 'person' or 'dependency'
+
+    Raises:
+        json.JSONDecodeError: If a line is not valid JSON
+        ValueError: If a line is not a person or dependency object
+    """
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict) and ("from" in record or "to" in record):
+            yield "dependency", record
+        elif isinstance(record, dict) and "id" in record:
+            yield "person", record
+        else:
+            raise ValueError(f"Line {line_number}: expected a person or dependency object")
+
+
+class GraphBuilder:
+    """
+    Collect people and dependencies one at a time into compact columns.
+
+    Records are read as the ``HumanRiskGraph`` constructor reads them: the
+    same keys and defaults, any dependency type name, and ``people`` holding
+    the person dicts as given. A person added again keeps their first
+    position and takes the new values. Dependencies may arrive before the
+    people they refer to; people that are never added become graph nodes
+    without attributes, as in the constructor.
+
+    Example:
+        >>> builder = GraphBuilder()
+        >>> builder.add_person({"id": "A", "criticality": 0.9})
+        >>> builder.add_person({"id": "B"})
+        >>> builder.add_dependency({"from": "A", "to": "B", "type": "approval"})
+        >>> hrg = builder.build()
+    """
+
+    def __init__(self):
+        self._index: Dict[Hashable, int] = {}
+        self._ids: List[Hashable] = []
+        self._roles: List[str] = []
+        self._criticality = array("d")
+        self._declared = bytearray()
+        # Numbers of declared people, in the order they were first added
+        self._order = array("i")
+        # Number of each person record, in the order added (with repeats),
+        # and each number's latest record
+        self._records = array("i")
+        self._latest = array("i")
+        # One string object per distinct role
+        self._role_names: Dict[str, str] = {}
+        self._src = array("i")
+        self._dst = array("i")
+        self._types = array("b")
+        self._weights = array("d")
+        self._type_codes: Dict[Hashable, int] = dict(_TYPE_CODES)
+        # Person dicts the columns cannot reproduce (keys missing or beyond
+        # id/role/criticality, or since replaced), by record
+        self._kept: Dict[int, Dict] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct people added so far."""
+        return len(self._order)
+
+    @property
+    def dependency_count(self) -> int:
+        """Number of dependencies added so far."""
+        return len(self._src)
+
+    def _intern(self, node: Hashable) -> int:
+        number = self._index.get(node)
+        if number is None:
+            number = self._index[node] = len(self._ids)
+            self._ids.append(node)
+            self._roles.append("Unknown")
+            self._criticality.append(0.5)
+            self._declared.append(0)
+            self._latest.append(-1)
+        return number
+
+    def add(self, kind: str, record: Dict):
+        """Add a record as yielded by ``iter_json_records``/``iter_ndjson_records``."""
+        if kind == "person":
+            self.add_person(record)
+        elif kind == "dependency":
+            self.add_dependency(record)
+        else:
+            raise ValueError(f"Unknown record kind: {kind}")
+
+    def add_person(self, person: Dict):
+        """
+        Add a person.
+
+        Args:
+            person: Dict with 'id' and optional 'role' (default 'Unknown')
+                and 'criticality' (default 0.5)
+        """
+        if not isinstance(person, dict) or "id" not in person:
+            raise ValueError(f"Person record without an 'id': {person!r}")
+        number = self._intern(person["id"])
+        record = len(self._records)
+        if self._declared[number]:
+            # The columns are about to take the new values; keep the old ones
+            self._kept.setdefault(
+                self._latest[number],
+                {
+                    "id": self._ids[number],
+                    "role": self._roles[number],
+                    "criticality": self._criticality[number],
+                },
+            )
+        else:
+            self._declared[number] = 1
+            self._order.append(number)
+
+        role = person.get("role", "Unknown")
+        self._roles[number] = self._role_names.setdefault(role, role)
+        self._criticality[number] = person.get("criticality", 0.5)
+        self._records.append(number)
+        self._latest[number] = record
+        if person.keys() != _PERSON_KEYS:
+            self._kept[record] = person
+
+    def add_dependency(self, dependency: Dict):
+        """
+        Add a dependency.
+
+        Args:
+            dependency: Dict with 'from', 'to' and optional 'type' (default
+                'unknown'; names outside EdgeType get extra codes, as in
+                ``EdgeStore.code``) and 'weight' (default 0.5)
+        """
+        if not isinstance(dependency, dict) or "from" not in dependency or "to" not in dependency:
+            raise ValueError(f"Dependency record without 'from' and 'to': {dependency!r}")
+        name = dependency.get("type", "unknown")
+        code = self._type_codes.get(name)
+        if code is None:
+            code = len(self._type_codes)
+            if code > _MAX_CODE:
+                raise ValueError("Too many distinct dependency types")
+            self._type_codes[name] = code
+
+        self._src.append(self._intern(dependency["from"]))
+        self._dst.append(self._intern(dependency["to"]))
+        self._types.append(code)
+        self._weights.append(dependency.get("weight", 0.5))
+
+    def build(self) -> HumanRiskGraph:
+        """
+        Build the graph, with people in the order they were added.
+
+        People named only by dependencies follow, in order of first mention.
+
+        Returns:
+            HumanRiskGraph (see ``HumanRiskGraph.from_arrays``)
+        """
+        people = np.frombuffer(self._order, dtype=np.int32)
+        order = np.concatenate(
+            [people, np.flatnonzero(np.frombuffer(self._declared, dtype=np.uint8) == 0)]
+        ).astype(np.int32)
+        position = np.empty(len(order), dtype=np.int32)
+        position[order] = np.arange(len(order), dtype=np.int32)
+
+        hrg = HumanRiskGraph.from_arrays(
+            np.array(self._ids, dtype=object)[order],
+            np.array(self._roles, dtype=object)[people],
+            np.frombuffer(self._criticality, dtype=float)[people],
+            position[np.frombuffer(self._src, dtype=np.int32)],
+            position[np.frombuffer(self._dst, dtype=np.int32)],
+            np.array(self._types, dtype=np.int8),
+            np.array(self._weights, dtype=float),
+            type_names=list(self._type_codes)[len(_TYPE_CODES) :],
+            n_people=len(people),
+        )
+        if self._kept:
+            ids, roles, criticality = self._ids, self._roles, self._criticality
+            hrg.people = [
+                (
+                    self._kept[record]
+                    if record in self._kept
+                    else {
+                        "id": ids[number],
+                        "role": roles[number],
+                        "criticality": criticality[number],
+                    }
+                )
+                for record, number in enumerate(self._records)
+            ]
+        return hrg
+
+
+def load_graph(path, format: str = "auto", chunk_size: int = _CHUNK_SIZE) -> HumanRiskGraph:
+    """
+    Build a Human Risk Graph from a file without loading it whole.
+
+    Args:
+        path: Path to the organization file
+        format: 'json', 'ndjson', 'snapshot' or 'auto' (default: NDJSON for
+            .ndjson and .jsonl files, a snapshot for .hrgs files, JSON otherwise)
+        chunk_size: Characters read at a time for JSON files
+
+    Returns:
+        HumanRiskGraph
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON/NDJSON
+        ValueError: If records are malformed or refer to unknown people
+    """
+    if format == "auto":
+        suffix = Path(path).suffix.lower()
+        if suffix in (".ndjson", ".jsonl"):
+            format = "ndjson"
+        elif suffix == SNAPSHOT_SUFFIX:
+            format = "snapshot"
+        else:
+            format = "json"
+    if format not in ("json", "ndjson", "snapshot"):
+        raise ValueError(f"Unknown format: {format}")
+    if format == "snapshot":
+        return load_snapshot(path).to_hrg()
+
+    builder = GraphBuilder()
+    with open(path, "r", encoding="utf-8") as f:
+        records = iter_ndjson_records(f) if format == "ndjson" else iter_json_records(f, chunk_size)
+        for kind, record in records:
+            builder.add(kind, record)
+    return builder.build()
@@ -7,14 +7,30 @@ This module implements the three core HRG metrics:
 3. Bypass Risk Score (BR) - control circumvention risk
 """
 
+import time
 import numpy as np
 import networkx as nx
-from typing import Dict
-from .graph_analysis import find_articulation_points, find_critical_paths, is_path_bypassable
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+from .csr import CSRGraph
+from .encoding import EdgeType
+from .graph_analysis import (
+    BypassIndex,
+    build_bypass_index,
+    edges_of_type,
+    find_articulation_points,
+    is_path_bypassable,
+    iter_critical_paths_from,
+)
+
+# Paths enumerated between deadline checks
+_DEADLINE_CHECK = 1024
 
 
 def bus_factor_score(
-    graph: nx.DiGraph, criticality: Dict[str, float], critical_threshold: float = 0.7
+    graph: nx.DiGraph,
+    criticality: Mapping[Any, float],
+    critical_threshold: float = 0.7,
+    articulation_points: Optional[Set] = None,
 ) -> float:
     """
     Compute Bus Factor Score using articulation point analysis.
@@ -27,9 +43,10 @@ def bus_factor_score(
     Time complexity: O(|V| + |E|)
 
     Args:
-        graph: NetworkX directed graph
+        graph: NetworkX directed graph or CSRGraph
         criticality: Dict mapping node ID -> criticality score [0,1]
         critical_threshold: Minimum criticality to be considered critical
+        articulation_points: Precomputed articulation points (found if omitted)
 
     Returns:
         Bus factor score in [0,1], where higher means more fragile
@@ -38,7 +55,11 @@ def bus_factor_score(
         return 0.0
 
     # Find articulation points
-    articulation_points = find_articulation_points(graph)
+    if articulation_points is None:
+        if isinstance(graph, CSRGraph):
+            articulation_points = graph.articulation_points()
+        else:
+            articulation_points = find_articulation_points(graph)
 
     if not articulation_points:
         return 0.0
@@ -51,7 +72,7 @@ def bus_factor_score(
 
 
 def decision_concentration_score(
-    graph: nx.DiGraph, edge_types: Dict[tuple, str], weights: Dict[tuple, float]
+    graph: nx.DiGraph, edge_types: Mapping[tuple, str], weights: Mapping[tuple, float]
 ) -> float:
     """
     Compute Decision Concentration Score using Gini coefficient.
@@ -61,50 +82,128 @@ def decision_concentration_score(
 
     DC(G) = Σ(2i - n - 1) * w_i / (n * Σw_i)
 
-    Time complexity: O(|E| + |V| log |V|)
+    Time complexity: O(|E_approval| + |V| log |V|) with HumanRiskGraph's
+    edge_types view, O(|E| + |V| log |V|) for a plain dict
 
     Args:
-        graph: NetworkX directed graph
-        edge_types: Dict mapping (u, v) -> edge type
-        weights: Dict mapping (u, v) -> edge weight [0,1]
+        graph: NetworkX directed graph or CSRGraph
+        edge_types: Dict mapping (u, v) -> edge type (ignored for a CSRGraph,
+            which carries its own type codes)
+        weights: Dict mapping (u, v) -> edge weight [0,1] (ignored for a CSRGraph)
 
     Returns:
         Decision concentration score in [0,1]
         0 = perfectly equal distribution
         1 = maximum concentration
     """
-    # Collect approval weights per person
-    approval_weights = {}
+    return gini_concentration(_approval_totals(graph, edge_types, weights))
 
-    for edge, edge_type in edge_types.items():
-        if edge_type == "approval":
-            from_node = edge[0]
-            weight = weights.get(edge, 0.0)
-            approval_weights[from_node] = approval_weights.get(from_node, 0.0) + weight
 
-    if not approval_weights:
-        return 0.0
+def approval_weight_totals(
+    sources: np.ndarray, type_codes: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """
+    Sum approval edge weights per source node.
+
+    Args:
+        sources: Integer source node index of each edge
+        type_codes: EdgeType code of each edge
+        weights: Weight of each edge
+
+    Returns:
+        Total approval weight of every source with at least one approval
+        edge, in source index order
+    """
+    approval = np.asarray(type_codes) == EdgeType.APPROVAL
+    sources = np.asarray(sources)[approval]
+    if sources.size == 0:
+        return np.zeros(0)
+
+    totals = np.bincount(sources, weights=np.asarray(weights, dtype=float)[approval])
+    return totals[np.bincount(sources) > 0]
+
+
+def _approval_totals(graph, edge_types: Mapping[tuple, str], weights: Mapping[tuple, float]):
+    """Approval totals per person as an array, from a CSRGraph or the lookup dicts."""
+    if isinstance(graph, CSRGraph):
+        return approval_weight_totals(graph.edge_sources(), graph.edge_types, graph.weights)
+
+    approval_edges = list(edges_of_type(edge_types, "approval"))
+    count = len(approval_edges)
+    index: Dict = {}
+    sources = np.fromiter(
+        (index.setdefault(edge[0], len(index)) for edge in approval_edges),
+        dtype=np.intp,
+        count=count,
+    )
+    edge_weights = np.fromiter(
+        (weights.get(edge, 0.0) for edge in approval_edges), dtype=float, count=count
+    )
+    type_codes = np.full(count, EdgeType.APPROVAL, dtype=np.int8)
+    return approval_weight_totals(sources, type_codes, edge_weights)
 
-    # Get sorted weights
-    w = sorted(approval_weights.values())
+
+def gini_concentration(approval_totals: Iterable[float]) -> float:
+    """
+    Gini coefficient of per-person approval totals.
+
+    This is the second half of ``decision_concentration_score``, for
+    callers that maintain the totals themselves.
+
+    Args:
+        approval_totals: Summed approval weight of each person with approval edges
+
+    Returns:
+        Decision concentration score in [0,1]
+    """
+    w = np.sort(np.fromiter(approval_totals, dtype=float))
     n = len(w)
 
     if n == 0:
         return 0.0
 
-    w_sum = sum(w)
+    w_sum = w.sum()
     if w_sum == 0:
         return 0.0
 
-    # Compute Gini coefficient
-    numerator = sum((2 * i - n - 1) * w[i - 1] for i in range(1, n + 1))
-    gini = numerator / (n * w_sum)
+    # Closed form: Σ(2i - n - 1) * w_i over the sorted weights
+    numerator = np.dot(np.arange(1 - n, n, 2, dtype=float), w)
+    return float(numerator / (n * w_sum))
 
-    return gini
+
+def entropy_concentration(approval_totals: Iterable[float]) -> float:
+    """
+    Entropy-based concentration of per-person approval totals.
+
+    This is the second half of ``decision_concentration_entropy``.
+
+    Args:
+        approval_totals: Summed approval weight of each person with approval edges
+
+    Returns:
+        Entropy-based concentration score in [0,1]
+    """
+    w = np.fromiter(approval_totals, dtype=float)
+    if len(w) == 0:
+        return 0.0
+
+    w_sum = w.sum()
+    if w_sum == 0:
+        return 0.0
+
+    # Shannon entropy of the normalized weights (0 * log 0 = 0)
+    p = w[w > 0] / w_sum
+    entropy = -np.dot(p, np.log2(p))
+
+    # Maximum entropy (uniform distribution)
+    max_entropy = np.log2(len(w)) if len(w) > 1 else 1.0
+
+    # Concentration = 1 - normalized entropy
+    return float(1.0 - (entropy / max_entropy))
 
 
 def decision_concentration_entropy(
-    graph: nx.DiGraph, edge_types: Dict[tuple, str], weights: Dict[tuple, float]
+    graph: nx.DiGraph, edge_types: Mapping[tuple, str], weights: Mapping[tuple, float]
 ) -> float:
     """
     Alternative DC metric using Shannon entropy.
@@ -114,97 +213,229 @@ def decision_concentration_entropy(
     where H(w) = -Σ p_i log₂(p_i)
 
     Args:
+        graph: NetworkX directed graph or CSRGraph
+        edge_types: Dict mapping (u, v) -> edge type (ignored for a CSRGraph)
+        weights: Dict mapping (u, v) -> edge weight (ignored for a CSRGraph)
+
+    Returns:
+        Entropy-based concentration score in [0,1]
+    """
+    return entropy_concentration(_approval_totals(graph, edge_types, weights))
+
+
+def count_bypassable_paths(
+    paths: Iterable[List[str]],
+    graph: nx.DiGraph,
+    edge_types: Mapping[tuple, str],
+    bypass_index: Optional[BypassIndex] = None,
+) -> Tuple[int, int]:
+    """
+    Count critical paths and bypassable critical paths from an iterable.
+
+    Paths are consumed one at a time and not retained, so passing a
+    generator such as ``iter_critical_paths`` keeps memory flat regardless
+    of the number of paths.
+
+    Args:
+        paths: Iterable of paths (lists of node IDs)
         graph: NetworkX directed graph
         edge_types: Dict mapping (u, v) -> edge type
-        weights: Dict mapping (u, v) -> edge weight
+        bypass_index: Index from ``build_bypass_index`` (built if omitted)
 
     Returns:
-        Entropy-based concentration score in [0,1]
+        Tuple (bypassable_count, total_count)
     """
-    # Collect approval weights per person
-    approval_weights = {}
+    if bypass_index is None:
+        bypass_index = build_bypass_index(graph, edge_types)
 
-    for edge, edge_type in edge_types.items():
-        if edge_type == "approval":
-            from_node = edge[0]
-            weight = weights.get(edge, 0.0)
-            approval_weights[from_node] = approval_weights.get(from_node, 0.0) + weight
+    bypassable = 0
+    total = 0
+    for path in paths:
+        total += 1
+        if is_path_bypassable(path, graph, edge_types, bypass_index):
+            bypassable += 1
 
-    if not approval_weights:
-        return 0.0
+    return bypassable, total
 
-    w = list(approval_weights.values())
-    w_sum = sum(w)
 
-    if w_sum == 0:
-        return 0.0
+def _iter_source_path_counts(
+    graph: nx.DiGraph,
+    sources: Iterable[str],
+    edge_types: Mapping[tuple, str],
+    bypass_index: BypassIndex,
+) -> Iterator[Tuple[str, int, int]]:
+    """Yield (source, bypassable_count, total_count) for each source."""
+    for source in sources:
+        paths = _critical_paths_from(graph, source, edge_types)
+        bypassable, total = count_bypassable_paths(paths, graph, edge_types, bypass_index)
+        yield source, bypassable, total
 
-    # Compute probabilities
-    p = [w_i / w_sum for w_i in w]
 
-    # Compute Shannon entropy
-    entropy = -sum(p_i * np.log2(p_i) if p_i > 0 else 0 for p_i in p)
+def _critical_paths_from(graph, source: str, edge_types) -> Iterator[List]:
+    """Critical paths from source, as node IDs or, for a CSRGraph, node positions."""
+    if isinstance(graph, CSRGraph):
+        return graph.iter_critical_paths_from(source)
+    return iter_critical_paths_from(graph, source, edge_types)
 
-    # Maximum entropy (uniform distribution)
-    max_entropy = np.log2(len(p)) if len(p) > 1 else 1.0
 
-    # Concentration = 1 - normalized entropy
-    if max_entropy == 0:
-        return 0.0
+def _bounded_path_counts(
+    graph: nx.DiGraph,
+    sources: Iterable[str],
+    edge_types: Mapping[tuple, str],
+    bypass_index: BypassIndex,
+    path_limit: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Tuple[str, int, int]], bool]:
+    """
+    Count paths per source until path_limit is exceeded or the deadline passes.
+
+    The deadline (a ``time.monotonic()`` value) is checked every
+    ``_DEADLINE_CHECK`` paths, so a single huge source is interrupted too.
+
+    Returns:
+        Tuple (counts, finished): (source, bypassable_count, total_count)
+        for every source counted in full, and whether all sources were counted
+    """
+    counts: List[Tuple[str, int, int]] = []
+    budget = path_limit
+    for source in sources:
+        if deadline is not None and time.monotonic() >= deadline:
+            return counts, False
+        bypassable = total = 0
+        for path in _critical_paths_from(graph, source, edge_types):
+            total += 1
+            if budget is not None and total > budget:
+                return counts, False
+            if deadline is not None and total % _DEADLINE_CHECK == 0:
+                if time.monotonic() >= deadline:
+                    return counts, False
+            if is_path_bypassable(path, graph, edge_types, bypass_index):
+                bypassable += 1
+        counts.append((source, bypassable, total))
+        if budget is not None:
+            budget -= total
+    return counts, True
+
+
+def bypass_risk_counts(
+    graph: nx.DiGraph,
+    criticality: Dict[str, float],
+    edge_types: Mapping[tuple, str],
+    critical_threshold: float = 0.7,
+    by_source: bool = False,
+    bypass_index: Optional[BypassIndex] = None,
+    n_jobs: Optional[int] = None,
+) -> Dict:
+    """
+    Count critical and bypassable paths without materializing them.
+
+    Critical paths are streamed from ``iter_critical_paths_from`` and only
+    the counters are kept, so peak memory does not grow with the path count.
+
+    Args:
+        graph: NetworkX directed graph or CSRGraph
+        criticality: Dict mapping node ID -> criticality score
+        edge_types: Dict mapping (u, v) -> edge type (ignored for a CSRGraph)
+        critical_threshold: Minimum criticality for a node to be critical
+        by_source: Also report the counts per critical source node
+        bypass_index: Index from ``build_bypass_index`` (built if omitted;
+            a CSRGraph always uses its own)
+        n_jobs: Worker processes to split critical sources across
+            (default: serial, -1 for all CPUs)
+
+    Returns:
+        Dict containing:
+            - critical_paths: Total number of critical paths
+            - bypassable_paths: Number of bypassable critical paths
+            - by_source: Dict mapping source -> {"critical_paths", "bypassable_paths"}
+              (only if by_source is True)
+    """
+    critical_nodes = {node for node, crit in criticality.items() if crit >= critical_threshold}
+
+    counts: Dict = {"critical_paths": 0, "bypassable_paths": 0}
+    if by_source:
+        counts["by_source"] = {}
 
-    return 1.0 - (entropy / max_entropy)
+    if not critical_nodes or len(graph) == 0:
+        return counts
+
+    if isinstance(graph, CSRGraph):
+        bypass_index = graph.bypass_index()
+    elif bypass_index is None:
+        bypass_index = build_bypass_index(graph, edge_types)
+
+    source_counts: Iterable[Tuple[str, int, int]]
+    if n_jobs is not None and n_jobs != 1:
+        from .parallel import parallel_path_counts
+
+        source_counts = parallel_path_counts(
+            graph, critical_nodes, edge_types, n_jobs, bypass_index
+        )
+    else:
+        source_counts = _iter_source_path_counts(graph, critical_nodes, edge_types, bypass_index)
+
+    for source, bypassable, total in source_counts:
+        counts["critical_paths"] += total
+        counts["bypassable_paths"] += bypassable
+        if by_source:
+            counts["by_source"][source] = {
+                "critical_paths": total,
+                "bypassable_paths": bypassable,
+            }
+
+    return counts
 
 
 def bypass_risk_score(
     graph: nx.DiGraph,
     criticality: Dict[str, float],
-    edge_types: Dict[tuple, str],
+    edge_types: Mapping[tuple, str],
     critical_threshold: float = 0.7,
+    bypass_index: Optional[BypassIndex] = None,
+    n_jobs: Optional[int] = None,
 ) -> float:
     """
     Compute Bypass Risk Score through critical path analysis.
 
     BR(G) = |{P ∈ CP(G) : P is bypassable}| / |CP(G)|
 
-    where CP(G) is the set of critical paths.
+    where CP(G) is the set of critical paths. Paths are streamed and
+    counted (see ``bypass_risk_counts``), never stored.
 
     Time complexity: O(|V| * |E|)
 
     Args:
-        graph: NetworkX directed graph
+        graph: NetworkX directed graph or CSRGraph
         criticality: Dict mapping node ID -> criticality score
-        edge_types: Dict mapping (u, v) -> edge type
+        edge_types: Dict mapping (u, v) -> edge type (ignored for a CSRGraph)
         critical_threshold: Minimum criticality for a node to be critical
+        bypass_index: Index from ``build_bypass_index`` (built if omitted)
+        n_jobs: Worker processes for path enumeration (default: serial)
 
     Returns:
         Bypass risk score in [0,1]
         0 = no critical paths bypassable
         1 = all critical paths bypassable
     """
-    # Identify critical nodes
-    critical_nodes = {node for node, crit in criticality.items() if crit >= critical_threshold}
-
-    if not critical_nodes:
-        return 0.0
-
-    # Find all critical paths
-    critical_paths = find_critical_paths(graph, critical_nodes, edge_types)
+    counts = bypass_risk_counts(
+        graph,
+        criticality,
+        edge_types,
+        critical_threshold,
+        bypass_index=bypass_index,
+        n_jobs=n_jobs,
+    )
 
-    if not critical_paths:
+    if counts["critical_paths"] == 0:
         return 0.0
 
-    # Count bypassable paths
-    bypassable_count = sum(
-        1 for path in critical_paths if is_path_bypassable(path, graph, edge_types)
-    )
-
-    return bypassable_count / len(critical_paths)
+    return counts["bypassable_paths"] / counts["critical_paths"]
 
 
 def composite_hrg_score(
     bus_factor: float,
     decision_concentration: float,
-    bypass_risk: float,
+    bypass_risk: Optional[float],
     alpha: float = 0.4,
     beta: float = 0.3,
     gamma: float = 0.3,
@@ -216,10 +447,13 @@ def composite_hrg_score(
 
     Default weights: α=0.4, β=0.3, γ=0.3
 
+    If BR is unknown (None), BF and DC are re-weighted to α/(α+β) and
+    β/(α+β) rather than counting BR as zero risk.
+
     Args:
         bus_factor: Bus factor score [0,1]
         decision_concentration: Decision concentration score [0,1]
-        bypass_risk: Bypass risk score [0,1]
+        bypass_risk: Bypass risk score [0,1], or None if it was not computed
         alpha: Weight for bus factor (default 0.4)
         beta: Weight for decision concentration (default 0.3)
         gamma: Weight for bypass risk (default 0.3)
@@ -229,6 +463,10 @@ def composite_hrg_score(
     """
     if not np.isclose(alpha + beta + gamma, 1.0):
         raise ValueError("Weights must sum to 1.0")
+    if bypass_risk is None:
+        if alpha + beta <= 0:
+            raise ValueError("Bypass risk is required when alpha and beta are zero")
+        return (alpha * bus_factor + beta * decision_concentration) / (alpha + beta)
 
     return alpha * bus_factor + beta * decision_concentration + gamma * bypass_risk
 
@@ -251,3 +489,53 @@ def interpret_risk_level(hrg_score: float) -> str:
         return "High"
     else:
         return "Critical"
+
+
+# Upper bounds (exclusive) of the Low, Moderate and High risk levels
+_RISK_THRESHOLDS = np.array([0.3, 0.5, 0.7])
+_RISK_LEVELS = np.array(["Low", "Moderate", "High", "Critical"], dtype=object)
+
+
+def composite_hrg_scores(
+    bus_factor: Union[float, np.ndarray],
+    decision_concentration: Union[float, np.ndarray],
+    bypass_risk: Union[float, np.ndarray],
+    weight_grid,
+) -> np.ndarray:
+    """
+    Compute composite HRG scores for many weightings at once.
+
+    Vectorized form of ``composite_hrg_score``: each row of the grid is an
+    (alpha, beta, gamma) weighting of the same component scores. With a
+    one-row grid the component scores may instead be arrays, giving one
+    composite score per element.
+
+    Args:
+        bus_factor: Bus factor score [0,1]
+        decision_concentration: Decision concentration score [0,1]
+        bypass_risk: Bypass risk score [0,1]
+        weight_grid: Array-like of shape (k, 3) with rows (alpha, beta, gamma)
+
+    Returns:
+        Array of k composite scores
+    """
+    grid = np.asarray(weight_grid, dtype=float)
+    if grid.ndim != 2 or grid.shape[1] != 3:
+        raise ValueError("weight_grid must have shape (k, 3)")
+    if not np.isclose(grid.sum(axis=1), 1.0).all():
+        raise ValueError("Weights must sum to 1.0")
+
+    return grid[:, 0] * bus_factor + grid[:, 1] * decision_concentration + grid[:, 2] * bypass_risk
+
+
+def interpret_risk_levels(hrg_scores) -> np.ndarray:
+    """
+    Vectorized ``interpret_risk_level``.
+
+    Args:
+        hrg_scores: Array-like of composite HRG scores
+
+    Returns:
+        Object array of risk levels ('Low', 'Moderate', 'High' or 'Critical')
+    """
+    return _RISK_LEVELS[np.searchsorted(_RISK_THRESHOLDS, hrg_scores, side="right")]
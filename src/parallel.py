@@ -0,0 +1,311 @@
+"""
+Process-pool execution for per-source graph algorithms.
+
+Betweenness centrality and critical-path enumeration both decompose into
+independent work per source node. This module splits the sources across a
+ProcessPoolExecutor and merges the partial results. The graph is sent to
+each worker once, through the pool initializer, not once per task.
+"""
+
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import networkx as nx
+
+from .graph_analysis import (
+    BypassIndex,
+    _betweenness_from_partials,
+    _betweenness_partials,
+    build_bypass_index,
+    iter_critical_paths_from,
+)
+from .metrics import _bounded_path_counts, _iter_source_path_counts
+
+# Per-process state set by _init_worker
+_WORKER: Dict = {}
+
+# Tasks per worker, so uneven sources are balanced across the pool
+_CHUNKS_PER_JOB = 4
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """
+    Normalize an ``n_jobs`` argument to a worker count.
+
+    Args:
+        n_jobs: None or 1 for serial, -1 for all CPUs, or a positive count
+
+    Returns:
+        Number of worker processes (1 means run serially)
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer or -1")
+    return n_jobs
+
+
+def _chunks(items: Sequence, n_jobs: int) -> List[Sequence]:
+    """Split items into contiguous chunks, preserving order."""
+    size = max(1, math.ceil(len(items) / (n_jobs * _CHUNKS_PER_JOB)))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _init_worker(graph: nx.DiGraph, edge_types=None, bypass_index=None):
+    _WORKER["graph"] = graph
+    _WORKER["edge_types"] = edge_types
+    _WORKER["bypass_index"] = bypass_index
+
+
+def _make_pool(n_jobs: int, graph: nx.DiGraph, edge_types=None, bypass_index=None):
+    return ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_worker,
+        initargs=(graph, edge_types, bypass_index),
+    )
+
+
+def _critical_paths_task(sources: Sequence[str], cutoff: int) -> List[List[str]]:
+    graph, edge_types = _WORKER["graph"], _WORKER["edge_types"]
+    position = {node: i for i, node in enumerate(graph)}
+    paths = []
+    for source in sources:
+        source_paths = iter_critical_paths_from(graph, source, edge_types, cutoff)
+        paths.extend(sorted(source_paths, key=lambda path: position[path[-1]]))
+    return paths
+
+
+def _path_counts_task(sources: Sequence[str]) -> List[Tuple[str, int, int]]:
+    graph, edge_types = _WORKER["graph"], _WORKER["edge_types"]
+    bypass_index = _WORKER["bypass_index"]
+    return list(_iter_source_path_counts(graph, sources, edge_types, bypass_index))
+
+
+def _bounded_path_counts_task(
+    sources: Sequence[str], path_limit: Optional[int], deadline: Optional[float]
+) -> Tuple[List[Tuple[str, int, int]], bool]:
+    graph, edge_types = _WORKER["graph"], _WORKER["edge_types"]
+    bypass_index = _WORKER["bypass_index"]
+    return _bounded_path_counts(graph, sources, edge_types, bypass_index, path_limit, deadline)
+
+
+def _removal_path_counts_task(sources: Sequence[str]) -> Tuple:
+    from .removal import removal_path_counts
+
+    graph, edge_types = _WORKER["graph"], _WORKER["edge_types"]
+    return removal_path_counts(graph, sources, edge_types, _WORKER["bypass_index"])
+
+
+def _betweenness_task(sources: Sequence[str]) -> Dict[str, List[float]]:
+    return _betweenness_partials(_WORKER["graph"].succ, sources)
+
+
+def parallel_find_critical_paths(
+    graph: nx.DiGraph,
+    critical_nodes: Iterable[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    n_jobs: int,
+    cutoff: int = 5,
+) -> List[List[str]]:
+    """
+    Find all critical paths on a process pool.
+
+    Critical sources are split into contiguous chunks, so the merged list
+    is identical to ``find_critical_paths``.
+
+    Args:
+        graph: NetworkX directed graph
+        critical_nodes: Node IDs with high criticality
+        edge_types: Dict mapping (u, v) -> edge type
+        n_jobs: Number of worker processes (-1 for all CPUs)
+        cutoff: Maximum path length in edges (default 5)
+
+    Returns:
+        List of paths, where each path is a list of node IDs
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    sources = list(critical_nodes)
+    if not sources or len(graph) == 0:
+        return []
+
+    chunks = _chunks(sources, n_jobs)
+    with _make_pool(n_jobs, graph, edge_types) as pool:
+        return [
+            path
+            for chunk in pool.map(_critical_paths_task, chunks, [cutoff] * len(chunks))
+            for path in chunk
+        ]
+
+
+def parallel_path_counts(
+    graph: nx.DiGraph,
+    critical_nodes: Iterable[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    n_jobs: int,
+    bypass_index: Optional[BypassIndex] = None,
+) -> List[Tuple[str, int, int]]:
+    """
+    Count critical and bypassable paths per source on a process pool.
+
+    Args:
+        graph: NetworkX directed graph
+        critical_nodes: Node IDs with high criticality
+        edge_types: Dict mapping (u, v) -> edge type
+        n_jobs: Number of worker processes (-1 for all CPUs)
+        bypass_index: Index from ``build_bypass_index`` (built if omitted)
+
+    Returns:
+        List of (source, bypassable_count, total_count) in source order
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    sources = list(critical_nodes)
+    if not sources or len(graph) == 0:
+        return []
+    if bypass_index is None:
+        bypass_index = build_bypass_index(graph, edge_types)
+
+    with _make_pool(n_jobs, graph, edge_types, bypass_index) as pool:
+        return [
+            counts
+            for chunk in pool.map(_path_counts_task, _chunks(sources, n_jobs))
+            for counts in chunk
+        ]
+
+
+def parallel_bounded_path_counts(
+    graph: nx.DiGraph,
+    critical_nodes: Iterable[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    n_jobs: int,
+    bypass_index: Optional[BypassIndex] = None,
+    path_limit: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Tuple[str, int, int]], bool]:
+    """
+    Count paths per source on a process pool, stopping at a limit or deadline.
+
+    Each task stops after path_limit + 1 paths or at the deadline (a
+    ``time.monotonic()`` value), and the pool is shut down as soon as the
+    completed tasks exceed path_limit together.
+
+    Args:
+        graph: NetworkX directed graph
+        critical_nodes: Node IDs with high criticality
+        edge_types: Dict mapping (u, v) -> edge type
+        n_jobs: Number of worker processes (-1 for all CPUs)
+        bypass_index: Index from ``build_bypass_index`` (built if omitted)
+        path_limit: Maximum total number of critical paths (default: no limit)
+        deadline: ``time.monotonic()`` value to stop at (default: none)
+
+    Returns:
+        Tuple (counts, finished): (source, bypassable_count, total_count)
+        for every source counted in full, in source order, and whether all
+        sources were counted within the limits
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    sources = list(critical_nodes)
+    if not sources or len(graph) == 0:
+        return [], True
+    if bypass_index is None:
+        bypass_index = build_bypass_index(graph, edge_types)
+
+    chunks = _chunks(sources, n_jobs)
+    results: List = [[] for _ in chunks]
+    finished = True
+    total = 0
+    with _make_pool(n_jobs, graph, edge_types, bypass_index) as pool:
+        # Collect in completion order so an exceeded limit stops the pool early
+        futures = {
+            pool.submit(_bounded_path_counts_task, chunk, path_limit, deadline): i
+            for i, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            counts, chunk_finished = future.result()
+            results[futures[future]] = counts
+            total += sum(count for _, _, count in counts)
+            finished = finished and chunk_finished
+            # A task stopped by the deadline ends the others soon too; one
+            # stopped by the limit means the whole count is over it
+            over_limit = not chunk_finished and (deadline is None or time.monotonic() < deadline)
+            if over_limit or (path_limit is not None and total > path_limit):
+                finished = False
+                # Drop queued tasks; shutdown(cancel_futures=True) needs Python 3.9
+                for pending in futures:
+                    pending.cancel()
+                break
+    return [counts for chunk in results for counts in chunk], finished
+
+
+def parallel_removal_path_counts(
+    graph: nx.DiGraph,
+    critical_nodes: Iterable[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    n_jobs: int,
+    bypass_index: Optional[BypassIndex] = None,
+) -> Tuple[int, int, Counter, Counter, Counter]:
+    """
+    Compute ``removal_path_counts`` on a process pool.
+
+    Args:
+        graph: NetworkX directed graph
+        critical_nodes: Node IDs with high criticality
+        edge_types: Dict mapping (u, v) -> edge type
+        n_jobs: Number of worker processes (-1 for all CPUs)
+        bypass_index: Index from ``build_bypass_index`` (built if omitted)
+
+    Returns:
+        Same tuple as ``removal_path_counts``, summed over all workers
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    sources = list(critical_nodes)
+    total = bypassable = 0
+    containing: Counter = Counter()
+    bypassable_containing: Counter = Counter()
+    sole_bypass: Counter = Counter()
+    if not sources or len(graph) == 0:
+        return total, bypassable, containing, bypassable_containing, sole_bypass
+    if bypass_index is None:
+        bypass_index = build_bypass_index(graph, edge_types)
+
+    with _make_pool(n_jobs, graph, edge_types, bypass_index) as pool:
+        for counts in pool.map(_removal_path_counts_task, _chunks(sources, n_jobs)):
+            total += counts[0]
+            bypassable += counts[1]
+            containing.update(counts[2])
+            bypassable_containing.update(counts[3])
+            sole_bypass.update(counts[4])
+
+    return total, bypassable, containing, bypassable_containing, sole_bypass
+
+
+def parallel_betweenness_centrality(graph: nx.DiGraph, n_jobs: int) -> Dict[str, float]:
+    """
+    Compute exact betweenness centrality on a process pool.
+
+    Per-node sums are accumulated exactly and rounded once, as in the
+    serial ``compute_betweenness_centrality``, so the result is identical
+    to it however the sources are split across workers.
+
+    Args:
+        graph: NetworkX directed graph
+        n_jobs: Number of worker processes (-1 for all CPUs)
+
+    Returns:
+        Dict mapping node ID -> betweenness centrality score [0,1]
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    sources = list(graph)
+    partials: Dict[str, List[float]] = {}
+    if sources:
+        with _make_pool(n_jobs, graph) as pool:
+            for chunk in pool.map(_betweenness_task, _chunks(sources, n_jobs)):
+                for node, node_partials in chunk.items():
+                    partials.setdefault(node, []).extend(node_partials)
+
+    return _betweenness_from_partials(graph, partials)
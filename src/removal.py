@@ -0,0 +1,555 @@
+"""
+All-nodes removal impact analysis for Human Risk Graph.
+
+Computes the effect of removing each node without rebuilding the graph
+once per node:
+- Disconnected nodes from one DFS over the undirected graph (block-cut
+  structure: low-link values, subtree sizes and preorder ranges)
+- Bus factor from the block-cut tree, searching for new articulation
+  points only inside the blocks of four or more nodes that contain the
+  removed node
+- Decision concentration by updating the Gini numerator for the few
+  approval totals a removal changes
+- Bypass risk from one critical-path enumeration that records, per path,
+  the nodes it contains and the only node its bypass depends on
+"""
+
+import bisect
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .graph_analysis import (
+    BypassIndex,
+    bypass_witness,
+    edges_of_type,
+    iter_critical_paths_from,
+)
+
+_INF = float("inf")
+
+
+def _dfs_forest(adj: List[List[int]]) -> Dict[str, List]:
+    """
+    Iterative DFS over an undirected graph given as integer adjacency lists.
+
+    Returns:
+        Dict of per-node arrays: disc (preorder index), low (low-link),
+        parent (-1 for roots), sub (subtree size), submin (smallest node
+        index in subtree), children, and comp_start (preorder index where
+        the node's component starts), plus the preorder list itself
+    """
+    n = len(adj)
+    forest: Dict[str, List] = {
+        "disc": [-1] * n,
+        "low": [0] * n,
+        "parent": [-1] * n,
+        "sub": [1] * n,
+        "submin": list(range(n)),
+        "children": [[] for _ in range(n)],
+        "comp_start": [0] * n,
+        "order": [],
+    }
+    disc, order, comp_start = forest["disc"], forest["order"], forest["comp_start"]
+
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        start = len(order)
+        _dfs_tree(adj, root, forest)
+        for k in range(start, len(order)):
+            comp_start[order[k]] = start
+
+    return forest
+
+
+def _dfs_tree(adj: List[List[int]], root: int, forest: Dict[str, List]):
+    """Extend the forest arrays with the DFS tree from root."""
+    disc, low, parent = forest["disc"], forest["low"], forest["parent"]
+    sub, submin, children, order = (
+        forest["sub"],
+        forest["submin"],
+        forest["children"],
+        forest["order"],
+    )
+
+    disc[root] = low[root] = len(order)
+    order.append(root)
+    stack = [(root, iter(adj[root]))]
+
+    while stack:
+        v, neighbours = stack[-1]
+        descended = False
+        for w in neighbours:
+            if disc[w] == -1:
+                parent[w] = v
+                disc[w] = low[w] = len(order)
+                order.append(w)
+                children[v].append(w)
+                stack.append((w, iter(adj[w])))
+                descended = True
+                break
+            if w != parent[v] and disc[w] < low[v]:
+                low[v] = disc[w]
+        if descended:
+            continue
+
+        stack.pop()
+        p = parent[v]
+        if p != -1:
+            sub[p] += sub[v]
+            if submin[v] < submin[p]:
+                submin[p] = submin[v]
+            if low[v] < low[p]:
+                low[p] = low[v]
+
+
+def _preorder_minima(comp_start: List[int], order: List[int]):
+    """
+    Component sizes and prefix/suffix minima of node index along the preorder.
+
+    Returns:
+        Tuple (comp_size, pre_min, suf_min): size per component start, and
+        per preorder position the smallest node index from the component
+        start up to it and from it to the component end
+    """
+    n = len(order)
+    comp_size: Dict[int, int] = {}
+    for start in comp_start:
+        comp_size[start] = comp_size.get(start, 0) + 1
+    pre_min: List[float] = [0] * n
+    suf_min: List[float] = [0] * n
+    for start, size in comp_size.items():
+        end = start + size
+        running = _INF
+        for k in range(start, end):
+            running = min(running, order[k])
+            pre_min[k] = running
+        running = _INF
+        for k in range(end - 1, start - 1, -1):
+            running = min(running, order[k])
+            suf_min[k] = running
+    return comp_size, pre_min, suf_min
+
+
+def _removal_pieces(v: int, forest: Dict[str, List], size: int, pre_min, suf_min) -> List:
+    """Pieces v's component splits into without v: (size, first node, preorder ranges)."""
+    disc, low, parent = forest["disc"], forest["low"], forest["parent"]
+    sub, submin = forest["sub"], forest["submin"]
+    start = forest["comp_start"][v]
+    end = start + size
+    is_root = parent[v] == -1
+
+    pieces = []
+    separated = 0
+    kept_ranges = []
+    kept_min = _INF
+    for c in forest["children"][v]:
+        piece_range = (disc[c], disc[c] + sub[c])
+        if is_root or low[c] >= disc[v]:
+            pieces.append((sub[c], submin[c], [piece_range]))
+            separated += sub[c]
+        else:
+            kept_ranges.append(piece_range)
+            kept_min = min(kept_min, submin[c])
+
+    if not is_root:
+        a, b = disc[v], disc[v] + sub[v]
+        outside = min(pre_min[a - 1] if a > start else _INF, suf_min[b] if b < end else _INF)
+        ranges = [(start, a), (b, end)] + kept_ranges
+        pieces.append((size - 1 - separated, min(outside, kept_min), ranges))
+    return pieces
+
+
+def _outside(v: int, largest, pieces: List, order: List[int], start: int, end: int) -> List[int]:
+    """Sorted node indices other than v outside the largest piece."""
+    if any(piece is largest for piece in pieces):
+        out = order[:start] + order[end:]
+        for piece in pieces:
+            if piece is not largest:
+                for lo, hi in piece[2]:
+                    out.extend(order[lo:hi])
+    else:
+        lo, hi = largest[2][0]
+        out = [u for u in order[:lo] + order[hi:] if u != v]
+    out.sort()
+    return out
+
+
+def removal_disconnected_nodes(
+    graph: nx.DiGraph, undirected: Optional[nx.Graph] = None
+) -> Dict[str, List[str]]:
+    """
+    For every node, find the nodes cut off from the largest component by its removal.
+
+    Matches ``HumanRiskGraph.simulate_node_removal``: after removing a node,
+    every node outside the largest weakly connected component is
+    disconnected (ties go to the component whose first node comes first in
+    graph order). A single DFS gives, for each node, the pieces its
+    component splits into, so the cost is O(|V| + |E|) plus the output size.
+
+    Args:
+        graph: NetworkX directed graph
+        undirected: Precomputed undirected view of ``graph`` (built if omitted)
+
+    Returns:
+        Dict mapping node ID -> disconnected node IDs, in graph order
+    """
+    if undirected is None:
+        undirected = graph.to_undirected()
+
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    adj = [[index[w] for w in undirected.adj[node] if w != node] for node in nodes]
+
+    forest = _dfs_forest(adj)
+    comp_start, order = forest["comp_start"], forest["order"]
+    n = len(nodes)
+
+    comp_size, pre_min, suf_min = _preorder_minima(comp_start, order)
+
+    # Two best components by (size desc, first node asc)
+    ranked = sorted(comp_size.items(), key=lambda item: (-item[1], pre_min[item[0] + item[1] - 1]))
+    best = ranked[:2]
+
+    result: Dict[str, List[str]] = {}
+    for v in range(n):
+        start = comp_start[v]
+        size = comp_size[start]
+        pieces = _removal_pieces(v, forest, size, pre_min, suf_min)
+
+        other = next(((s, z) for s, z in best if s != start), None)
+        candidates = list(pieces)
+        if other is not None:
+            other_start, other_size = other
+            other_min = pre_min[other_start + other_size - 1]
+            candidates.append((other_size, other_min, [(other_start, other_start + other_size)]))
+
+        if not candidates:
+            result[nodes[v]] = []
+            continue
+
+        largest = min(candidates, key=lambda piece: (-piece[0], piece[1]))
+        out = _outside(v, largest, pieces, order, start, start + size)
+        result[nodes[v]] = [nodes[u] for u in out]
+
+    return result
+
+
+def _cut_vertices(adj: List[List[int]]) -> List[int]:
+    """Articulation points of an undirected graph given as integer adjacency lists."""
+    forest = _dfs_forest(adj)
+    disc, low, parent, children = (
+        forest["disc"],
+        forest["low"],
+        forest["parent"],
+        forest["children"],
+    )
+    return [
+        v
+        for v in range(len(adj))
+        if (
+            len(children[v]) >= 2
+            if parent[v] == -1
+            else any(low[c] >= disc[v] for c in children[v])
+        )
+    ]
+
+
+def _block_cut_tree(undirected: nx.Graph):
+    """
+    Blocks of an undirected graph and the blocks each node belongs to.
+
+    Returns:
+        Tuple (blocks, memberships, block_adj): node lists per block, node ->
+        block indices, and integer adjacency lists for each block of four or
+        more nodes (the only blocks that can gain articulation points)
+    """
+    blocks = [list(block) for block in nx.biconnected_components(undirected)]
+    memberships: Dict[str, List[int]] = {}
+    for i, block in enumerate(blocks):
+        for node in block:
+            memberships.setdefault(node, []).append(i)
+
+    block_adj: Dict[int, List[List[int]]] = {}
+    for i, block in enumerate(blocks):
+        if len(block) >= 4:
+            index = {node: k for k, node in enumerate(block)}
+            block_adj[i] = [[index[w] for w in undirected.adj[u] if w in index] for u in block]
+    return blocks, memberships, block_adj
+
+
+def _articulation_changes(v, blocks, memberships, block_adj, articulation) -> List[str]:
+    """Nodes other than v whose articulation-point status flips when v is removed."""
+    changed = []
+    for i in memberships.get(v, ()):
+        block = blocks[i]
+        if len(block) == 2:
+            u = block[0] if block[1] == v else block[1]
+            if len(memberships[u]) == 2:
+                changed.append(u)
+        elif i in block_adj:
+            changed.extend(
+                u
+                for u in _separated_by(block, block_adj[i], block.index(v))
+                if u not in articulation
+            )
+    return changed
+
+
+def removal_bus_factors(
+    graph: nx.DiGraph,
+    criticality: Dict[str, float],
+    undirected: Optional[nx.Graph] = None,
+) -> Dict[str, float]:
+    """
+    Bus factor score of the graph with each node removed.
+
+    A node is an articulation point iff it lies in two or more biconnected
+    components (blocks). From one pass over the block-cut tree, removing v:
+    - drops v itself as an articulation point;
+    - drops a neighbour u whose only other block was the bridge u-v;
+    - keeps every other articulation point, since a block of three or more
+      nodes stays connected without v.
+    The only new articulation points are nodes u for which {u, v} separates
+    a block of four or more nodes; those blocks are searched once per
+    removed member with an integer low-link DFS.
+
+    Args:
+        graph: NetworkX directed graph
+        criticality: Dict mapping node ID -> criticality score
+        undirected: Precomputed undirected view of ``graph`` (built if omitted)
+
+    Returns:
+        Dict mapping node ID -> bus factor score of the graph without it
+    """
+    if undirected is None:
+        undirected = graph.to_undirected()
+
+    blocks, memberships, block_adj = _block_cut_tree(undirected)
+    articulation = {node for node, member in memberships.items() if len(member) >= 2}
+    total = sum(criticality.get(node, 0.0) for node in articulation)
+    remaining = len(graph) - 1
+
+    result = {}
+    for v in graph:
+        if remaining == 0:
+            result[v] = 0.0
+            continue
+
+        score = total
+        count = len(articulation)
+        if v in articulation:
+            score -= criticality.get(v, 0.0)
+            count -= 1
+
+        for u in _articulation_changes(v, blocks, memberships, block_adj, articulation):
+            if u in articulation:
+                score -= criticality.get(u, 0.0)
+                count -= 1
+            else:
+                score += criticality.get(u, 0.0)
+                count += 1
+
+        result[v] = score / remaining if count else 0.0
+
+    return result
+
+
+def _separated_by(block: List[str], adj: List[List[int]], removed: int) -> List[str]:
+    """Nodes of a biconnected block that become articulation points without ``removed``."""
+    keep = [k for k in range(len(block)) if k != removed]
+    index = {k: j for j, k in enumerate(keep)}
+    reduced = [[index[w] for w in adj[k] if w != removed and w != k] for k in keep]
+    return [block[keep[j]] for j in _cut_vertices(reduced)]
+
+
+def _approval_totals(edge_types: Mapping[tuple, str], weights: Mapping[tuple, float]):
+    """
+    Approval edges grouped by approver and by approved node.
+
+    Returns:
+        Tuple (approvals, approvers, totals): approver -> [(target, weight)],
+        target -> approvers, and approver -> total approval weight
+    """
+    approvals: Dict[str, List[Tuple[str, float]]] = {}
+    approvers: Dict[str, List[str]] = {}
+    for edge in edges_of_type(edge_types, "approval"):
+        approvals.setdefault(edge[0], []).append((edge[1], weights.get(edge, 0.0)))
+        approvers.setdefault(edge[1], []).append(edge[0])
+
+    totals = {}
+    for node, edges in approvals.items():
+        total = 0.0
+        for _, weight in edges:
+            total += weight
+        totals[node] = total
+    return approvals, approvers, totals
+
+
+def _changed_totals(v, approvals, approvers, totals) -> Tuple[List[float], List[float]]:
+    """Approval totals removed and added when v leaves the graph."""
+    removed = []
+    added = []
+    if v in totals:
+        removed.append(totals[v])
+    for u in set(approvers.get(v, ())):
+        if u == v:
+            continue
+        removed.append(totals[u])
+        left = [weight for target, weight in approvals[u] if target != v]
+        if left:
+            total = 0.0
+            for weight in left:
+                total += weight
+            added.append(total)
+    return removed, added
+
+
+def removal_decision_concentrations(
+    nodes: Iterable[str], edge_types: Mapping[tuple, str], weights: Mapping[tuple, float]
+) -> Dict[str, float]:
+    """
+    Decision concentration score with each node removed.
+
+    Uses Σ(2i - n - 1) * w_i = Σ_{i<j} |w_i - w_j| for the Gini numerator.
+    Removing v drops v's approval total and lowers the totals of its
+    approvers, so the numerator is updated from sorted prefix sums in
+    O(k log n) for the k totals that change.
+
+    Args:
+        nodes: Node IDs to evaluate
+        edge_types: Dict mapping (u, v) -> edge type
+        weights: Dict mapping (u, v) -> edge weight
+
+    Returns:
+        Dict mapping node ID -> decision concentration score without it
+    """
+    approvals, approvers, totals = _approval_totals(edge_types, weights)
+
+    values = np.sort(np.fromiter(totals.values(), dtype=float, count=len(totals)))
+    n = len(values)
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    w_sum = float(prefix[-1])
+    numerator = float(np.dot(2 * np.arange(1, n + 1) - n - 1, values))
+    positive = int(np.count_nonzero(values))
+
+    def spread(x: float) -> float:
+        """Σ |x - w| over the base totals."""
+        k = bisect.bisect_left(values, x)
+        return x * k - prefix[k] + (w_sum - prefix[k]) - x * (n - k)
+
+    result = {}
+    for v in nodes:
+        removed, added = _changed_totals(v, approvals, approvers, totals)
+
+        new_numerator = numerator
+        for i, x in enumerate(removed):
+            new_numerator -= spread(x)
+            for y in removed[:i]:
+                new_numerator += abs(x - y)
+        for i, y in enumerate(added):
+            new_numerator += spread(y) - sum(abs(y - x) for x in removed)
+            for z in added[:i]:
+                new_numerator += abs(y - z)
+
+        new_n = n - len(removed) + len(added)
+        new_positive = positive - sum(x != 0 for x in removed) + sum(y != 0 for y in added)
+        if new_n == 0 or new_positive == 0:
+            result[v] = 0.0
+        else:
+            new_sum = w_sum - sum(removed) + sum(added)
+            result[v] = new_numerator / (new_n * new_sum)
+
+    return result
+
+
+def removal_path_counts(
+    graph: nx.DiGraph,
+    sources: Iterable[str],
+    edge_types: Mapping[tuple, str],
+    bypass_index: BypassIndex,
+) -> Tuple[int, int, Counter, Counter, Counter]:
+    """
+    Enumerate critical paths once and record what each node removal would drop.
+
+    Args:
+        graph: NetworkX directed graph
+        sources: Critical source node IDs
+        edge_types: Dict mapping (u, v) -> edge type
+        bypass_index: Index from ``build_bypass_index``
+
+    Returns:
+        Tuple (total, bypassable, containing, bypassable_containing, sole_bypass):
+        path counts, per-node counts of (bypassable) paths through the node,
+        and per-node counts of bypassable paths whose only bypass goes
+        through that node (and which do not contain it)
+    """
+    total = bypassable = 0
+    containing: Counter = Counter()
+    bypassable_containing: Counter = Counter()
+    sole_bypass: Counter = Counter()
+
+    for source in sources:
+        for path in iter_critical_paths_from(graph, source, edge_types):
+            total += 1
+            containing.update(path)
+            is_bypassable, sole = bypass_witness(path, bypass_index)
+            if is_bypassable:
+                bypassable += 1
+                bypassable_containing.update(path)
+                if sole is not None and sole not in path:
+                    sole_bypass[sole] += 1
+
+    return total, bypassable, containing, bypassable_containing, sole_bypass
+
+
+def removal_bypass_risks(
+    graph: nx.DiGraph,
+    criticality: Dict[str, float],
+    edge_types: Mapping[tuple, str],
+    bypass_index: BypassIndex,
+    critical_threshold: float = 0.7,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Bypass risk score with each node removed.
+
+    Removing v deletes exactly the critical paths through v and the
+    two-hop shortcuts through v; no path gains a shortcut. One enumeration
+    therefore gives every node's score (see ``removal_path_counts``).
+
+    Args:
+        graph: NetworkX directed graph
+        criticality: Dict mapping node ID -> criticality score
+        edge_types: Dict mapping (u, v) -> edge type
+        bypass_index: Index from ``build_bypass_index``
+        critical_threshold: Minimum criticality for a node to be critical
+        n_jobs: Worker processes to split critical sources across (default: serial)
+
+    Returns:
+        Dict mapping node ID -> bypass risk score without it
+    """
+    sources = [
+        node for node, crit in criticality.items() if crit >= critical_threshold and node in graph
+    ]
+
+    if n_jobs is not None and n_jobs != 1:
+        from .parallel import parallel_removal_path_counts
+
+        counts = parallel_removal_path_counts(graph, sources, edge_types, n_jobs, bypass_index)
+    else:
+        counts = removal_path_counts(graph, sources, edge_types, bypass_index)
+    total, bypassable, containing, bypassable_containing, sole_bypass = counts
+
+    result = {}
+    for v in graph:
+        remaining = total - containing[v]
+        if remaining == 0:
+            result[v] = 0.0
+        else:
+            result[v] = (bypassable - bypassable_containing[v] - sole_bypass[v]) / remaining
+
+    return result
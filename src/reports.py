@@ -9,6 +9,11 @@ from datetime import datetime
 from typing import Dict, Any
 
 
+def _format_score(score) -> str:
+    """Score to three decimals, or 'n/a' if it was not computed."""
+    return "n/a" if score is None else f"{score:.3f}"
+
+
 def generate_json_report(results: Dict[str, Any], metadata: Dict[str, Any]) -> str:
     """
     Generate JSON report.
@@ -90,7 +95,9 @@ def generate_markdown_report(results: Dict[str, Any], metadata: Dict[str, Any])
     md.append(
         f"| **Decision Concentration** | {results['decision_concentration']:.3f} | 35% | Authority centralization risk |"
     )
-    md.append(f"| **Bypass Risk** | {results['bypass_risk']:.3f} | 25% | Control override risk |")
+    md.append(
+        f"| **Bypass Risk** | {_format_score(results['bypass_risk'])} | 25% | Control override risk |"
+    )
     md.append(
         f"| **Composite Score** | {results['composite_score']:.3f} | 100% | Overall organizational risk |"
     )
@@ -133,7 +140,7 @@ def generate_markdown_report(results: Dict[str, Any], metadata: Dict[str, Any])
             md.append("   - Create decision-making committees")
             md.append("")
 
-        if results["bypass_risk"] > 0.5:
+        if (results["bypass_risk"] or 0.0) > 0.5:
             md.append("3. **Strengthen Access Controls:**")
             md.append("   - Review and audit emergency bypass procedures")
             md.append("   - Implement multi-party approval for critical operations")
@@ -428,7 +435,7 @@ def generate_html_report(results: Dict[str, Any], metadata: Dict[str, Any]) -> s
 
             <div class="metric-card">
                 <div class="metric-name">⚡ Bypass Risk</div>
-                <div class="metric-value">{results['bypass_risk']:.3f}</div>
+                <div class="metric-value">{_format_score(results['bypass_risk'])}</div>
                 <div class="metric-weight">Weight: 25%</div>
             </div>
         </div>
@@ -486,7 +493,7 @@ def generate_html_report(results: Dict[str, Any], metadata: Dict[str, Any]) -> s
                     </li>
 """
 
-        if results["bypass_risk"] > 0.5:
+        if (results["bypass_risk"] or 0.0) > 0.5:
             html += """
                     <li><strong>Strengthen Access Controls:</strong>
                         <ul>
@@ -0,0 +1,262 @@
+"""
+Sampling estimator for bypass risk.
+
+Exact bypass risk enumerates every critical path, and the number of simple
+paths can grow combinatorially with connectivity. This module estimates
+the same ratio from random walks instead. Each walk descends the DFS tree
+that ``iter_critical_paths_from`` would traverse, choosing a child
+uniformly at each level. Weighting every visited path by the inverse of its
+sampling probability (Knuth's estimator) gives unbiased estimates of a
+source's critical and bypassable path counts. Sampling stops once the
+confidence interval is narrow enough or the time budget runs out.
+"""
+
+import math
+import random
+import time
+from bisect import bisect_right
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import networkx as nx
+
+from .graph_analysis import BypassIndex, build_bypass_index, type_successors
+
+# Walks between checks of the stopping rule
+_BATCH = 64
+
+
+def sample_path_counts(
+    graph: nx.DiGraph,
+    source: str,
+    edge_types: Mapping[Tuple[str, str], str],
+    bypass_index: BypassIndex,
+    rng: random.Random,
+    cutoff: int = 5,
+) -> Tuple[float, float]:
+    """
+    Estimate a source's critical path counts from one random walk.
+
+    Args:
+        graph: NetworkX directed graph
+        source: Node ID to start from
+        edge_types: Dict mapping (u, v) -> edge type
+        bypass_index: Index from ``build_bypass_index``
+        rng: Random number generator
+        cutoff: Maximum path length in edges (default 5)
+
+    Returns:
+        Tuple (bypassable_estimate, total_estimate), unbiased estimates of
+        the counts ``count_bypassable_paths`` gives for this source
+    """
+    direct, two_hop = bypass_index
+    succ = graph.succ
+    approvals = type_successors(edge_types, "approval")
+    no_edges: Dict = {}
+    path = [source]
+    on_path = {source}
+    has_approval = False
+    bypassable = False
+    weight = 1.0
+    bypassable_estimate = total_estimate = 0.0
+
+    while len(path) <= cutoff:
+        tail = path[-1]
+        children = [child for child in succ[tail] if child not in on_path]
+        if not children:
+            break
+        weight *= len(children)
+        child = children[rng.randrange(len(children))]
+        path.append(child)
+        on_path.add(child)
+        if not has_approval:
+            if approvals is not None:
+                has_approval = child in approvals.get(tail, no_edges)
+            else:
+                has_approval = edge_types.get((tail, child)) == "approval"
+
+        # Bypassability is monotone along the walk: only pairs ending at the
+        # new node can add a shortcut
+        if not bypassable:
+            bypassable = _shortcut_to_tail(path, direct, two_hop)
+
+        if has_approval:
+            total_estimate += weight
+            if bypassable:
+                bypassable_estimate += weight
+
+    return bypassable_estimate, total_estimate
+
+
+def _shortcut_to_tail(path: List[str], direct, two_hop) -> bool:
+    """Whether a bypass shortcuts a segment of path ending at its last node."""
+    tail = path[-1]
+    for i in range(len(path) - 2):
+        pair = (path[i], tail)
+        if pair in direct:
+            return True
+        intermediates = two_hop.get(pair)
+        if intermediates:
+            segment = path[i:]
+            if any(node not in segment for node in intermediates):
+                return True
+    return False
+
+
+def estimate_bypass_risk(
+    graph: nx.DiGraph,
+    sources: Iterable[str],
+    edge_types: Mapping[Tuple[str, str], str],
+    bypass_index: Optional[BypassIndex] = None,
+    ci_width: float = 0.02,
+    time_budget: Optional[float] = 1.0,
+    confidence: float = 0.95,
+    proposal: str = "importance",
+    min_samples: int = 200,
+    max_samples: Optional[int] = None,
+    seed: Optional[int] = 42,
+    cutoff: int = 5,
+) -> Dict:
+    """
+    Estimate bypass risk over critical sources by sampling critical paths.
+
+    Each sample picks a source from the proposal distribution and walks one
+    random path from it; its counts are divided by the source's selection
+    probability. With ``proposal='importance'`` sources are picked in
+    proportion to a pilot estimate of their path counts (mixed with uniform
+    so no source is left out), which concentrates walks on the sources that
+    dominate the ratio. BR is the ratio of the bypassable and total means;
+    its confidence interval uses the delta-method standard error.
+
+    Args:
+        graph: NetworkX directed graph
+        sources: Critical source node IDs
+        edge_types: Dict mapping (u, v) -> edge type
+        bypass_index: Index from ``build_bypass_index`` (built if omitted)
+        ci_width: Stop when the confidence interval is at most this wide
+        time_budget: Stop after this many seconds (None: no limit)
+        confidence: Confidence level of the interval (default 0.95)
+        proposal: 'importance' or 'uniform' source selection
+        min_samples: Walks drawn before the interval is trusted (default 200)
+        max_samples: Stop after this many walks (None: no limit)
+        seed: Random seed (default 42)
+        cutoff: Maximum path length in edges (default 5)
+
+    Returns:
+        Dict containing:
+            - estimate: Estimated bypass risk [0,1]
+            - ci: (low, high) confidence interval, clipped to [0,1]
+            - samples: Number of random walks used
+    """
+    _check_stopping(proposal, ci_width, time_budget, max_samples)
+    sources = [source for source in sources if source in graph]
+    if not sources:
+        return {"estimate": 0.0, "ci": (0.0, 0.0), "samples": 0}
+    if bypass_index is None:
+        bypass_index = build_bypass_index(graph, edge_types)
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    rng = random.Random(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def walk(source):
+        return sample_path_counts(graph, source, edge_types, bypass_index, rng, cutoff)
+
+    # Pilot: one walk per source. The sweep is itself an unbiased sample
+    # (every source drawn with probability 1) and seeds the proposal.
+    pilot = [walk(source) for source in sources]
+    stats = _RatioStats()
+    stats.add(sum(b for b, _ in pilot), sum(t for _, t in pilot))
+    walks = len(pilot)
+
+    probabilities = _proposal(pilot, proposal)
+    cumulative = _cumulative(probabilities)
+
+    estimate, half_width = stats.interval(z)
+    while True:
+        if max_samples is not None and walks >= max_samples:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if walks >= min_samples and 2 * half_width <= ci_width:
+            break
+
+        for _ in range(_BATCH):
+            i = _pick(cumulative, rng.random())
+            b, t = walk(sources[i])
+            scale = 1.0 / probabilities[i]
+            stats.add(b * scale, t * scale)
+        walks += _BATCH
+        estimate, half_width = stats.interval(z)
+
+    return {
+        "estimate": estimate,
+        "ci": (max(0.0, estimate - half_width), min(1.0, estimate + half_width)),
+        "samples": walks,
+    }
+
+
+def _check_stopping(
+    proposal: str, ci_width: float, time_budget: Optional[float], max_samples: Optional[int]
+):
+    """Reject an unknown proposal, or options under which sampling never stops."""
+    if proposal not in ("importance", "uniform"):
+        raise ValueError(f"Unknown proposal: {proposal}")
+    if time_budget is None and max_samples is None and ci_width <= 0:
+        raise ValueError("Sampling needs a positive ci_width, a time_budget or max_samples")
+
+
+class _RatioStats:
+    """Running sums for a ratio estimate sum(b) / sum(t)."""
+
+    def __init__(self):
+        self.n = 0
+        self.b = self.t = 0.0
+        self.bb = self.bt = self.tt = 0.0
+
+    def add(self, b: float, t: float):
+        self.n += 1
+        self.b += b
+        self.t += t
+        self.bb += b * b
+        self.bt += b * t
+        self.tt += t * t
+
+    def interval(self, z: float) -> Tuple[float, float]:
+        """Ratio estimate and its delta-method confidence half-width."""
+        if self.t == 0:
+            # No critical path reached yet: BR is 0 as far as the samples show
+            return 0.0, 0.0
+        ratio = self.b / self.t
+        if self.n < 2:
+            return ratio, math.inf
+
+        # Sample variance of the residuals b - ratio * t
+        squares = self.bb - 2 * ratio * self.bt + ratio * ratio * self.tt
+        variance = max(squares, 0.0) / (self.n - 1)
+        return ratio, z * math.sqrt(variance / self.n) / (self.t / self.n)
+
+
+def _proposal(pilot: List[Tuple[float, float]], proposal: str) -> List[float]:
+    """Source selection probabilities."""
+    k = len(pilot)
+    uniform = 1.0 / k
+    totals = [t for _, t in pilot]
+    mass = sum(totals)
+    if proposal == "uniform" or mass == 0:
+        return [uniform] * k
+    return [0.5 * t / mass + 0.5 * uniform for t in totals]
+
+
+def _cumulative(probabilities: List[float]) -> List[float]:
+    cumulative = []
+    running = 0.0
+    for p in probabilities:
+        running += p
+        cumulative.append(running)
+    return cumulative
+
+
+def _pick(cumulative: List[float], u: float) -> int:
+    """Index of the first cumulative probability above u * total."""
+    return min(bisect_right(cumulative, u * cumulative[-1]), len(cumulative) - 1)
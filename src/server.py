@@ -0,0 +1,557 @@
+"""
+Local HTTP analysis server.
+
+``hrg serve`` keeps organizations parsed between requests. Uploaded files
+are identified by the SHA-256 of their content; each pool worker keeps the
+graphs it has built in an LRU cache, and the server keeps encoded results,
+so a repeated query is answered without touching the pool. Analyses run in
+a process pool and the asyncio event loop only parses HTTP.
+
+Endpoints (all responses are JSON):
+    GET  /health                            Server status
+    POST /graphs                            Upload an organization file, returns its graph_id
+    POST /calculate                         Upload and calculate in one request
+    GET  /graphs/<graph_id>/calculate       HumanRiskGraph.calculate
+    GET  /graphs/<graph_id>/nodes/<node>    HumanRiskGraph.analyze_node
+    GET  /graphs/<graph_id>/removal/<node>  HumanRiskGraph.simulate_node_removal
+
+Query parameters are keyword arguments of the analysis (values are parsed
+as JSON where possible, e.g. ``?alpha=0.5&bypass_method=exact``). Upload
+bodies are JSON, NDJSON (``?format=ndjson`` or an ``application/x-ndjson``
+content type) or a snapshot (``.hrgs``, recognized by its magic bytes).
+Snapshots are written to a spool directory and workers are sent the
+``Snapshot``, which pickles as its path; they map the file and calculate on
+its CSR arrays, building the DiGraph only for node analyses.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import Dict, Hashable, Optional, Set, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .loaders import GraphBuilder, iter_json_records, iter_ndjson_records
+from .parallel import resolve_n_jobs
+from .snapshot import MAGIC as SNAPSHOT_MAGIC
+from .snapshot import Snapshot
+
+# Keyword arguments accepted from the query string, per operation
+OPERATIONS = {
+    "calculate": {
+        "alpha",
+        "beta",
+        "gamma",
+        "critical_threshold",
+        "bypass_method",
+        "path_limit",
+        "ci_width",
+        "sample_time",
+        "seed",
+        "time_budget",
+    },
+    "analyze_node": {"betweenness_k", "betweenness_epsilon", "seed"},
+    "simulate_node_removal": set(),
+}
+
+_NODE_OPERATIONS = {"nodes": "analyze_node", "removal": "simulate_node_removal"}
+
+_MAX_BODY = 512 << 20
+
+# Per-process state set by _init_worker
+_WORKER: Dict = {"graphs": OrderedDict(), "cache_size": 8}
+
+
+class RequestError(Exception):
+    """An error reported to the client with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+class _GraphMissing(Exception):
+    """The worker has no cached graph for a digest and was not sent its content."""
+
+
+def _json_default(value):
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(payload) -> bytes:
+    return json.dumps(payload, default=_json_default).encode("utf-8")
+
+
+def _init_worker(cache_size: int):
+    _WORKER["graphs"] = OrderedDict()
+    _WORKER["cache_size"] = cache_size
+
+
+def _parse(content: bytes, format: str):
+    """Build a HumanRiskGraph from an uploaded file."""
+    text = io.StringIO(content.decode("utf-8"))
+    records = iter_ndjson_records(text) if format == "ndjson" else iter_json_records(text)
+    builder = GraphBuilder()
+    for kind, record in records:
+        builder.add(kind, record)
+    return builder.build()
+
+
+def _graph(digest: str, content, format: str):
+    """Cached graph (HumanRiskGraph or Snapshot) for digest, building it from content on a miss."""
+    graphs = _WORKER["graphs"]
+    hrg = graphs.get(digest)
+    if hrg is not None:
+        graphs.move_to_end(digest)
+        return hrg
+    if content is None:
+        raise _GraphMissing(digest)
+
+    if format == "snapshot":
+        hrg = content
+    else:
+        try:
+            hrg = _parse(content, format)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid organization file: {e}")
+    graphs[digest] = hrg
+    while len(graphs) > _WORKER["cache_size"]:
+        graphs.popitem(last=False)
+    return hrg
+
+
+def _node_id(hrg, node: str) -> Hashable:
+    """Map a node from the URL to a graph node (IDs may be integers)."""
+    if node in hrg.graph:
+        return node
+    try:
+        if int(node) in hrg.graph:
+            return int(node)
+    except ValueError:
+        pass
+    raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown person: {node}")
+
+
+def _run(
+    digest: str,
+    content: Optional[bytes],
+    format: str,
+    operation: str,
+    node: Optional[str],
+    params: Dict,
+) -> bytes:
+    """
+    Worker task: run one operation on a cached graph.
+
+    Args:
+        digest: Content hash identifying the graph
+        content: File content (a Snapshot for snapshots), or None to use
+            the worker's cache only
+        format: 'json', 'ndjson' or 'snapshot'
+        operation: 'load' or a key of ``OPERATIONS``
+        node: Node ID for analyze_node/simulate_node_removal
+        params: Keyword arguments for the operation
+
+    Returns:
+        JSON-encoded result
+
+    Raises:
+        _GraphMissing: If content is None and the graph is not cached
+        RequestError: For invalid files, unknown people or bad arguments
+    """
+    hrg = _graph(digest, content, format)
+    if operation == "load":
+        graph = hrg if isinstance(hrg, Snapshot) else hrg.graph
+        return _encode(
+            {
+                "graph_id": digest,
+                "people": graph.number_of_nodes(),
+                "dependencies": graph.number_of_edges(),
+            }
+        )
+    if isinstance(hrg, Snapshot) and operation != "calculate":
+        # Node analyses need the DiGraph; keep it for later requests
+        hrg = _WORKER["graphs"][digest] = hrg.to_hrg()
+
+    method = getattr(hrg, operation)
+    try:
+        if node is not None:
+            return _encode(method(_node_id(hrg, node), **params))
+        return _encode(method(**params))
+    except (TypeError, ValueError) as e:
+        raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+
+
+def _detect_format(headers: Dict, body: bytes) -> str:
+    """Upload format from the body's magic bytes or the content type."""
+    if body.startswith(SNAPSHOT_MAGIC):
+        return "snapshot"
+    return "ndjson" if "ndjson" in headers.get("content-type", "") else "json"
+
+
+def _parse_params(pairs, operation: str) -> Dict:
+    """Keyword arguments for operation from (name, value) query pairs."""
+    params = {}
+    for name, value in pairs:
+        if name not in OPERATIONS[operation]:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown parameter for {operation}: {name}")
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        if isinstance(value, (list, dict)):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Parameter {name} must be a single value")
+        params[name] = value
+    return params
+
+
+async def _read_head(reader: asyncio.StreamReader, request_line: bytes):
+    """Method, target, HTTP version and lower-cased headers of a request."""
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _keep_alive(version: str, headers: Dict) -> bool:
+    """Whether the client expects the connection to stay open."""
+    connection = headers.get("connection", "").lower()
+    return connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+
+class AnalysisServer:
+    """
+    Asyncio HTTP server answering analysis requests from a process pool.
+
+    Args:
+        n_jobs: Pool worker processes (default: 1, -1 for all CPUs)
+        cache_size: Organization files kept by the server, and parsed
+            graphs kept by each worker (default 8)
+        result_cache_size: Encoded results kept (default 1024)
+        max_body: Largest accepted upload in bytes
+
+    Example:
+        >>> server = AnalysisServer(n_jobs=2)
+        >>> asyncio.run(server.serve_forever("127.0.0.1", 8765))
+    """
+
+    def __init__(
+        self,
+        n_jobs: Optional[int] = None,
+        cache_size: int = 8,
+        result_cache_size: int = 1024,
+        max_body: int = _MAX_BODY,
+    ):
+        if cache_size < 1 or result_cache_size < 0:
+            raise ValueError("Cache sizes must be positive")
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.cache_size = cache_size
+        self.result_cache_size = result_cache_size
+        self.max_body = max_body
+        # digest -> (content or Snapshot, format, load response)
+        self._contents: "OrderedDict[str, Tuple[object, str, bytes]]" = OrderedDict()
+        self._results: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Pool tasks not yet finished, cancelled on close
+        self._pending: Set[Future] = set()
+        self._server: Optional[asyncio.Server] = None
+        # Directory holding uploaded snapshots while they are registered
+        self._spool: Optional[str] = None
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on (useful when started on port 0)."""
+        return self._listening().sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        """Start the pool and listen for connections."""
+        self._spool = tempfile.mkdtemp(prefix="hrg-serve-")
+        self._pool = self._new_pool()
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765, ready=None):
+        """Start, call ready(self) once listening, and serve until cancelled."""
+        await self.start(host, port)
+        if ready is not None:
+            ready(self)
+        try:
+            await self._listening().serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop listening and shut down the pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            # Drop queued tasks; shutdown(cancel_futures=True) needs Python 3.9
+            for future in list(self._pending):
+                future.cancel()
+            self._pool.shutdown()
+            self._pool = None
+        if self._spool is not None:
+            shutil.rmtree(self._spool, ignore_errors=True)
+            self._spool = None
+
+    def _listening(self) -> asyncio.Server:
+        if self._server is None:
+            raise RuntimeError("AnalysisServer is not running; call start() first")
+        return self._server
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.n_jobs, initializer=_init_worker, initargs=(self.cache_size,)
+        )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        # Every request in flight on a broken pool fails; only the first replaces it
+        if self._pool is broken:
+            broken.shutdown(wait=False)
+            self._pool = self._new_pool()
+
+    async def _submit(self, *task) -> bytes:
+        pool = self._pool
+        if pool is None:
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "Server is not running")
+        try:
+            future = pool.submit(_run, *task)
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            raise RequestError(HTTPStatus.INTERNAL_SERVER_ERROR, "Analysis worker crashed")
+
+    async def register(self, content: bytes, format: str = "json") -> bytes:
+        """
+        Parse an organization file in the pool unless it is already known.
+
+        Returns:
+            JSON with graph_id, people and dependencies
+        """
+        if format not in ("json", "ndjson", "snapshot"):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown format: {format}")
+        digest = hashlib.sha256(content).hexdigest()
+        if digest in self._contents:
+            self._contents.move_to_end(digest)
+            return self._contents[digest][2]
+
+        payload = self._spool_snapshot(digest, content) if format == "snapshot" else content
+        try:
+            response = await self._submit(digest, payload, format, "load", None, {})
+        except BaseException:
+            self._drop(payload)
+            raise
+        self._contents[digest] = (payload, format, response)
+        while len(self._contents) > self.cache_size:
+            self._drop(self._contents.popitem(last=False)[1][0])
+        return response
+
+    def _spool_snapshot(self, digest: str, content: bytes) -> Snapshot:
+        """Write an uploaded snapshot to the spool directory and open it."""
+        if self._spool is None:
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "Server is not running")
+        path = os.path.join(self._spool, f"{digest}.hrgs")
+        with open(path, "wb") as f:
+            f.write(content)
+        try:
+            return Snapshot(path)
+        except (ValueError, KeyError, TypeError) as e:
+            os.remove(path)
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid snapshot: {e}")
+
+    @staticmethod
+    def _drop(payload):
+        """Delete the spooled file of a snapshot that is no longer registered."""
+        if isinstance(payload, Snapshot):
+            try:
+                os.remove(payload.path)
+            except OSError:
+                pass
+
+    async def query(self, digest: str, operation: str, node: Optional[str], params: Dict):
+        """
+        Run an operation on a registered graph, with result caching.
+
+        Returns:
+            Tuple (JSON result, True if it came from the cache)
+        """
+        if digest not in self._contents:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown graph: {digest}")
+        key = (digest, operation, node, tuple(sorted(params.items())))
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key], True
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key]), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            content, format, _ = self._contents[digest]
+            try:
+                result = await self._submit(digest, None, format, operation, node, params)
+            except _GraphMissing:
+                result = await self._submit(digest, content, format, operation, node, params)
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+        # Time-budgeted results depend on machine load, so they are not reused
+        if "time_budget" not in params and self.result_cache_size:
+            self._results[key] = result
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+        return result, False
+
+    async def dispatch(self, method: str, target: str, headers: Dict, body: bytes):
+        """
+        Route one request.
+
+        Returns:
+            Tuple (status, JSON body, extra headers)
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+
+        if method == "GET" and parts == ["health"]:
+            return HTTPStatus.OK, _encode({"status": "ok", "graphs": len(self._contents)}), {}
+
+        if method == "POST" and parts in (["graphs"], ["calculate"]):
+            query = parse_qsl(url.query, keep_blank_values=True)
+            format = dict(query).get("format") or _detect_format(headers, body)
+            if parts == ["graphs"]:
+                return HTTPStatus.OK, await self.register(body, format), {}
+            loaded = json.loads(await self.register(body, format))
+            params = _parse_params([(k, v) for k, v in query if k != "format"], "calculate")
+            result, hit = await self.query(loaded["graph_id"], "calculate", None, params)
+            return HTTPStatus.OK, result, {"X-Cache": "hit" if hit else "miss"}
+
+        if method == "GET" and len(parts) >= 3 and parts[0] == "graphs":
+            digest = parts[1]
+            if parts[2:] == ["calculate"]:
+                operation, node = "calculate", None
+            elif len(parts) == 4 and parts[2] in _NODE_OPERATIONS:
+                operation, node = _NODE_OPERATIONS[parts[2]], parts[3]
+            else:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Not found: {url.path}")
+            params = _parse_params(parse_qsl(url.query, keep_blank_values=True), operation)
+            result, hit = await self.query(digest, operation, node, params)
+            return HTTPStatus.OK, result, {"X-Cache": "hit" if hit else "miss"}
+
+        raise RequestError(HTTPStatus.NOT_FOUND, f"Not found: {method} {url.path}")
+
+    def _content_length(self, headers: Dict) -> int:
+        """Length of the request body, rejecting chunked and oversized bodies."""
+        if "chunked" in headers.get("transfer-encoding", ""):
+            raise RequestError(HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported")
+        length = int(headers.get("content-length", 0))
+        if length > self.max_body:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+        return length
+
+    async def _respond(self, reader: asyncio.StreamReader, request_line: bytes):
+        """
+        Read and dispatch the rest of one request.
+
+        Returns:
+            Tuple of status, payload, extra headers and whether to keep the
+            connection open
+        """
+        keep_alive = True
+        extra: Dict = {}
+        try:
+            method, target, version, headers = await _read_head(reader, request_line)
+            keep_alive = _keep_alive(version, headers)
+            try:
+                length = self._content_length(headers)
+            except RequestError:
+                keep_alive = False
+                raise
+            body = await reader.readexactly(length) if length else b""
+            status, payload, extra = await self.dispatch(method, target, headers, body)
+        except RequestError as e:
+            status, payload = e.status, _encode({"error": e.message})
+        except json.JSONDecodeError as e:
+            status, payload = HTTPStatus.BAD_REQUEST, _encode({"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception as e:
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            payload = _encode({"error": f"{type(e).__name__}: {e}"})
+        return status, payload, extra, keep_alive
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                status, payload, extra, keep_alive = await self._respond(reader, request_line)
+
+                status = HTTPStatus(status)
+                head = [
+                    f"HTTP/1.1 {status.value} {status.phrase}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(payload)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ]
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    n_jobs: Optional[int] = None,
+    cache_size: int = 8,
+    ready=None,
+):
+    """
+    Run an AnalysisServer until interrupted.
+
+    Args:
+        host: Interface to bind (default 127.0.0.1)
+        port: Port to listen on (default 8765)
+        n_jobs: Pool worker processes (default: 1, -1 for all CPUs)
+        cache_size: Organization files and parsed graphs kept (default 8)
+        ready: Called with the server once it is listening
+    """
+    server = AnalysisServer(n_jobs=n_jobs, cache_size=cache_size)
+    asyncio.run(server.serve_forever(host, port, ready))
@@ -0,0 +1,385 @@
+"""
+Binary snapshots of built Human Risk Graphs.
+
+A snapshot is one file holding a graph as flat arrays: the interned node
+ID table, CSR adjacency (``indptr``/``indices``), edge type codes and
+weights, criticality and role codes. ``load_snapshot`` memory-maps the
+file instead of reading it, so opening a large organization takes
+milliseconds and processes that open the same snapshot share its pages
+through the OS page cache.
+
+Layout: an 8-byte magic string, the header length as a little-endian
+uint64, a JSON header describing every array, then the data section
+(from the next 64-byte boundary) with each array at an aligned offset.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .csr import CSRGraph
+from .encoding import EDGE_TYPE_NAMES
+
+MAGIC = b"HRGSNAP1"
+
+# Suffix used by the CLI and load_graph for snapshot files
+SUFFIX = ".hrgs"
+
+_ALIGN = 64
+
+
+class _StringTable(Sequence):
+    """Node IDs stored as UTF-8 bytes plus offsets, decoded on access."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self._data[self._offsets[i] : self._offsets[i + 1]].tobytes().decode("utf-8")
+
+    def tolist(self) -> List[str]:
+        data = self._data.tobytes()
+        offsets = self._offsets.tolist()
+        return [data[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+
+class Snapshot:
+    """
+    Memory-mapped view of a snapshot file.
+
+    Array attributes are read-only views into the mapped file; nothing is
+    read from disk until it is used.
+
+    Attributes:
+        path: Snapshot file path
+        ids: Node IDs by position (decoded lazily for string IDs); the
+            first n_people are listed people, the rest are only named by
+            dependencies
+        n_people: Number of listed people
+        roles: Distinct role names; ``role_codes`` index into it
+        role_codes: Role of each listed person
+        criticality: Criticality of each listed person
+        type_names: Dependency type names outside EdgeType; code
+            ``len(EdgeType) + i`` in ``edge_types`` is type_names[i]
+        indptr: CSR row pointers, length n + 1
+        indices: Target position of each edge, grouped by source
+        edge_types: Type code of each edge
+        weights: Weight of each edge
+        edge_order: CSR position of each edge in original insertion order
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a Human Risk Graph snapshot")
+            size = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            header = json.loads(f.read(size).decode("utf-8"))
+
+        self._data_start = _aligned(len(MAGIC) + 8 + size)
+        self._mmap = np.memmap(self.path, dtype=np.uint8, mode="r")
+        arrays = {name: self._array(spec) for name, spec in header["arrays"].items()}
+        if header["id_kind"] == "str":
+            self.ids = _StringTable(arrays["id_data"], arrays["id_offsets"])
+        else:
+            self.ids = arrays["ids"]
+        self.roles: List[str] = header["roles"]
+        self.role_codes = arrays["role_codes"]
+        self.criticality = arrays["criticality"]
+        # Version 1 files hold only listed people and EdgeType names
+        self.n_people: int = header.get("n_people", len(self.criticality))
+        self.type_names: List[str] = header.get("type_names", [])
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.edge_types = arrays["edge_types"]
+        self.weights = arrays["weights"]
+        self.edge_order = arrays["edge_order"]
+
+    def _array(self, spec: Dict) -> np.ndarray:
+        dtype = np.dtype(spec["dtype"])
+        count = spec["count"]
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.ndarray(
+            (count,), dtype=dtype, buffer=self._mmap, offset=self._data_start + spec["offset"]
+        )
+
+    def __reduce__(self):
+        # Workers re-map the file instead of receiving a copy of its arrays
+        return Snapshot, (self.path,)
+
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    def _id_list(self) -> List[Hashable]:
+        return self.ids.tolist()
+
+    def to_csr(self) -> CSRGraph:
+        """
+        CSRGraph over the mapped arrays (no edge data is copied).
+
+        Returns:
+            CSRGraph accepted by the metrics in ``metrics.py``
+        """
+        return CSRGraph(
+            self._id_list(),
+            self.indptr,
+            self.indices,
+            self.edge_types,
+            self.weights,
+            self.type_names,
+        )
+
+    def to_hrg(self):
+        """
+        Build the full HumanRiskGraph, with nodes and edges in their original order.
+
+        People named only by dependencies come after the listed people, as
+        in a graph built by the constructor.
+
+        Returns:
+            HumanRiskGraph (see ``HumanRiskGraph.from_arrays``)
+        """
+        from .hrg import HumanRiskGraph
+
+        n = self.number_of_nodes()
+        sources = np.repeat(np.arange(n, dtype=self.indices.dtype), np.diff(self.indptr))
+        order = self.edge_order
+        return HumanRiskGraph.from_arrays(
+            self._id_list(),
+            np.array(self.roles, dtype=object)[self.role_codes],
+            self.criticality,
+            sources[order],
+            self.indices[order],
+            self.edge_types[order],
+            self.weights[order],
+            type_names=self.type_names,
+            n_people=self.n_people,
+        )
+
+    def calculate(
+        self,
+        alpha: float = 0.4,
+        beta: float = 0.3,
+        gamma: float = 0.3,
+        critical_threshold: float = 0.7,
+        bypass_method: str = "exact",
+        path_limit: int = 200_000,
+        ci_width: float = 0.02,
+        sample_time: Optional[float] = 1.0,
+        seed: Optional[int] = 42,
+        time_budget: Optional[float] = None,
+    ) -> Dict:
+        """
+        Calculate all HRG risk metrics on ``to_csr()``.
+
+        Same results as ``to_hrg().calculate(...)``, without building the
+        DiGraph, unless bypass risk has to be sampled (``bypass_method``
+        'sample', or more than ``path_limit`` critical paths with 'auto'):
+        sampling walks the full graph, so it is left to
+        ``HumanRiskGraph.calculate`` with whatever time is left.
+
+        Args:
+            See ``HumanRiskGraph.calculate``
+
+        Returns:
+            Dict as returned by ``HumanRiskGraph.calculate``
+        """
+        from .metrics import (
+            _bounded_path_counts,
+            bus_factor_score,
+            composite_hrg_score,
+            gini_concentration,
+            interpret_risk_level,
+        )
+
+        if bypass_method not in ("exact", "sample", "auto"):
+            raise ValueError(f"Unknown bypass_method: {bypass_method}")
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+
+        csr = self.to_csr()
+        # Only the first n_people nodes have a criticality
+        criticality: Dict[Any, float] = dict(zip(csr.ids, self.criticality.tolist()))
+        critical_nodes = [node for node, crit in criticality.items() if crit >= critical_threshold]
+        counts: List = []
+        finished = False
+        if bypass_method != "sample":
+            limit = path_limit if bypass_method == "auto" else None
+            counts, finished = _bounded_path_counts(
+                csr, critical_nodes, {}, csr.bypass_index(), limit, deadline
+            )
+        if not finished and (deadline is None or time.monotonic() < deadline):
+            return self.to_hrg().calculate(
+                alpha,
+                beta,
+                gamma,
+                critical_threshold,
+                bypass_method="sample",
+                ci_width=ci_width,
+                sample_time=sample_time,
+                seed=seed,
+                deadline=deadline,
+            )
+
+        articulation_points = csr.articulation_points()
+        bf = bus_factor_score(csr, criticality, critical_threshold, articulation_points)
+        dc = gini_concentration(list(csr.approval_totals().values()))
+        br, details = _bypass_risk(counts, finished, len(critical_nodes))
+        composite = composite_hrg_score(bf, dc, br, alpha, beta, gamma)
+        return {
+            "bus_factor": bf,
+            "decision_concentration": dc,
+            "bypass_risk": br,
+            "composite_score": composite,
+            "risk_level": interpret_risk_level(composite),
+            "critical_nodes": critical_nodes,
+            "articulation_points": list(articulation_points),
+            **details,
+        }
+
+
+def _bypass_risk(counts: List[Tuple], finished: bool, n_critical: int) -> Tuple:
+    """BR and its details from (source, bypassable, total) counts, as in HumanRiskGraph."""
+    if finished:
+        details = {"bypass_risk_method": "exact", "approximate": False, "coverage": 1.0}
+    else:
+        # Out of time: BR over the sources counted so far, unknown if none were
+        details = {
+            "bypass_risk_method": "partial",
+            "approximate": True,
+            "coverage": len(counts) / n_critical,
+        }
+        if not counts:
+            return None, details
+    total = sum(count[2] for count in counts)
+    return (sum(count[1] for count in counts) / total if total else 0.0), details
+
+
+def save_snapshot(hrg, path):
+    """
+    Write a HumanRiskGraph to a snapshot file.
+
+    Args:
+        hrg: HumanRiskGraph to save
+        path: Output file path (conventionally ending in ``.hrgs``)
+
+    Nodes that are not listed people (only named by dependencies) are
+    stored after the people, which is where the constructor puts them.
+
+    Raises:
+        ValueError: If node IDs are neither all strings nor all integers,
+            or a dependency type outside EdgeType is not a string
+    """
+    criticality = hrg.criticality
+    people = [node for node in hrg.graph if node in criticality]
+    ids = people + [node for node in hrg.graph if node not in criticality]
+    n = len(ids)
+    index = {node: i for i, node in enumerate(ids)}
+    arrays: Dict[str, np.ndarray] = {}
+
+    if all(type(node) is str for node in ids):
+        id_kind = "str"
+        encoded = [node.encode("utf-8") for node in ids]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        arrays["id_data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays["id_offsets"] = offsets
+    elif all(type(node) is int for node in ids):
+        id_kind = "int"
+        arrays["ids"] = np.array(ids, dtype=np.int64)
+    else:
+        raise ValueError("Snapshots need node IDs that are all strings or all integers")
+
+    roles: Dict[str, int] = {}
+    nodes = hrg.graph.nodes
+    arrays["role_codes"] = np.fromiter(
+        (roles.setdefault(nodes[node].get("role", "Unknown"), len(roles)) for node in people),
+        dtype=np.int32,
+        count=len(people),
+    )
+    arrays["criticality"] = np.fromiter(
+        (criticality[node] for node in people), dtype=np.float64, count=len(people)
+    )
+
+    # Live edges in insertion order, sorted by (source, target) for CSR
+    store = hrg._edges
+    store_src, store_dst, codes, weights = store.arrays()
+    type_names = store.names[len(EDGE_TYPE_NAMES) :]
+    if not all(isinstance(name, str) for name in type_names):
+        raise ValueError("Snapshots need dependency type names that are strings")
+    position = np.array([index.get(node, -1) for node in store.ids], dtype=np.int64)
+    src, dst = position[store_src], position[store_dst]
+    order = np.lexsort((dst, src))
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    index_dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+    arrays["indptr"] = indptr
+    arrays["indices"] = dst[order].astype(index_dtype)
+    arrays["edge_types"] = codes[order]
+    arrays["weights"] = weights[order]
+    edge_order = np.empty(len(order), dtype=np.int64)
+    edge_order[order] = np.arange(len(order))
+    arrays["edge_order"] = edge_order
+
+    header = {
+        "version": 2,
+        "id_kind": id_kind,
+        "roles": list(roles),
+        "n_people": len(people),
+        "type_names": type_names,
+    }
+    _write(path, header, arrays)
+
+
+def _write(path, header: Dict, arrays: Dict[str, np.ndarray]):
+    """Write the header, then each array at an aligned offset into the data section."""
+    specs = {}
+    offset = 0
+    for name, array in arrays.items():
+        specs[name] = {"dtype": array.dtype.str, "count": len(array), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+    header_bytes = json.dumps({**header, "arrays": specs}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.array([len(header_bytes)], dtype="<u8").tobytes())
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.write(b"\0" * (data_start + specs[name]["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp, path)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def load_snapshot(path) -> Snapshot:
+    """
+    Open a snapshot file by memory-mapping it.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        Snapshot; call ``to_hrg()`` for a HumanRiskGraph or ``to_csr()``
+        for the compact metrics backend
+    """
+    return Snapshot(path)
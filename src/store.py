@@ -0,0 +1,533 @@
+"""
+Compact edge storage for Human Risk Graph.
+
+A dict per edge in the DiGraph, plus ``edge_types`` and ``weights`` dicts
+keyed by ``(str, str)`` tuples, cost several hundred bytes per dependency.
+``EdgeStore`` interns node IDs to dense integers once and keeps every
+edge's endpoints, type code and weight in typed arrays. The graph's edge
+attribute mapping for each edge is an ``EdgeRecord`` (two slots pointing
+into the store), and ``EdgeTypeView``/``EdgeWeightView`` present the store
+as the familiar ``(u, v) -> value`` mappings.
+
+The store can also keep the edges of a type as out- and in-adjacency
+dicts, so queries such as "every approval edge" or "bypass edges out of
+u" cost O(edges of that type) instead of a scan of every edge. A type is
+indexed on request (or first query) and kept up to date from then on, so
+types nobody filters by cost no memory.
+"""
+
+import copy
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .encoding import EDGE_TYPE_NAMES
+
+# Type code marking a deleted slot
+_DELETED = -1
+
+# Largest type code that fits in array('b')
+_MAX_CODE = 127
+
+_ATTRS = ("edge_type", "weight")
+
+
+def _add_neighbour(index: Dict, key: Hashable, other: Hashable, record: "EdgeRecord"):
+    neighbours = index.get(key)
+    if neighbours is None:
+        neighbours = index[key] = {}
+    neighbours[other] = record
+
+
+def _drop_neighbour(index: Dict, key: Hashable, other: Hashable):
+    neighbours = index[key]
+    del neighbours[other]
+    if not neighbours:
+        del index[key]
+
+
+class EdgeStore:
+    """
+    Typed-array storage for the dependencies of one graph.
+
+    Each edge occupies a slot: ``sources[slot]`` and ``targets[slot]`` are
+    interned node numbers, ``types[slot]`` an EdgeType code (or a code for
+    an extra type name) and ``weights[slot]`` the weight. Slots are in
+    insertion order; removed edges leave a tombstone until the arrays are
+    compacted.
+
+    For each indexed type code, ``out_index[code][u][v]`` holds the record
+    of every live edge u -> v of that type, and so does ``in_index[code][v][u]``
+    once in-edges of the type have been asked for; nodes without edges of
+    the type have no entry.
+
+    ``version`` is incremented by every edge addition, removal, retype or
+    reweight, however it is made (store, record or view), so caches can
+    tell that the edges changed even when NetworkX's cache was not cleared.
+    """
+
+    __slots__ = (
+        "ids",
+        "index",
+        "sources",
+        "targets",
+        "types",
+        "weights",
+        "records",
+        "names",
+        "codes",
+        "size",
+        "out_index",
+        "in_index",
+        "version",
+    )
+
+    def __init__(self):
+        self.ids: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        self.sources = array("i")
+        self.targets = array("i")
+        self.types = array("b")
+        self.weights = array("d")
+        self.records: List = []
+        self.names: List[Hashable] = list(EDGE_TYPE_NAMES)
+        self.codes: Dict[Hashable, int] = {name: code for code, name in enumerate(self.names)}
+        self.size = 0
+        self.out_index: Dict[int, Dict[Hashable, Dict[Hashable, "EdgeRecord"]]] = {}
+        self.in_index: Dict[int, Dict[Hashable, Dict[Hashable, "EdgeRecord"]]] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def intern(self, node: Hashable) -> int:
+        """Dense integer for a node ID, assigned on first use."""
+        number = self.index.get(node)
+        if number is None:
+            number = self.index[node] = len(self.ids)
+            self.ids.append(node)
+        return number
+
+    def code(self, name: Hashable) -> int:
+        """Type code for a type name; names outside EdgeType get extra codes."""
+        code = self.codes.get(name)
+        if code is None:
+            code = len(self.names)
+            if code > _MAX_CODE:
+                raise ValueError("Too many distinct dependency types")
+            self.codes[name] = code
+            self.names.append(name)
+        return code
+
+    def set_edge(self, graph: nx.DiGraph, u: Hashable, v: Hashable, edge_type, weight: float):
+        """
+        Add an edge, or overwrite the type and weight of an existing one.
+
+        The edge's record is placed directly in the graph's adjacency, so
+        callers that need NetworkX's cache cleared must do so themselves
+        (``graph.add_edge(u, v)`` first does both).
+        """
+        record = graph._succ.get(u, {}).get(v)
+        if isinstance(record, EdgeRecord) and record._store is self:
+            self.retype(record._slot, edge_type)
+            self.reweight(record._slot, weight)
+            return
+
+        new = EdgeRecord(self, len(self.records))
+        if record:
+            new._extra = {k: value for k, value in record.items() if k not in _ATTRS}
+        code = self.code(edge_type)
+        self.sources.append(self.intern(u))
+        self.targets.append(self.intern(v))
+        self.types.append(code)
+        self.weights.append(weight)
+        self.records.append(new)
+        self.size += 1
+        self.version += 1
+        self._link(code, u, v, new)
+
+        if u not in graph._succ:
+            graph.add_node(u)
+        if v not in graph._succ:
+            graph.add_node(v)
+        graph._succ[u][v] = new
+        graph._pred[v][u] = new
+
+    def extend(
+        self, ids: List[Hashable], src: np.ndarray, dst: np.ndarray, codes: np.ndarray, weight
+    ) -> List["EdgeRecord"]:
+        """
+        Append edges given as positions in ids, without touching any graph.
+
+        Args:
+            ids: Node IDs that src and dst index into
+            src: Source positions
+            dst: Target positions
+            codes: EdgeType codes
+            weight: Edge weights
+
+        Returns:
+            The new records, aligned with the inputs
+        """
+        numbers = np.fromiter((self.intern(node) for node in ids), dtype=np.int32, count=len(ids))
+        start = len(self.records)
+        self.sources.frombytes(numbers[src].astype(np.int32).tobytes())
+        self.targets.frombytes(numbers[dst].astype(np.int32).tobytes())
+        self.types.frombytes(np.asarray(codes, dtype=np.int8).tobytes())
+        self.weights.frombytes(np.asarray(weight, dtype=np.float64).tobytes())
+        records = [EdgeRecord(self, slot) for slot in range(start, start + len(src))]
+        self.records.extend(records)
+        self.size += len(records)
+        self.version += 1
+        if self.out_index or self.in_index:
+            for slot in range(start, start + len(records)):
+                self._link(self.types[slot], *self.edge(slot), self.records[slot])
+        return records
+
+    def retype(self, slot: int, edge_type: Hashable):
+        """Change the type of a live slot, moving it between type indexes."""
+        code = self.code(edge_type)
+        old = self.types[slot]
+        if code == old:
+            return
+        u, v = self.edge(slot)
+        self._unlink(old, u, v)
+        self.types[slot] = code
+        self.version += 1
+        self._link(code, u, v, self.records[slot])
+
+    def reweight(self, slot: int, weight: float):
+        """Change the weight of a live slot."""
+        if self.weights[slot] != weight:
+            self.weights[slot] = weight
+            self.version += 1
+
+    def touch(self):
+        """Bump the version for a graph edit outside the store, such as a new node."""
+        self.version += 1
+
+    def index_types(self, edge_types: Iterable[Hashable], incoming: bool = False):
+        """
+        Start indexing the given types by out-adjacency (and in-adjacency).
+
+        Time complexity: O(|E|) once per type and direction; afterwards
+        every edge change updates the index in O(1)
+        """
+        codes = {self.code(name) for name in edge_types}
+        out_codes = codes - self.out_index.keys()
+        in_codes = codes - self.in_index.keys() if incoming else set()
+        if not out_codes and not in_codes:
+            return
+        for code in out_codes:
+            self.out_index[code] = {}
+        for code in in_codes:
+            self.in_index[code] = {}
+        types = np.array(self.types, dtype=np.int8)
+        for slot in np.flatnonzero(np.isin(types, list(out_codes | in_codes))).tolist():
+            code = self.types[slot]
+            u, v = self.edge(slot)
+            if code in out_codes:
+                _add_neighbour(self.out_index[code], u, v, self.records[slot])
+            if code in in_codes:
+                _add_neighbour(self.in_index[code], v, u, self.records[slot])
+
+    def _link(self, code: int, u: Hashable, v: Hashable, record: "EdgeRecord"):
+        out_edges = self.out_index.get(code)
+        if out_edges is not None:
+            _add_neighbour(out_edges, u, v, record)
+        in_edges = self.in_index.get(code)
+        if in_edges is not None:
+            _add_neighbour(in_edges, v, u, record)
+
+    def _unlink(self, code: int, u: Hashable, v: Hashable):
+        if code in self.out_index:
+            _drop_neighbour(self.out_index[code], u, v)
+        if code in self.in_index:
+            _drop_neighbour(self.in_index[code], v, u)
+
+    def remove(self, graph: nx.DiGraph, u: Hashable, v: Hashable):
+        """Forget an edge's slot; the graph edge itself is removed by the caller."""
+        record = graph._succ.get(u, {}).get(v)
+        if not isinstance(record, EdgeRecord) or record._store is not self:
+            return
+        slot = record._slot
+        self._unlink(self.types[slot], u, v)
+        # Detach the record, keeping its values for anyone still holding it
+        record._extra = {**dict(record), **(record._extra or {})}
+        record._store = None
+        self.types[slot] = _DELETED
+        self.records[slot] = None
+        self.size -= 1
+        self.version += 1
+        if len(self.records) > 1024 and self.size < len(self.records) // 2:
+            self.compact()
+
+    def compact(self):
+        """Drop tombstones and renumber the surviving records."""
+        live = [slot for slot, record in enumerate(self.records) if record is not None]
+        for name in ("sources", "targets", "types", "weights"):
+            values = getattr(self, name)
+            setattr(self, name, array(values.typecode, (values[slot] for slot in live)))
+        self.records = [self.records[slot] for slot in live]
+        for slot, record in enumerate(self.records):
+            record._slot = slot
+
+    def slot(self, graph: nx.DiGraph, edge: Tuple[Hashable, Hashable]) -> int:
+        """Slot of an edge, raising KeyError if the store does not hold it."""
+        try:
+            record = graph._succ[edge[0]][edge[1]]
+        except (KeyError, TypeError, IndexError):
+            raise KeyError(edge) from None
+        if not isinstance(record, EdgeRecord) or record._store is not self:
+            raise KeyError(edge)
+        return record._slot
+
+    def live_slots(self) -> Iterator[int]:
+        """Slots of current edges, in insertion order."""
+        for slot, code in enumerate(self.types):
+            if code != _DELETED:
+                yield slot
+
+    def edge(self, slot: int) -> Tuple[Hashable, Hashable]:
+        """(u, v) node IDs of a slot."""
+        return self.ids[self.sources[slot]], self.ids[self.targets[slot]]
+
+    def out_adjacency(self, edge_type: Hashable) -> Dict[Hashable, Dict[Hashable, "EdgeRecord"]]:
+        """``{u: {v: record}}`` for the live edges of one type (do not modify)."""
+        if edge_type not in self.codes:
+            return {}
+        self.index_types([edge_type])
+        return self.out_index[self.codes[edge_type]]
+
+    def in_adjacency(self, edge_type: Hashable) -> Dict[Hashable, Dict[Hashable, "EdgeRecord"]]:
+        """``{v: {u: record}}`` for the live edges of one type (do not modify)."""
+        if edge_type not in self.codes:
+            return {}
+        self.index_types([edge_type], incoming=True)
+        return self.in_index[self.codes[edge_type]]
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        NumPy copies of the live edges' columns.
+
+        Copies, because an array exporting its buffer cannot grow.
+
+        Returns:
+            Tuple (sources, targets, type_codes, weights); sources and
+            targets are interned node numbers (see ``ids``)
+        """
+        if self.size < len(self.records):
+            self.compact()
+        return (
+            np.array(self.sources, dtype=np.int32),
+            np.array(self.targets, dtype=np.int32),
+            np.array(self.types, dtype=np.int8),
+            np.array(self.weights, dtype=np.float64),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the typed arrays."""
+        return sum(
+            values.itemsize * len(values)
+            for values in (self.sources, self.targets, self.types, self.weights)
+        )
+
+
+class EdgeRecord(MutableMapping):
+    """
+    Edge attribute mapping of the DiGraph, backed by an EdgeStore slot.
+
+    Behaves like the ``{'edge_type': ..., 'weight': ...}`` dict NetworkX
+    would otherwise keep per edge; other attributes go to a small dict
+    created on first use.
+    """
+
+    __slots__ = ("_store", "_slot", "_extra")
+
+    def __init__(self, store: EdgeStore, slot: int):
+        self._store: Optional[EdgeStore] = store
+        self._slot = slot
+        self._extra: Optional[Dict] = None
+
+    def __getitem__(self, key):
+        store = self._store
+        if store is not None:
+            if key == "edge_type":
+                return store.names[store.types[self._slot]]
+            if key == "weight":
+                return store.weights[self._slot]
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        store = self._store
+        if store is not None and key == "edge_type":
+            store.retype(self._slot, value)
+        elif store is not None and key == "weight":
+            store.reweight(self._slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if self._store is not None and key in _ATTRS:
+            raise TypeError(f"Cannot delete stored attribute {key!r}")
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self):
+        if self._store is not None:
+            yield from _ATTRS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return (2 if self._store is not None else 0) + len(self._extra or ())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> Dict:
+        """Plain dict copy (used by ``DiGraph.copy``)."""
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> Dict:
+        return copy.deepcopy(dict(self), memo)
+
+
+class EdgeTypeView(MutableMapping):
+    """``(u, v) -> type name`` mapping over an EdgeStore."""
+
+    __slots__ = ("_graph", "_store")
+
+    def __init__(self, graph: nx.DiGraph, store: EdgeStore):
+        self._graph = graph
+        self._store = store
+
+    @property
+    def store(self) -> EdgeStore:
+        """EdgeStore holding the types (its ``names`` table maps codes to names)."""
+        return self._store
+
+    def get(self, edge, default=None):
+        # Hot path in path enumeration: avoid the Mapping mixin's try/except
+        try:
+            record = self._graph._succ[edge[0]][edge[1]]
+            store = record._store
+        except (KeyError, AttributeError):
+            return default
+        if store is not self._store:
+            return default
+        return store.names[store.types[record._slot]]
+
+    def __getitem__(self, edge):
+        store = self._store
+        return store.names[store.types[store.slot(self._graph, edge)]]
+
+    def __setitem__(self, edge, name):
+        # New edges are added through HumanRiskGraph.add_dependency
+        store = self._store
+        store.retype(store.slot(self._graph, edge), name)
+
+    def __delitem__(self, edge):
+        # The edge would stay in the graph without a type or weight
+        raise TypeError("Remove dependencies with HumanRiskGraph.remove_dependency")
+
+    def __contains__(self, edge) -> bool:
+        return self.get(edge) is not None
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        store = self._store
+        return (store.edge(slot) for slot in store.live_slots())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def items(self):
+        store = self._store
+        names = store.names
+        return [(store.edge(slot), names[store.types[slot]]) for slot in store.live_slots()]
+
+    def values(self):
+        store = self._store
+        return [store.names[store.types[slot]] for slot in store.live_slots()]
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def edges_of_type(self, edge_type: Hashable) -> Iterator[Tuple[Hashable, Hashable]]:
+        """(u, v) pairs of every edge with the given type."""
+        for u, targets in self._store.out_adjacency(edge_type).items():
+            for v in targets:
+                yield u, v
+
+    def out_adjacency(self, edge_type: Hashable) -> Dict[Hashable, Dict[Hashable, EdgeRecord]]:
+        """``{u: {v: record}}`` for every edge with the given type (do not modify)."""
+        return self._store.out_adjacency(edge_type)
+
+    def successors(self, node: Hashable, edge_type: Hashable) -> Dict[Hashable, EdgeRecord]:
+        """Targets of the node's out-edges of the given type (do not modify)."""
+        return self._store.out_adjacency(edge_type).get(node, {})
+
+    def predecessors(self, node: Hashable, edge_type: Hashable) -> Dict[Hashable, EdgeRecord]:
+        """Sources of the node's in-edges of the given type (do not modify)."""
+        return self._store.in_adjacency(edge_type).get(node, {})
+
+
+class EdgeWeightView(MutableMapping):
+    """``(u, v) -> weight`` mapping over an EdgeStore."""
+
+    __slots__ = ("_graph", "_store")
+
+    def __init__(self, graph: nx.DiGraph, store: EdgeStore):
+        self._graph = graph
+        self._store = store
+
+    def get(self, edge, default=None):
+        try:
+            record = self._graph._succ[edge[0]][edge[1]]
+            store = record._store
+        except (KeyError, AttributeError):
+            return default
+        if store is not self._store:
+            return default
+        return store.weights[record._slot]
+
+    def __getitem__(self, edge):
+        return self._store.weights[self._store.slot(self._graph, edge)]
+
+    def __setitem__(self, edge, weight):
+        store = self._store
+        store.reweight(store.slot(self._graph, edge), weight)
+
+    def __delitem__(self, edge):
+        # The edge would stay in the graph without a type or weight
+        raise TypeError("Remove dependencies with HumanRiskGraph.remove_dependency")
+
+    def __contains__(self, edge) -> bool:
+        return self.get(edge) is not None
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        store = self._store
+        return (store.edge(slot) for slot in store.live_slots())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def items(self):
+        store = self._store
+        return [(store.edge(slot), store.weights[slot]) for slot in store.live_slots()]
+
+    def values(self):
+        store = self._store
+        return [store.weights[slot] for slot in store.live_slots()]
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
@@ -0,0 +1,241 @@
+"""
+Monte Carlo uncertainty analysis for Human Risk Graph.
+
+Criticality and weight values are estimates. This module perturbs them
+with per-field noise models and scores many replicates. Topology-only
+artifacts (articulation points, per-source critical path counts) are
+computed once. Each replicate then reduces to array operations: BF is a
+masked sum of criticality, DC a row-wise Gini of approval totals, and BR a
+masked sum of per-source path counts.
+"""
+
+import numpy as np
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+
+from .graph_analysis import edges_of_type
+
+# Replicates scored per chunk, bounding memory to chunk * |V| values
+_CHUNK = 256
+
+METRICS = ("bus_factor", "decision_concentration", "bypass_risk", "composite_score")
+
+
+class NoiseModel(NamedTuple):
+    """
+    Perturbation applied to a field of estimates.
+
+    Attributes:
+        distribution: 'normal' (additive Gaussian, std = scale) or
+            'uniform' (additive, in [-scale, scale])
+        scale: Noise magnitude; perturbed values are clipped to [0, 1]
+    """
+
+    distribution: str = "normal"
+    scale: float = 0.1
+
+    def sample(self, values: np.ndarray, rng: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Draw perturbed copies of values.
+
+        Args:
+            values: Point estimates
+            rng: NumPy random generator
+            size: Number of replicates
+
+        Returns:
+            Array of shape (size, len(values)) clipped to [0, 1]
+        """
+        shape = (size, len(values))
+        if self.distribution == "normal":
+            noise = rng.normal(0.0, self.scale, shape)
+        elif self.distribution == "uniform":
+            noise = rng.uniform(-self.scale, self.scale, shape)
+        else:
+            raise ValueError(f"Unknown noise distribution: {self.distribution}")
+        return np.clip(values + noise, 0.0, 1.0)
+
+
+def score_replicates(
+    hrg,
+    criticality_samples: np.ndarray,
+    weight_samples: np.ndarray,
+    alpha: float = 0.4,
+    beta: float = 0.3,
+    gamma: float = 0.3,
+    critical_threshold: float = 0.7,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Score replicates of a graph's criticality and weight values.
+
+    Args:
+        hrg: HumanRiskGraph providing topology and edge types
+        criticality_samples: Array (N, len(hrg.criticality)), columns in
+            hrg.criticality order
+        weight_samples: Array (N, len(hrg.weights)), columns in hrg.weights order
+        alpha: Weight for bus factor score (default 0.4)
+        beta: Weight for decision concentration (default 0.3)
+        gamma: Weight for bypass risk (default 0.3)
+        critical_threshold: Minimum criticality for critical nodes (default 0.7)
+        n_jobs: Worker processes for critical-path counting (default: serial)
+
+    Returns:
+        Dict mapping bus_factor, decision_concentration, bypass_risk and
+        composite_score -> array of N replicate values
+    """
+    from .metrics import composite_hrg_scores
+
+    context = hrg.context
+    nodes = list(hrg.criticality)
+    criticality_samples = np.asarray(criticality_samples, dtype=float).reshape(-1, len(nodes))
+    weight_samples = np.asarray(weight_samples, dtype=float).reshape(-1, len(hrg.weights))
+    replicates = len(criticality_samples)
+
+    # BF: criticality summed over articulation points, over |V|
+    articulation_points = context.articulation_points
+    ap_mask = np.array([node in articulation_points for node in nodes], dtype=bool)
+    n_graph = len(hrg.graph)
+    if n_graph and ap_mask.any():
+        bf = criticality_samples[:, ap_mask].sum(axis=1) / n_graph
+    else:
+        bf = np.zeros(replicates)
+
+    dc = _replicate_gini(hrg, weight_samples)
+
+    # BR: per-source path counts for every node critical in some replicate
+    critical = criticality_samples >= critical_threshold
+    needed = [nodes[i] for i in np.flatnonzero(critical.any(axis=0))]
+    counts = context.source_path_counts(needed, n_jobs=n_jobs)
+    bypassable = np.array([counts.get(node, (0, 0))[0] for node in nodes], dtype=float)
+    total = np.array([counts.get(node, (0, 0))[1] for node in nodes], dtype=float)
+    total_paths = critical @ total
+    br = np.divide(
+        critical @ bypassable, total_paths, out=np.zeros(replicates), where=total_paths > 0
+    )
+
+    composite = composite_hrg_scores(bf, dc, br, [(alpha, beta, gamma)])
+    return {
+        "bus_factor": bf,
+        "decision_concentration": dc,
+        "bypass_risk": br,
+        "composite_score": composite,
+    }
+
+
+def _replicate_gini(hrg, weight_samples: np.ndarray) -> np.ndarray:
+    """Gini concentration of approval totals for each row of weight samples."""
+    replicates = len(weight_samples)
+    column = {edge: i for i, edge in enumerate(hrg.weights)}
+
+    # Approval edges grouped by source; missing weights stay 0.0
+    by_source: Dict = {}
+    for edge in edges_of_type(hrg.edge_types, "approval"):
+        by_source.setdefault(edge[0], []).append(column.get(edge, -1))
+    n = len(by_source)
+    if n == 0:
+        return np.zeros(replicates)
+
+    columns = np.array([i for group in by_source.values() for i in group], dtype=np.intp)
+    starts = np.cumsum([0] + [len(group) for group in by_source.values()][:-1])
+    padded = np.concatenate((weight_samples, np.zeros((replicates, 1))), axis=1)
+    totals = np.add.reduceat(padded[:, columns], starts, axis=1)
+
+    # Closed-form Gini per row, as in gini_concentration
+    totals.sort(axis=1)
+    sums = totals.sum(axis=1)
+    numerator = totals @ np.arange(1 - n, n, 2, dtype=float)
+    return np.divide(numerator, n * sums, out=np.zeros(replicates), where=sums > 0)
+
+
+def monte_carlo_samples(
+    hrg,
+    n_replicates: int = 1000,
+    criticality_noise: Optional[NoiseModel] = NoiseModel(),
+    weight_noise: Optional[NoiseModel] = NoiseModel(),
+    alpha: float = 0.4,
+    beta: float = 0.3,
+    gamma: float = 0.3,
+    critical_threshold: float = 0.7,
+    seed: Optional[int] = 0,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Draw perturbed replicates of a graph and score each one.
+
+    Replicates are drawn and scored in fixed-size chunks from a single
+    seeded generator, so results depend only on the seed, not on n_jobs.
+
+    Args:
+        hrg: HumanRiskGraph to perturb
+        n_replicates: Number of replicates (default 1000)
+        criticality_noise: Noise model for criticality (None: held fixed)
+        weight_noise: Noise model for dependency weights (None: held fixed)
+        alpha: Weight for bus factor score (default 0.4)
+        beta: Weight for decision concentration (default 0.3)
+        gamma: Weight for bypass risk (default 0.3)
+        critical_threshold: Minimum criticality for critical nodes (default 0.7)
+        seed: Random seed (default 0)
+        n_jobs: Worker processes for critical-path counting (default: serial)
+
+    Returns:
+        Dict mapping metric name -> array of n_replicates values
+    """
+    rng = np.random.default_rng(seed)
+    criticality = np.fromiter(hrg.criticality.values(), dtype=float, count=len(hrg.criticality))
+    weights = np.fromiter(hrg.weights.values(), dtype=float, count=len(hrg.weights))
+
+    chunks = []
+    for start in range(0, n_replicates, _CHUNK):
+        size = min(_CHUNK, n_replicates - start)
+        crit_samples = _draw(criticality_noise, criticality, rng, size)
+        weight_samples = _draw(weight_noise, weights, rng, size)
+        chunks.append(
+            score_replicates(
+                hrg,
+                crit_samples,
+                weight_samples,
+                alpha,
+                beta,
+                gamma,
+                critical_threshold,
+                n_jobs,
+            )
+        )
+
+    return {
+        metric: np.concatenate([chunk[metric] for chunk in chunks]) if chunks else np.zeros(0)
+        for metric in METRICS
+    }
+
+
+def _draw(noise: Optional[NoiseModel], values: np.ndarray, rng, size: int) -> np.ndarray:
+    if noise is None:
+        return np.broadcast_to(values, (size, len(values)))
+    return noise.sample(values, rng, size)
+
+
+def summarize_samples(
+    samples: Dict[str, np.ndarray], percentiles: Sequence[float] = (5, 50, 95)
+) -> Dict[str, Any]:
+    """
+    Summarize replicate values per metric.
+
+    Args:
+        samples: Dict mapping metric name -> replicate values
+        percentiles: Percentiles to report, in [0, 100]
+
+    Returns:
+        Dict mapping metric name -> {'mean', 'std', 'percentiles'}, where
+        'percentiles' maps each requested percentile -> value
+    """
+    summary = {}
+    for metric, values in samples.items():
+        if len(values) == 0:
+            raise ValueError("Cannot summarize zero replicates")
+        points = np.percentile(values, percentiles)
+        summary[metric] = {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "percentiles": dict(zip(percentiles, points.tolist())),
+        }
+    return summary
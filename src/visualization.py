@@ -9,7 +9,7 @@ import networkx as nx
 from pathlib import Path
 
 
-def generate_graph_visualization(hrg, results, output_file):
+def generate_graph_visualization(hrg, results, output_file, n_jobs=None):
     """
     Generate interactive HTML visualization of the organizational graph.
 
@@ -17,6 +17,7 @@ def generate_graph_visualization(hrg, results, output_file):
         hrg: HumanRiskGraph instance
         results: Analysis results dict
         output_file: Path to save HTML file
+        n_jobs: Worker processes for per-node analysis (default: serial)
     """
     # Create pyvis network
     net = Network(
@@ -74,13 +75,15 @@ def generate_graph_visualization(hrg, results, output_file):
     degree_centrality = nx.degree_centrality(G)
     max_degree = max(degree_centrality.values()) if degree_centrality else 1
 
+    # Analyze all nodes in one batch (global artifacts are computed once)
+    node_table = hrg.analyze_nodes([person["id"] for person in hrg.people], n_jobs=n_jobs)
+
     # Add nodes with risk-based coloring
-    for person in hrg.people:
+    for row, person in enumerate(hrg.people):
         person_id = person["id"]
         name = person.get("name", person_id)
 
-        # Analyze this specific node
-        node_analysis = hrg.analyze_node(person_id)
+        node_analysis = {column: values[row] for column, values in node_table.items()}
         node_score = node_analysis.get("node_risk_score", 0)
 
         # Determine node color based on risk level
@@ -184,14 +187,14 @@ def generate_graph_visualization(hrg, results, output_file):
             Composite Score: {composite:.3f}<br>
             Bus Factor: {bus_factor:.3f}<br>
             Decision Conc.: {decision:.3f}<br>
-            Bypass Risk: {bypass:.3f}
+            Bypass Risk: {bypass}
         </div>
     </div>
     """.format(
         composite=results["composite_score"],
         bus_factor=results["bus_factor"],
         decision=results["decision_concentration"],
-        bypass=results["bypass_risk"],
+        bypass="n/a" if results["bypass_risk"] is None else f"{results['bypass_risk']:.3f}",
     )
 
     # Generate HTML
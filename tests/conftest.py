@@ -0,0 +1,73 @@
+"""
+Shared fixtures: random organizations for tests that compare against a reference.
+
+Each fixture is a factory, called with (n, m, seed) for n people and m
+dependencies; the same arguments always give the same organization.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+from src.hrg import HumanRiskGraph
+
+
+def _random_org(n, m, seed):
+    """Random directed graph with random edge types."""
+    rng = random.Random(seed)
+    graph = nx.gnm_random_graph(n, m, seed=seed, directed=True)
+    graph = nx.relabel_nodes(graph, {i: f"P{i}" for i in graph.nodes()})
+    edge_types = {edge: rng.choice(["approval", "escalation", "bypass"]) for edge in graph.edges()}
+    criticality = {node: rng.random() for node in graph.nodes()}
+    return graph, edge_types, criticality
+
+
+def _random_data(n, m, seed):
+    """Organization data dict built from _random_org."""
+    graph, edge_types, criticality = _random_org(n, m, seed)
+    people = [
+        {"id": node, "role": f"R{i % 3}", "criticality": criticality[node]}
+        for i, node in enumerate(graph)
+    ]
+    dependencies = [
+        {"from": u, "to": v, "type": edge_types[(u, v)], "weight": (i % 10) / 10}
+        for i, (u, v) in enumerate(graph.edges())
+    ]
+    return {"people": people, "dependencies": dependencies}
+
+
+def _random_hrg(n, m, seed):
+    """HumanRiskGraph built from _random_data."""
+    return HumanRiskGraph(**_random_data(n, m, seed))
+
+
+def _assert_same_graph(hrg, expected):
+    assert list(hrg.graph.nodes(data=True)) == list(expected.graph.nodes(data=True))
+    assert list(hrg.edge_types.items()) == list(expected.edge_types.items())
+    assert list(hrg.weights.items()) == list(expected.weights.items())
+    assert hrg.criticality == expected.criticality
+    assert hrg.calculate() == expected.calculate()
+
+
+@pytest.fixture
+def random_org():
+    """random_org(n, m, seed) -> (graph, edge_types, criticality)."""
+    return _random_org
+
+
+@pytest.fixture
+def random_data():
+    """random_data(n, m, seed) -> {"people": [...], "dependencies": [...]}."""
+    return _random_data
+
+
+@pytest.fixture
+def random_hrg():
+    """random_hrg(n, m, seed) -> HumanRiskGraph of random_data(n, m, seed)."""
+    return _random_hrg
+
+
+@pytest.fixture
+def assert_same_graph():
+    """assert_same_graph(hrg, expected): same nodes, edges, values and scores, in order."""
+    return _assert_same_graph
@@ -0,0 +1,126 @@
+"""
+Unit tests for batch analysis.
+"""
+
+import csv
+import json
+
+import pytest
+from src.batch import SUMMARY_FIELDS, find_org_files, run_batch, write_fleet_summary
+from src.hrg import HumanRiskGraph
+from src.snapshot import Snapshot, save_snapshot
+
+
+@pytest.fixture
+def org_dir(tmp_path, random_data):
+    """Directory with two valid files, a malformed one and an unrelated one."""
+    data = random_data(20, 40, 1)
+    (tmp_path / "a.json").write_text(json.dumps(data))
+    lines = [json.dumps(record) for record in data["people"] + data["dependencies"]]
+    (tmp_path / "b.ndjson").write_text("\n".join(lines))
+    (tmp_path / "broken.json").write_text('{"people": [')
+    (tmp_path / "notes.txt").write_text("not an organization")
+    return tmp_path
+
+
+class TestFindOrgFiles:
+    def test_directory(self, org_dir):
+        """A directory expands to its organization files, sorted."""
+        assert [p.name for p in find_org_files(org_dir)] == ["a.json", "b.ndjson", "broken.json"]
+
+    def test_glob(self, org_dir):
+        """Anything else is a glob pattern."""
+        (org_dir / "sub").mkdir()
+        (org_dir / "sub" / "c.json").write_text("{}")
+
+        assert [p.name for p in find_org_files(org_dir / "**" / "*.json")] == [
+            "a.json",
+            "broken.json",
+            "c.json",
+        ]
+
+
+class TestRunBatch:
+    @pytest.mark.parametrize("n_jobs,timeout", [(None, None), (2, 60)])
+    def test_isolates_failures(self, org_dir, n_jobs, timeout, random_data):
+        """A malformed file becomes an error row; the others are analyzed."""
+        output = org_dir / "out"
+        seen = []
+
+        rows = run_batch(
+            find_org_files(org_dir),
+            output,
+            formats=("json", "markdown"),
+            n_jobs=n_jobs,
+            timeout=timeout,
+            callback=seen.append,
+        )
+
+        assert [row["status"] for row in rows] == ["ok", "ok", "error"]
+        assert "JSONDecodeError" in rows[2]["error"]
+        assert sorted(r["file"] for r in seen) == sorted(r["file"] for r in rows)
+        assert rows[0]["composite_score"] == rows[1]["composite_score"]
+        expected = HumanRiskGraph(**random_data(20, 40, 1))
+        assert rows[0]["composite_score"] == expected.calculate()["composite_score"]
+        assert (output / "a_report.json").exists() and (output / "b_report.md").exists()
+        assert all(set(row) == set(SUMMARY_FIELDS) for row in rows)
+
+    def test_snapshot_file(self, tmp_path, monkeypatch, random_data):
+        """Snapshots are analyzed on their CSR arrays, without building the DiGraph."""
+        hrg = HumanRiskGraph(**random_data(20, 40, 1))
+        save_snapshot(hrg, tmp_path / "org.hrgs")
+        monkeypatch.setattr(Snapshot, "to_hrg", None)
+
+        (row,) = run_batch([tmp_path / "org.hrgs"], tmp_path / "out")
+
+        assert row["status"] == "ok" and row["people"] == 20
+        assert row["composite_score"] == pytest.approx(hrg.calculate()["composite_score"])
+
+    def test_timeout(self, tmp_path, random_data):
+        """A slow file times out without holding up the next one."""
+        slow = random_data(200, 2000, 1)
+        for person in slow["people"]:
+            person["criticality"] = 0.9
+        (tmp_path / "a_slow.json").write_text(json.dumps(slow))
+        save_snapshot(HumanRiskGraph(**random_data(10, 15, 2)), tmp_path / "b_fast.hrgs")
+
+        rows = run_batch(find_org_files(tmp_path), tmp_path / "out", n_jobs=1, timeout=0.5)
+
+        assert [row["status"] for row in rows] == ["timeout", "ok"]
+
+    def test_duplicate_stems(self, tmp_path, random_data):
+        """Files with the same stem get numbered reports."""
+        data = json.dumps(random_data(5, 5, 3))
+        for name in ("x", "y"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "org.json").write_text(data)
+
+        run_batch(find_org_files(tmp_path / "*" / "org.json"), tmp_path / "out")
+
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+            "org_1_report.json",
+            "org_2_report.json",
+        ]
+
+    def test_rejects_unknown_format(self, tmp_path):
+        """Unknown report formats are rejected up front."""
+        with pytest.raises(ValueError):
+            run_batch([], tmp_path, formats=("pdf",))
+
+
+class TestFleetSummary:
+    def test_writes_csv_and_json(self, org_dir):
+        """The CSV has a row per file and the JSON aggregates them."""
+        rows = run_batch(find_org_files(org_dir), org_dir / "out", formats=())
+
+        csv_path, json_path = write_fleet_summary(rows, org_dir / "out")
+
+        with open(csv_path) as f:
+            csv_rows = list(csv.DictReader(f))
+        summary = json.loads(json_path.read_text())
+        assert [row["status"] for row in csv_rows] == ["ok", "ok", "error"]
+        assert summary["files"] == 3
+        assert summary["status_counts"] == {"ok": 2, "error": 1}
+        assert sum(summary["risk_levels"].values()) == 2
+        assert summary["mean_composite_score"] == rows[0]["composite_score"]
+        assert len(summary["results"]) == 3
@@ -0,0 +1,103 @@
+"""
+Unit tests for the shared analysis context.
+"""
+
+import networkx as nx
+from src.context import AnalysisContext
+from src.hrg import HumanRiskGraph
+
+
+class TestAnalysisContext:
+    def test_artifacts_are_cached(self):
+        """Artifacts are computed once and reused."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "B"), ("B", "C")])
+        context = AnalysisContext(graph)
+
+        assert context.articulation_points == {"B"}
+        assert context.articulation_points is context.articulation_points
+        assert context.betweenness is context.betweenness
+        assert context.undirected is context.undirected
+
+    def test_invalidates_on_graph_change(self):
+        """Mutating the graph drops stale artifacts."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "B"), ("B", "C")])
+        context = AnalysisContext(graph)
+        assert context.articulation_points == {"B"}
+
+        graph.add_edge("C", "A")
+
+        assert context.is_stale()
+        assert context.articulation_points == set()
+        assert not context.is_stale()
+
+    def test_bypass_index(self):
+        """Bypass index is built from the context's edge types."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "B"), ("B", "C")])
+        context = AnalysisContext(graph, {("A", "B"): "bypass", ("B", "C"): "approval"})
+
+        assert context.bypass_index.direct == {("A", "B")}
+
+
+class TestHumanRiskGraphContext:
+    def test_context_shared_across_calls(self):
+        """calculate() and analyze_node() reuse one context."""
+        people = [
+            {"id": "A", "role": "SRE", "criticality": 0.9},
+            {"id": "B", "role": "Engineer", "criticality": 0.5},
+            {"id": "C", "role": "Manager", "criticality": 0.6},
+        ]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+            {"from": "B", "to": "C", "type": "escalation", "weight": 0.7},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+
+        result = hrg.calculate()
+        betweenness = hrg.context.betweenness
+        hrg.analyze_node("A")
+        hrg.analyze_node("B")
+
+        assert result["articulation_points"] == ["B"]
+        assert hrg.context.betweenness is betweenness
+
+    def test_context_follows_graph_edits(self):
+        """Direct edits to hrg.graph are picked up by calculate()."""
+        people = [
+            {"id": "A", "role": "SRE", "criticality": 0.9},
+            {"id": "B", "role": "Engineer", "criticality": 0.5},
+            {"id": "C", "role": "Manager", "criticality": 0.6},
+        ]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+            {"from": "B", "to": "C", "type": "escalation", "weight": 0.7},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        assert hrg.analyze_node("B")["is_articulation_point"]
+
+        hrg.graph.add_edge("C", "A")
+
+        assert not hrg.analyze_node("B")["is_articulation_point"]
+        assert hrg.calculate()["articulation_points"] == []
+
+    def test_detects_retypes_without_networkx_cache(self):
+        """Retypes made through the views invalidate the context, even on NetworkX < 3.3."""
+        people = [{"id": "A", "criticality": 0.9}, {"id": "B"}, {"id": "C"}]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+            {"from": "B", "to": "C", "type": "escalation", "weight": 0.7},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        # NetworkX < 3.3 has no per-graph cache; node and edge counts stay the same
+        del hrg.graph.__networkx_cache__
+        context = hrg.context
+        assert context.bypass_index.direct == set()
+
+        hrg.edge_types[("A", "B")] = "bypass"
+
+        assert context.is_stale()
+        assert context.bypass_index.direct == {("A", "B")}
+        hrg.graph.edges["B", "C"]["edge_type"] = "bypass"
+        assert context.bypass_index.direct == {("A", "B"), ("B", "C")}
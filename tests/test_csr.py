@@ -0,0 +1,118 @@
+"""
+Unit tests for the CSR graph backend.
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+from src.csr import CSRGraph
+from src.encoding import EDGE_TYPE_NAMES, EdgeType
+from src.graph_analysis import build_bypass_index, find_articulation_points
+from src.hrg import HumanRiskGraph
+from src.metrics import (
+    bus_factor_score,
+    bypass_risk_counts,
+    bypass_risk_score,
+    decision_concentration_score,
+)
+
+
+def random_weights(graph, seed):
+    rng = np.random.default_rng(seed)
+    return {edge: float(w) for edge, w in zip(graph.edges(), rng.random(graph.number_of_edges()))}
+
+
+class TestCSRGraph:
+    def test_from_arrays_keeps_last_duplicate(self):
+        """Repeated edges keep the last type and weight."""
+        csr = CSRGraph.from_arrays(
+            ["A", "B", "C"],
+            [0, 1, 0, 0],
+            [2, 2, 1, 2],
+            [EdgeType.BYPASS, EdgeType.APPROVAL, EdgeType.ESCALATION, EdgeType.APPROVAL],
+            [0.1, 0.2, 0.3, 0.4],
+        )
+
+        assert csr.number_of_edges() == 3
+        assert csr.indptr.tolist() == [0, 2, 3, 3]
+        assert csr.indices.tolist() == [1, 2, 2]
+        assert csr.edge_types.tolist() == [EdgeType.ESCALATION, EdgeType.APPROVAL, 0]
+        assert csr.weights.tolist() == [0.3, 0.4, 0.2]
+
+        with pytest.raises(ValueError):
+            CSRGraph.from_arrays(["A"], [0], [1], [0], [0.5])
+
+    @pytest.mark.parametrize("n,m,seed", [(20, 30, 1), (40, 60, 2), (60, 150, 3)])
+    def test_metrics_match_networkx(self, n, m, seed, random_org):
+        """Metrics on a CSRGraph equal the same metrics on the DiGraph."""
+        graph, edge_types, criticality = random_org(n, m, seed)
+        weights = random_weights(graph, seed)
+        csr = CSRGraph.from_networkx(graph, edge_types, weights)
+
+        assert csr.articulation_points() == find_articulation_points(graph)
+        assert bus_factor_score(csr, criticality) == pytest.approx(
+            bus_factor_score(graph, criticality)
+        )
+        assert decision_concentration_score(csr, None, None) == pytest.approx(
+            decision_concentration_score(graph, edge_types, weights), abs=1e-12
+        )
+        assert bypass_risk_counts(csr, criticality, None, 0.5, by_source=True) == (
+            bypass_risk_counts(graph, criticality, edge_types, 0.5, by_source=True)
+        )
+        assert bypass_risk_score(csr, criticality, None) == bypass_risk_score(
+            graph, criticality, edge_types
+        )
+
+    def test_custom_dependency_types(self, random_data):
+        """Type names outside EdgeType get extra codes and metrics ignore them, as on the DiGraph."""
+        data = random_data(30, 70, 6)
+        for i, dependency in enumerate(data["dependencies"][::4]):
+            dependency["type"] = ["consult", "review"][i % 2]
+        hrg = HumanRiskGraph(**data)
+
+        csr = hrg.to_csr()
+
+        assert csr.type_names == ["consult", "review"]
+        names = list(EDGE_TYPE_NAMES) + csr.type_names
+        assert {
+            (csr.ids[u], csr.ids[v]): names[code]
+            for u, v, code in zip(
+                csr.edge_sources().tolist(), csr.indices.tolist(), csr.edge_types.tolist()
+            )
+        } == dict(hrg.edge_types.items())
+        plain = CSRGraph.from_networkx(hrg.graph, dict(hrg.edge_types), {})
+        assert sorted(plain.type_names) == csr.type_names
+        assert bypass_risk_score(csr, hrg.criticality, None) == bypass_risk_score(
+            hrg.graph, hrg.criticality, hrg.edge_types
+        )
+
+    def test_bypass_index_uses_positions(self, random_org):
+        """The CSR bypass index is the networkx one with IDs replaced by positions."""
+        graph, edge_types, _ = random_org(30, 70, 4)
+        csr = CSRGraph.from_networkx(graph, edge_types, {})
+        expected = build_bypass_index(graph, edge_types)
+        ids = csr.ids
+
+        assert {(ids[u], ids[v]) for u, v in csr.bypass_index().direct} == expected.direct
+        assert {
+            (ids[u], ids[v]): {ids[m] for m in mids}
+            for (u, v), mids in csr.bypass_index().two_hop.items()
+        } == expected.two_hop
+
+    def test_parallel_path_counts(self, random_org):
+        """CSR graphs work with the process pool."""
+        graph, edge_types, criticality = random_org(50, 120, 5)
+        csr = CSRGraph.from_networkx(graph, edge_types, {})
+
+        assert bypass_risk_counts(csr, criticality, None, 0.5, n_jobs=2) == (
+            bypass_risk_counts(graph, criticality, edge_types, 0.5)
+        )
+
+    def test_compact(self):
+        """Edge storage is a few bytes per edge."""
+        graph = nx.gnm_random_graph(1000, 5000, seed=1, directed=True)
+        csr = CSRGraph.from_networkx(graph, {}, {})
+
+        assert csr.nbytes < 20 * graph.number_of_edges()
+        with pytest.raises(nx.NodeNotFound):
+            list(csr.iter_critical_paths_from("missing"))
@@ -2,14 +2,40 @@
 Unit tests for graph analysis functions.
 """
 
+import math
+
 import networkx as nx
+import pytest
 from src.graph_analysis import (
     find_articulation_points,
+    find_critical_paths,
+    iter_critical_paths,
+    iter_critical_paths_from,
+    build_bypass_index,
+    is_path_bypassable,
     compute_betweenness_centrality,
+    approximate_betweenness_centrality,
+    betweenness_error_bound,
     compute_graph_density,
 )
 
 
+def reference_critical_paths(graph, critical_nodes, edge_types, cutoff=5):
+    """Per-target all_simple_paths loop used before the DFS engine."""
+    paths = []
+    for source in critical_nodes:
+        for target in graph.nodes():
+            if source == target:
+                continue
+            for path in nx.all_simple_paths(graph, source, target, cutoff=cutoff):
+                if any(
+                    edge_types.get((path[i], path[i + 1])) == "approval"
+                    for i in range(len(path) - 1)
+                ):
+                    paths.append(path)
+    return paths
+
+
 class TestGraphAnalysis:
     def test_find_articulation_points_star(self):
         """Test articulation points in star graph."""
@@ -56,3 +82,152 @@ class TestGraphAnalysis:
 
         density = compute_graph_density(graph)
         assert density == 1.0  # Complete graph
+
+
+def reference_is_path_bypassable(path, graph, edge_types):
+    """Node-scanning bypass check used before the shortcut index."""
+    for i in range(len(path)):
+        for j in range(i + 2, len(path)):
+            if graph.has_edge(path[i], path[j]) and edge_types.get((path[i], path[j])) == "bypass":
+                return True
+            for node in graph.nodes():
+                if node in path[i : j + 1]:
+                    continue
+                if (
+                    edge_types.get((path[i], node)) == "bypass"
+                    or edge_types.get((node, path[j])) == "bypass"
+                ) and (graph.has_edge(path[i], node) and graph.has_edge(node, path[j])):
+                    return True
+    return False
+
+
+class TestCriticalPaths:
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_all_simple_paths(self, seed, random_org):
+        """DFS engine returns exactly the paths of the per-target loop, in order."""
+        graph, edge_types, criticality = random_org(40, 90, seed)
+        critical = {node for node, crit in criticality.items() if crit >= 0.7}
+
+        expected = reference_critical_paths(graph, critical, edge_types)
+        assert find_critical_paths(graph, critical, edge_types) == expected
+
+    def test_cutoff(self):
+        """Paths longer than the cutoff are not enumerated."""
+        graph = nx.DiGraph()
+        nx.add_path(graph, ["A", "B", "C", "D"])
+        edge_types = {edge: "approval" for edge in graph.edges()}
+
+        paths = find_critical_paths(graph, {"A"}, edge_types, cutoff=2)
+        assert paths == [["A", "B"], ["A", "B", "C"]]
+
+    def test_requires_approval_edge(self):
+        """Only paths containing an approval edge are critical."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "B"), ("B", "C"), ("A", "D")])
+        edge_types = {("A", "B"): "escalation", ("B", "C"): "approval", ("A", "D"): "bypass"}
+
+        assert list(iter_critical_paths_from(graph, "A", edge_types)) == [["A", "B", "C"]]
+
+    def test_iter_is_lazy(self, random_org):
+        """iter_critical_paths yields the same multiset of paths lazily."""
+        graph, edge_types, criticality = random_org(30, 70, 3)
+        critical = {node for node, crit in criticality.items() if crit >= 0.5}
+
+        paths = iter_critical_paths(graph, critical, edge_types)
+        assert not isinstance(paths, list)
+        assert sorted(paths) == sorted(find_critical_paths(graph, critical, edge_types))
+
+
+class TestBypassIndex:
+    def test_direct_and_two_hop(self):
+        """Index holds bypass edges and the pairs they shortcut."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "B"), ("B", "C"), ("X", "A")])
+        edge_types = {("A", "B"): "bypass", ("B", "C"): "approval", ("X", "A"): "approval"}
+
+        index = build_bypass_index(graph, edge_types)
+        assert index.direct == {("A", "B")}
+        assert index.two_hop == {("A", "C"): {"B"}, ("X", "B"): {"A"}}
+
+    def test_shortcut_through_outside_node(self):
+        """A bypass route through a node off the path makes it bypassable."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "B"), ("B", "C"), ("A", "X"), ("X", "C")])
+        edge_types = {
+            ("A", "B"): "approval",
+            ("B", "C"): "approval",
+            ("A", "X"): "bypass",
+            ("X", "C"): "escalation",
+        }
+
+        assert is_path_bypassable(["A", "B", "C"], graph, edge_types)
+        assert not is_path_bypassable(["A", "X", "C"], graph, edge_types)
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    def test_matches_node_scan(self, seed, random_org):
+        """Verdicts with and without the index are identical to the node-scanning check."""
+        graph, edge_types, criticality = random_org(40, 120, seed)
+        critical = {node for node, crit in criticality.items() if crit >= 0.6}
+        index = build_bypass_index(graph, edge_types)
+
+        paths = find_critical_paths(graph, critical, edge_types, cutoff=4)
+        assert paths
+        for path in paths:
+            expected = reference_is_path_bypassable(path, graph, edge_types)
+            assert is_path_bypassable(path, graph, edge_types, index) == expected
+            assert is_path_bypassable(path, graph, edge_types) == expected
+
+
+class TestApproximateBetweenness:
+    def test_pivots_deterministic(self, random_org):
+        """k-pivot betweenness is reproducible for a fixed seed."""
+        graph, _, _ = random_org(60, 180, 4)
+
+        first = compute_betweenness_centrality(graph, k=10, seed=7)
+        second = compute_betweenness_centrality(graph, k=10, seed=7)
+        assert first == second
+        exact = compute_betweenness_centrality(graph, k=60)
+        assert exact == compute_betweenness_centrality(graph)
+        assert exact == pytest.approx(nx.betweenness_centrality(graph), rel=1e-12, abs=1e-15)
+
+    def test_error_bound_shrinks_with_samples(self):
+        """Hoeffding bound decreases with more pivots and is 0 when exact."""
+        assert betweenness_error_bound(1000, 400) < betweenness_error_bound(1000, 100)
+        assert betweenness_error_bound(1000, 1000) == 0.0
+
+    def test_adaptive_within_bound(self, random_org):
+        """Adaptive estimate stays within its reported error bound."""
+        graph, _, _ = random_org(150, 450, 5)
+        exact = nx.betweenness_centrality(graph)
+
+        scores, info = approximate_betweenness_centrality(graph, epsilon=0.05, max_samples=64)
+
+        assert info["method"] == "adaptive"
+        assert info["samples"] <= 64
+        assert max(abs(scores[v] - exact[v]) for v in graph) <= info["epsilon"]
+
+    @pytest.mark.parametrize("max_samples", [0, 1])
+    def test_rejects_too_few_samples(self, max_samples, random_org):
+        """The variance needs two pivots, so smaller caps are rejected."""
+        graph, _, _ = random_org(150, 450, 5)
+
+        with pytest.raises(ValueError, match="max_samples"):
+            approximate_betweenness_centrality(graph, max_samples=max_samples)
+
+    def test_two_samples(self, random_org):
+        """The smallest cap still gives a finite bound."""
+        graph, _, _ = random_org(150, 450, 5)
+
+        scores, info = approximate_betweenness_centrality(graph, max_samples=2)
+
+        assert info["method"] == "adaptive" and info["samples"] == 2
+        assert math.isfinite(info["epsilon"]) and len(scores) == 150
+
+    def test_adaptive_falls_back_to_exact(self, random_org):
+        """Small graphs are computed exactly instead of sampled."""
+        graph, _, _ = random_org(30, 60, 6)
+
+        scores, info = approximate_betweenness_centrality(graph, epsilon=0.01)
+
+        assert info == {"method": "exact", "samples": 30, "epsilon": 0.0, "delta": 0.1}
+        assert scores == nx.betweenness_centrality(graph)
@@ -2,7 +2,13 @@
 Unit tests for HumanRiskGraph class.
 """
 
+import random
+
+import numpy as np
+import pandas as pd
 import pytest
+from src.encoding import EdgeType
+from src.graph_analysis import build_bypass_index
 from src.hrg import HumanRiskGraph
 
 
@@ -97,3 +103,375 @@ class TestHumanRiskGraph:
 
         # A is critical (0.9 >= 0.7), so this edge should be critical
         assert len(critical_deps) > 0
+
+    def test_analyze_nodes_matches_analyze_node(self):
+        """Batch analysis agrees with per-node analysis."""
+        people = [
+            {"id": "A", "role": "SRE", "criticality": 0.9},
+            {"id": "B", "role": "Engineer", "criticality": 0.7},
+            {"id": "C", "role": "Manager", "criticality": 0.6},
+        ]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+            {"from": "B", "to": "C", "type": "escalation", "weight": 0.7},
+        ]
+
+        hrg = HumanRiskGraph(people, dependencies)
+        table = hrg.analyze_nodes()
+
+        assert list(table["node_id"]) == ["A", "B", "C"]
+        for row, node_id in enumerate(table["node_id"]):
+            analysis = hrg.analyze_node(node_id)
+            for column, value in analysis.items():
+                assert table[column][row] == value
+
+    def test_analyze_nodes_subset(self):
+        """Requested nodes are returned in the requested order."""
+        people = [
+            {"id": "A", "role": "SRE", "criticality": 0.9},
+            {"id": "B", "role": "Engineer", "criticality": 0.5},
+        ]
+        dependencies = [{"from": "A", "to": "B", "type": "approval", "weight": 0.8}]
+
+        hrg = HumanRiskGraph(people, dependencies)
+        table = hrg.analyze_nodes(["B", "A"])
+
+        assert list(table["node_id"]) == ["B", "A"]
+        assert list(table["out_degree"]) == [0, 1]
+
+        with pytest.raises(ValueError):
+            hrg.analyze_nodes(["Z"])
+
+    def test_analyze_node_sampled_betweenness(self):
+        """Sampled betweenness reports its error bound."""
+        people = [{"id": f"P{i}", "role": "Engineer", "criticality": 0.5} for i in range(6)]
+        dependencies = [
+            {"from": f"P{i}", "to": f"P{i + 1}", "type": "approval", "weight": 0.8}
+            for i in range(5)
+        ]
+
+        hrg = HumanRiskGraph(people, dependencies)
+        exact = hrg.analyze_node("P2")
+        sampled = hrg.analyze_node("P2", betweenness_k=3)
+
+        assert "betweenness_error_bound" not in exact
+        assert sampled["betweenness_error_bound"] > 0
+        assert hrg.analyze_node("P2", betweenness_k=3) == sampled
+
+        with pytest.raises(ValueError):
+            hrg.analyze_node("P2", betweenness_k=3, betweenness_epsilon=0.1)
+
+
+def rebuilt(hrg):
+    """Fresh HumanRiskGraph from the current people and dependencies."""
+    return HumanRiskGraph(hrg.people, hrg.dependencies)
+
+
+class TestHumanRiskGraphMutations:
+    def test_random_edits_match_rebuild(self):
+        """Incrementally maintained results equal a from-scratch rebuild."""
+        rng = random.Random(3)
+        people = [
+            {"id": f"P{i}", "role": "Engineer", "criticality": rng.random()} for i in range(15)
+        ]
+        hrg = HumanRiskGraph(people, [])
+        hrg.calculate()
+        next_id = 15
+
+        for _ in range(120):
+            nodes = list(hrg.graph.nodes())
+            action = rng.random()
+            if action < 0.5 and len(nodes) > 1:
+                u, v = rng.sample(nodes, 2)
+                dep_type = rng.choice(["approval", "escalation", "bypass"])
+                hrg.add_dependency(u, v, dep_type, rng.choice([0.2, 0.5, 0.9]))
+            elif action < 0.7 and hrg.graph.number_of_edges():
+                hrg.remove_dependency(*rng.choice(list(hrg.graph.edges())))
+            elif action < 0.8:
+                hrg.add_person(f"P{next_id}", "Engineer", rng.random())
+                next_id += 1
+            elif action < 0.9 and len(nodes) > 2:
+                hrg.remove_person(rng.choice(nodes))
+            else:
+                hrg.update_criticality(rng.choice(nodes), rng.random())
+
+            result = hrg.calculate(critical_threshold=0.6)
+            expected = rebuilt(hrg).calculate(critical_threshold=0.6)
+            assert set(result.pop("articulation_points")) == set(
+                expected.pop("articulation_points")
+            )
+            assert result == pytest.approx(expected)
+            assert hrg.context.bypass_index == build_bypass_index(hrg.graph, hrg.edge_types)
+
+    def test_edits_patch_cached_artifacts(self):
+        """Edits update the cached artifacts instead of rebuilding them."""
+        people = [{"id": name, "role": "Engineer", "criticality": 0.8} for name in "ABCD"]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+            {"from": "B", "to": "C", "type": "approval", "weight": 0.5},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        hrg.calculate()
+        articulation_points = hrg.context.articulation_points
+
+        hrg.add_dependency("C", "D", "bypass", 0.4)
+        assert hrg.context.articulation_points is articulation_points
+        assert articulation_points == {"B", "C"}
+
+        hrg.add_dependency("D", "A", "escalation", 0.4)
+        assert articulation_points == set()
+
+        hrg.remove_person("D")
+        assert hrg.context.articulation_points is articulation_points
+        assert articulation_points == {"B"}
+        assert "D" not in hrg.criticality
+        assert [person["id"] for person in hrg.people] == ["A", "B", "C"]
+
+    def test_view_writes_reach_caches(self):
+        """Reweights and retypes through the views invalidate every cached result."""
+        people = [{"id": name, "role": "Engineer", "criticality": 0.8} for name in "ABCD"]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "approval", "weight": 0.5},
+            {"from": "C", "to": "D", "type": "approval", "weight": 0.5},
+            {"from": "B", "to": "D", "type": "escalation", "weight": 0.5},
+            {"from": "A", "to": "D", "type": "escalation", "weight": 0.5},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        assert hrg.calculate(bypass_method="exact")["decision_concentration"] == 0.0
+
+        hrg.weights[("A", "B")] = 0.1
+        hrg.edge_types[("B", "D")] = "bypass"
+
+        dependencies[0]["weight"] = 0.1
+        dependencies[2]["type"] = "bypass"
+        expected = HumanRiskGraph(people, dependencies)
+        assert hrg.dependencies == dependencies
+        assert hrg.approval_totals == {"A": 0.1, "C": 0.5}
+        assert hrg.calculate(bypass_method="exact") == expected.calculate(bypass_method="exact")
+        assert hrg.context.bypass_index == build_bypass_index(hrg.graph, hrg.edge_types)
+
+    def test_dependencies_keep_extra_keys(self):
+        """The rebuilt dependency list keeps keys other than from/to/type/weight."""
+        people = [{"id": "A"}, {"id": "B"}, {"id": "C"}]
+        hrg = HumanRiskGraph(people, [{"from": "A", "to": "B", "type": "approval", "note": "x"}])
+
+        hrg.add_dependency("B", "C", "escalation", 0.4)
+
+        assert hrg.dependencies == [
+            {"from": "A", "to": "B", "type": "approval", "note": "x", "weight": 0.5},
+            {"from": "B", "to": "C", "type": "escalation", "weight": 0.4},
+        ]
+
+    def test_invalid_edits(self):
+        """Edits referring to unknown people or dependencies raise ValueError."""
+        people = [{"id": "A", "role": "SRE", "criticality": 0.9}]
+        hrg = HumanRiskGraph(people, [])
+
+        with pytest.raises(ValueError):
+            hrg.add_person("A")
+        with pytest.raises(ValueError):
+            hrg.add_dependency("A", "Z")
+        with pytest.raises(ValueError):
+            hrg.remove_dependency("A", "A")
+        with pytest.raises(ValueError):
+            hrg.remove_person("Z")
+        with pytest.raises(ValueError):
+            hrg.update_criticality("Z", 0.5)
+
+
+class TestColumnarConstructors:
+    people = [
+        {"id": "A", "role": "SRE", "criticality": 0.9},
+        {"id": "B", "role": "Engineer", "criticality": 0.7},
+        {"id": "C", "role": "Manager", "criticality": 0.6},
+    ]
+    dependencies = [
+        {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+        {"from": "B", "to": "C", "type": "escalation", "weight": 0.7},
+        {"from": "A", "to": "C", "type": "bypass", "weight": 0.3},
+    ]
+
+    def assert_same(self, hrg, expected):
+        assert list(hrg.graph.nodes(data=True)) == list(expected.graph.nodes(data=True))
+        assert list(hrg.graph.edges(data=True)) == list(expected.graph.edges(data=True))
+        assert hrg.criticality == expected.criticality
+        assert hrg.edge_types == expected.edge_types
+        assert hrg.weights == expected.weights
+        assert hrg.people == expected.people
+        assert hrg.dependencies == expected.dependencies
+        assert hrg.calculate() == expected.calculate()
+
+    def test_from_arrays_matches_dicts(self):
+        """Columnar construction equals construction from dicts."""
+        hrg = HumanRiskGraph.from_arrays(
+            np.array(["A", "B", "C"]),
+            ["SRE", "Engineer", "Manager"],
+            np.array([0.9, 0.7, 0.6]),
+            np.array([0, 1, 0]),
+            np.array([1, 2, 2]),
+            np.array([EdgeType.APPROVAL, EdgeType.ESCALATION, EdgeType.BYPASS], dtype=np.int8),
+            np.array([0.8, 0.7, 0.3]),
+        )
+
+        self.assert_same(hrg, HumanRiskGraph(self.people, self.dependencies))
+
+    def test_from_dataframe_matches_dicts(self):
+        """DataFrame construction accepts type names or codes."""
+        people = pd.DataFrame(self.people)
+        dependencies = pd.DataFrame(self.dependencies)
+        expected = HumanRiskGraph(self.people, self.dependencies)
+
+        self.assert_same(HumanRiskGraph.from_dataframe(people, dependencies), expected)
+
+        dependencies["type"] = [int(EdgeType.APPROVAL), 1, 2]
+        self.assert_same(HumanRiskGraph.from_dataframe(people, dependencies), expected)
+
+    def test_mutations_after_from_arrays(self):
+        """Lazily built lists stay consistent with later edits."""
+        hrg = HumanRiskGraph.from_dataframe(
+            pd.DataFrame(self.people), pd.DataFrame(self.dependencies)
+        )
+        hrg.add_dependency("C", "A", "approval", 0.5)
+        hrg.remove_person("B")
+
+        assert [person["id"] for person in hrg.people] == ["A", "C"]
+        assert hrg.dependencies == [
+            {"from": "A", "to": "C", "type": "bypass", "weight": 0.3},
+            {"from": "C", "to": "A", "type": "approval", "weight": 0.5},
+        ]
+
+    def test_invalid_columns(self):
+        """Bad positions, codes and references raise ValueError."""
+        with pytest.raises(ValueError):
+            HumanRiskGraph.from_arrays(["A"], ["SRE"], [0.9], [0], [1], [0], [0.5])
+        with pytest.raises(ValueError):
+            HumanRiskGraph.from_arrays(["A", "B"], ["SRE"] * 2, [0.9] * 2, [0], [1], [7], [0.5])
+        with pytest.raises(ValueError):
+            HumanRiskGraph.from_dataframe(
+                pd.DataFrame(self.people),
+                pd.DataFrame([{"from": "A", "to": "Z", "type": "approval", "weight": 0.5}]),
+            )
+        with pytest.raises(ValueError):
+            HumanRiskGraph.from_dataframe(
+                pd.DataFrame(self.people),
+                pd.DataFrame([{"from": "A", "to": "B", "type": "review", "weight": 0.5}]),
+            )
+
+
+class TestCalculateSweep:
+    def test_sweep_matches_calculate(self, random_hrg):
+        """Each grid point equals calculate() with the same weights."""
+        hrg = random_hrg(30, 60, 8)
+        steps = np.linspace(0, 1, 11)
+        grid = [(a, b, 1 - a - b) for a in steps for b in steps if a + b <= 1 + 1e-9]
+
+        sweep = hrg.calculate_sweep(grid, critical_threshold=0.5)
+
+        assert sweep["composite_scores"].shape == (len(grid),)
+        for (alpha, beta, gamma), score, level in zip(
+            grid, sweep["composite_scores"], sweep["risk_levels"]
+        ):
+            expected = hrg.calculate(alpha, beta, gamma, critical_threshold=0.5)
+            assert score == expected["composite_score"]
+            assert level == expected["risk_level"]
+
+    def test_sweep_rejects_bad_grid(self):
+        """Rows must be (alpha, beta, gamma) summing to 1."""
+        hrg = HumanRiskGraph([{"id": "A", "role": "SRE", "criticality": 0.9}], [])
+
+        with pytest.raises(ValueError):
+            hrg.calculate_sweep([(0.5, 0.5, 0.5)])
+        with pytest.raises(ValueError):
+            hrg.calculate_sweep([0.4, 0.3, 0.3])
+
+
+class TestThresholdSweep:
+    def test_threshold_sweep_matches_calculate(self, random_hrg):
+        """Each threshold equals calculate() at that threshold."""
+        hrg = random_hrg(30, 60, 9)
+        thresholds = np.linspace(0.5, 0.95, 50)
+
+        sweep = hrg.calculate_threshold_sweep(thresholds)
+
+        for i, threshold in enumerate(thresholds):
+            expected = hrg.calculate(critical_threshold=threshold)
+            assert sweep["bypass_risk"][i] == expected["bypass_risk"]
+            assert sweep["composite_scores"][i] == expected["composite_score"]
+            assert sweep["risk_levels"][i] == expected["risk_level"]
+            assert set(sweep["critical_nodes"][i]) == set(expected["critical_nodes"])
+            assert sweep["critical_counts"][i] == len(expected["critical_nodes"])
+
+    def test_threshold_at_node_criticality(self):
+        """A node whose criticality equals the threshold is critical."""
+        people = [
+            {"id": "A", "role": "SRE", "criticality": 0.7},
+            {"id": "B", "role": "Engineer", "criticality": 0.5},
+        ]
+        dependencies = [{"from": "A", "to": "B", "type": "approval", "weight": 0.8}]
+        hrg = HumanRiskGraph(people, dependencies)
+
+        sweep = hrg.calculate_threshold_sweep([0.5, 0.7, 0.71])
+
+        assert sweep["critical_nodes"] == [["A", "B"], ["A"], []]
+        assert list(sweep["bypass_risk"]) == [0.0, 0.0, 0.0]
+
+
+def scanned_critical_dependencies(hrg, threshold):
+    """Critical dependencies by scanning every edge."""
+    critical = {node for node, crit in hrg.criticality.items() if crit >= threshold}
+    return {
+        (u, v, edge_type)
+        for (u, v), edge_type in hrg.edge_types.items()
+        if u in critical or v in critical
+    }
+
+
+class TestCriticalDependencies:
+    @pytest.mark.parametrize("threshold", [0.0, 0.5, 0.7, 0.9, 1.1])
+    def test_matches_scan(self, threshold, random_hrg):
+        """Each dependency touching a critical node is returned exactly once."""
+        hrg = random_hrg(60, 150, 1)
+
+        result = hrg.get_critical_dependencies(threshold)
+
+        assert len(result) == len(set(result))
+        assert set(result) == scanned_critical_dependencies(hrg, threshold)
+
+    def test_paging(self, random_hrg):
+        """Pages concatenate to the full answer in a stable order."""
+        hrg = random_hrg(40, 90, 2)
+        full = hrg.get_critical_dependencies(0.5)
+
+        pages = [hrg.get_critical_dependencies(0.5, offset, 7) for offset in range(0, 100, 7)]
+
+        assert [dep for page in pages for dep in page] == full
+        assert list(hrg.iter_critical_dependencies(0.5)) == full
+        assert hrg.get_critical_dependencies(0.5, offset=len(full)) == []
+        with pytest.raises(ValueError):
+            hrg.get_critical_dependencies(offset=-1)
+
+    def test_follows_mutations(self):
+        """Added, removed and re-scored edges and direct criticality edits are reflected immediately."""
+        people = [
+            {"id": "A", "criticality": 0.9},
+            {"id": "B", "criticality": 0.2},
+            {"id": "C", "criticality": 0.2},
+        ]
+        dependencies = [{"from": "B", "to": "A", "type": "approval", "weight": 0.8}]
+        hrg = HumanRiskGraph(people, dependencies)
+        assert hrg.get_critical_dependencies() == [("B", "A", "approval")]
+
+        hrg.add_dependency("B", "C", "bypass")
+        hrg.update_criticality("C", 0.8)
+        hrg.remove_dependency("B", "A")
+        assert hrg.get_critical_dependencies() == [("B", "C", "bypass")]
+
+        hrg.remove_person("C")
+        hrg.add_person("D", criticality=0.95)
+        hrg.add_dependency("D", "B", "escalation")
+        assert hrg.get_critical_dependencies() == [("D", "B", "escalation")]
+
+        hrg.criticality["D"] = 0.1
+        assert hrg.get_critical_dependencies() == []
+        hrg.criticality = {"B": 0.95}
+        assert hrg.get_critical_dependencies() == [("D", "B", "escalation")]
@@ -0,0 +1,101 @@
+"""
+Tests for import-time behaviour of the package and CLI.
+
+Each check runs in a fresh interpreter, since this test session has
+already imported everything.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+# Seconds `import src.cli` may take (best of three runs); it took ~0.8s when
+# the CLI imported pyvis and networkx at module load, and ~0.06s lazily
+IMPORT_BUDGET = 0.3
+
+HEAVY = {"numpy", "networkx", "pyvis", "IPython", "jinja2", "matplotlib", "pandas"}
+
+RUN_CLI = """
+import json, sys
+from src.cli import cli
+try:
+    cli(sys.argv[2:])
+except SystemExit:
+    pass
+with open(sys.argv[1], "w") as f:
+    json.dump(sorted(sys.modules), f)
+"""
+
+
+def cli_modules(tmp_path, *args):
+    """Modules imported by running the CLI with args in a new interpreter."""
+    modules_file = tmp_path / "modules.json"
+    subprocess.run(
+        [sys.executable, "-c", RUN_CLI, str(modules_file), *args],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    )
+    modules = set(json.loads(modules_file.read_text()))
+    return modules, {name.split(".")[0] for name in modules}
+
+
+class TestImports:
+    def test_help(self, tmp_path):
+        """--help imports no analysis, report or visualization code."""
+        modules, packages = cli_modules(tmp_path, "--help")
+
+        assert not packages & HEAVY
+        assert {name for name in modules if name.startswith("src.")} == {"src.cli"}
+
+    def test_json_only_analysis(self, tmp_path):
+        """A JSON-only analysis without visualization never loads pyvis or the other commands."""
+        input_file = tmp_path / "org.json"
+        shutil.copy(ROOT / "data" / "example_organization.json", input_file)
+
+        modules, packages = cli_modules(
+            tmp_path, "analyze", str(input_file), "--format", "json", "--no-visualize"
+        )
+
+        assert (tmp_path / "org_report.json").exists()
+        assert packages & HEAVY == {"numpy", "networkx"}
+        assert {"src.hrg", "src.loaders", "src.reports"} <= modules
+        assert not {"src.visualization", "src.batch", "src.server", "src.parallel"} & modules
+
+    def test_package_exports_are_lazy(self):
+        """import src loads nothing heavy; public names still resolve."""
+        code = (
+            "import sys, src; assert 'numpy' not in sys.modules and 'src.hrg' not in sys.modules; "
+            "assert 'HumanRiskGraph' in dir(src); from src import HumanRiskGraph, load_graph; "
+            "assert src.HumanRiskGraph is HumanRiskGraph and 'numpy' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+        import src
+
+        assert set(src.__all__) == set(src._EXPORTS)
+        with pytest.raises(AttributeError):
+            src.no_such_name
+
+    def test_import_time_budget(self):
+        """Importing the CLI stays within IMPORT_BUDGET."""
+        code = (
+            "import time; start = time.perf_counter(); import src.cli; "
+            "print(time.perf_counter() - start)"
+        )
+        timings = [
+            float(
+                subprocess.run(
+                    [sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True
+                ).stdout
+            )
+            for _ in range(3)
+        ]
+
+        assert min(timings) < IMPORT_BUDGET
@@ -0,0 +1,184 @@
+"""
+Unit tests for streaming organization loaders.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+from src.hrg import HumanRiskGraph
+from src.loaders import GraphBuilder, iter_json_records, iter_ndjson_records, load_graph
+
+
+class TestIterJsonRecords:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_matches_json_load(self, chunk_size, random_data):
+        """Records come out in file order whatever the chunk boundaries."""
+        data = random_data(15, 25, 1)
+        data["metadata"] = {"source": "hr", "version": 12345, "tags": ["a", "]"]}
+        text = json.dumps({"metadata": data.pop("metadata"), **data}, indent=2)
+
+        records = list(iter_json_records(io.StringIO(text), chunk_size=chunk_size))
+
+        expected = [("person", p) for p in data["people"]]
+        expected += [("dependency", d) for d in data["dependencies"]]
+        assert records == expected
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 15, 17])
+    def test_numbers_split_across_chunks(self, chunk_size):
+        """Numbers cut off mid-fraction or mid-exponent are read whole."""
+        text = (
+            '{"version": 12.5e3, "scale": -0.25E-2, "people": [{"id": 1, "criticality": 0.75}],'
+            ' "dependencies": [{"from": 1, "to": 1, "weight": 1e0}]}'
+        )
+
+        records = list(iter_json_records(io.StringIO(text), chunk_size=chunk_size))
+
+        data = json.loads(text)
+        assert records == [("person", data["people"][0]), ("dependency", data["dependencies"][0])]
+
+    def test_empty_sections(self):
+        """Empty arrays yield nothing."""
+        text = '{"people": [], "dependencies": [ ]}'
+        assert list(iter_json_records(io.StringIO(text), chunk_size=3)) == []
+
+    def test_missing_section(self):
+        """A document without both arrays is rejected."""
+        with pytest.raises(ValueError, match="people"):
+            list(iter_json_records(io.StringIO('{"people": []}')))
+
+    @pytest.mark.parametrize(
+        "text", ['{"people": [{"id": 1}', '{"people": [{"id": 1} {"id": 2}]}', "[]", '{"a": 1} x']
+    )
+    def test_invalid_json(self, text):
+        """Malformed documents raise JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_records(io.StringIO(text), chunk_size=4))
+
+
+class TestIterNdjsonRecords:
+    def test_classifies_lines(self):
+        """Lines are people or dependencies by their keys; blank lines are skipped."""
+        text = '{"id": "A"}\n\n{"from": "A", "to": "B"}\n{"id": "B", "role": "SRE"}\n'
+
+        records = list(iter_ndjson_records(io.StringIO(text)))
+
+        assert [kind for kind, _ in records] == ["person", "dependency", "person"]
+
+    def test_rejects_other_records(self):
+        """A line that is neither kind reports its line number."""
+        with pytest.raises(ValueError, match="Line 2"):
+            list(iter_ndjson_records(io.StringIO('{"id": "A"}\n{"name": "B"}\n')))
+
+
+class TestGraphBuilder:
+    def test_equals_constructor(self, random_data, assert_same_graph):
+        """Building from records equals the dict constructor."""
+        data = random_data(30, 60, 2)
+        builder = GraphBuilder()
+        for person in data["people"]:
+            builder.add_person(person)
+        for dependency in data["dependencies"]:
+            builder.add_dependency(dependency)
+
+        hrg = builder.build()
+
+        assert len(builder) == 30 and builder.dependency_count == len(data["dependencies"])
+        assert_same_graph(hrg, HumanRiskGraph(data["people"], data["dependencies"]))
+        assert hrg.people == HumanRiskGraph(data["people"], data["dependencies"]).people
+
+    def test_dependencies_before_people(self, assert_same_graph):
+        """Node order follows the people, even when dependencies come first."""
+        builder = GraphBuilder()
+        builder.add_dependency({"from": "B", "to": "A", "type": "approval"})
+        builder.add_dependency({"from": "B", "to": "C"})
+        for node in "ABC":
+            builder.add_person({"id": node})
+
+        hrg = builder.build()
+
+        expected = HumanRiskGraph(
+            [{"id": node} for node in "ABC"],
+            [{"from": "B", "to": "A", "type": "approval"}, {"from": "B", "to": "C"}],
+        )
+        assert_same_graph(hrg, expected)
+
+    def test_constructor_parity(self, assert_same_graph):
+        """Other type names, unlisted people and extra person keys are read like the constructor."""
+        people = [{"id": "A", "name": "Alice", "criticality": 0.9}, {"id": "B"}]
+        dependencies = [
+            {"from": "A", "to": "Z", "type": "review", "weight": 0.4},
+            {"from": "Y", "to": "B", "type": "approval"},
+            {"from": "Z", "to": "A", "type": "review"},
+        ]
+        builder = GraphBuilder()
+        for dependency in dependencies:
+            builder.add_dependency(dependency)
+        for person in people:
+            builder.add_person(person)
+
+        hrg = builder.build()
+
+        expected = HumanRiskGraph(people, dependencies)
+        assert_same_graph(hrg, expected)
+        assert hrg.people == people
+
+    def test_repeated_people(self, assert_same_graph):
+        """A person added again keeps their position and takes the last values."""
+        people = [
+            {"id": "A", "role": "SRE", "criticality": 0.9},
+            {"id": "B", "role": "Dev", "criticality": 0.2},
+            {"id": "A", "criticality": 0.3},
+            {"id": "B", "role": "Lead", "criticality": 0.8},
+            {"id": "B", "role": "Dev", "criticality": 0.6},
+        ]
+        dependencies = [{"from": "A", "to": "B", "type": "approval"}]
+        builder = GraphBuilder()
+        for person in people:
+            builder.add_person(person)
+        builder.add_dependency(dependencies[0])
+
+        hrg = builder.build()
+
+        assert len(builder) == 2
+        assert_same_graph(hrg, HumanRiskGraph(people, dependencies))
+        assert hrg.people == people
+
+    def test_errors(self):
+        """Records without IDs are rejected."""
+        builder = GraphBuilder()
+        with pytest.raises(ValueError, match="id"):
+            builder.add_person({"name": "A"})
+        with pytest.raises(ValueError, match="from"):
+            builder.add_dependency({"to": "A"})
+
+
+class TestLoadGraph:
+    def test_json_and_ndjson(self, tmp_path, random_data, assert_same_graph):
+        """Both file layouts load to the same graph as json.load."""
+        data = random_data(40, 90, 3)
+        json_path = tmp_path / "org.json"
+        json_path.write_text(json.dumps(data))
+        ndjson_path = tmp_path / "org.ndjson"
+        lines = [json.dumps(record) for record in data["dependencies"] + data["people"]]
+        ndjson_path.write_text("\n".join(lines) + "\n")
+
+        expected = HumanRiskGraph(data["people"], data["dependencies"])
+
+        assert_same_graph(load_graph(json_path, chunk_size=100), expected)
+        assert_same_graph(load_graph(ndjson_path), expected)
+        assert_same_graph(load_graph(json_path, format="json"), expected)
+
+    def test_example_file(self, assert_same_graph):
+        """The bundled example loads like it did with json.load."""
+        path = Path(__file__).parent.parent / "data" / "example_organization.json"
+        with open(path) as f:
+            data = json.load(f)
+
+        assert_same_graph(load_graph(path), HumanRiskGraph(data["people"], data["dependencies"]))
+
+    def test_unknown_format(self, tmp_path):
+        """An unknown format is rejected."""
+        with pytest.raises(ValueError):
+            load_graph(tmp_path / "org.csv", format="csv")
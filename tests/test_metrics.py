@@ -2,14 +2,24 @@
 Unit tests for HRG metrics.
 """
 
+import math
+import random
+
+import numpy as np
 import pytest
 import networkx as nx
 from src.metrics import (
+    approval_weight_totals,
     bus_factor_score,
+    decision_concentration_entropy,
     decision_concentration_score,
     bypass_risk_score,
+    bypass_risk_counts,
+    count_bypassable_paths,
     composite_hrg_score,
+    composite_hrg_scores,
     interpret_risk_level,
+    interpret_risk_levels,
 )
 
 
@@ -70,6 +80,65 @@ class TestDecisionConcentrationScore:
         assert 0.0 <= score <= 0.1  # Nearly equal distribution
 
 
+def reference_approval_totals(edge_types, weights):
+    """Per-person approval totals as summed by the original dict loop."""
+    totals = {}
+    for edge, edge_type in edge_types.items():
+        if edge_type == "approval":
+            totals[edge[0]] = totals.get(edge[0], 0.0) + weights.get(edge, 0.0)
+    return list(totals.values())
+
+
+def reference_gini(w):
+    w = sorted(w)
+    n = len(w)
+    if n == 0 or sum(w) == 0:
+        return 0.0
+    return sum((2 * i - n - 1) * w[i - 1] for i in range(1, n + 1)) / (n * sum(w))
+
+
+def reference_entropy(w):
+    if not w or sum(w) == 0:
+        return 0.0
+    p = [w_i / sum(w) for w_i in w]
+    entropy = -sum(p_i * math.log2(p_i) if p_i > 0 else 0 for p_i in p)
+    max_entropy = math.log2(len(p)) if len(p) > 1 else 1.0
+    return 1.0 - entropy / max_entropy
+
+
+class TestVectorizedConcentration:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed):
+        """Vectorized Gini and entropy match the scalar formulas to 1e-12."""
+        rng = random.Random(seed)
+        nodes = [f"P{i}" for i in range(rng.randint(1, 200))]
+        edge_types = {}
+        weights = {}
+        for _ in range(rng.randint(0, 800)):
+            edge = (rng.choice(nodes), rng.choice(nodes))
+            edge_types[edge] = rng.choice(["approval", "escalation", "bypass"])
+            weights[edge] = rng.choice([0.0, rng.random()])
+
+        totals = reference_approval_totals(edge_types, weights)
+        graph = nx.DiGraph(list(edge_types))
+        assert decision_concentration_score(graph, edge_types, weights) == pytest.approx(
+            reference_gini(totals), abs=1e-12
+        )
+        assert decision_concentration_entropy(graph, edge_types, weights) == pytest.approx(
+            reference_entropy(totals), abs=1e-12
+        )
+
+    def test_approval_weight_totals(self):
+        """Approval weights are grouped by integer source index."""
+        totals = approval_weight_totals(
+            np.array([0, 2, 2, 1, 2]),
+            np.array([0, 0, 1, 0, 0], dtype=np.int8),
+            np.array([0.5, 0.25, 9.0, 0.0, 0.5]),
+        )
+
+        assert totals.tolist() == [0.5, 0.0, 0.75]
+
+
 class TestBypassRiskScore:
     def test_no_bypasses(self):
         """BR should be 0 when no bypass edges exist."""
@@ -92,6 +161,42 @@ class TestBypassRiskScore:
         assert score == 0.0
 
 
+class TestBypassRiskCounts:
+    def setup_method(self):
+        self.graph = nx.DiGraph()
+        self.graph.add_edges_from([("A", "B"), ("B", "C"), ("A", "C"), ("D", "B")])
+        self.criticality = {"A": 0.9, "B": 0.5, "C": 0.4, "D": 0.8}
+        self.edge_types = {
+            ("A", "B"): "approval",
+            ("B", "C"): "approval",
+            ("A", "C"): "bypass",
+            ("D", "B"): "approval",
+        }
+
+    def test_counts(self):
+        """Counts cover every critical path and agree with the score."""
+        counts = bypass_risk_counts(self.graph, self.criticality, self.edge_types)
+
+        # A->B, A->B->C (bypassable via A->C), D->B, D->B->C
+        assert counts == {"critical_paths": 4, "bypassable_paths": 1}
+        score = bypass_risk_score(self.graph, self.criticality, self.edge_types)
+        assert score == 0.25
+
+    def test_by_source(self):
+        """Per-source breakdown sums to the totals."""
+        counts = bypass_risk_counts(self.graph, self.criticality, self.edge_types, by_source=True)
+
+        assert counts["by_source"] == {
+            "A": {"critical_paths": 2, "bypassable_paths": 1},
+            "D": {"critical_paths": 2, "bypassable_paths": 0},
+        }
+
+    def test_count_from_generator(self):
+        """count_bypassable_paths consumes any iterable of paths."""
+        paths = (p for p in [["A", "B", "C"], ["D", "B", "C"]])
+        assert count_bypassable_paths(paths, self.graph, self.edge_types) == (1, 2)
+
+
 class TestCompositeScore:
     def test_weights_sum_to_one(self):
         """Weights must sum to 1."""
@@ -104,6 +209,13 @@ class TestCompositeScore:
         expected = 0.4 * 0.6 + 0.3 * 0.4 + 0.3 * 0.2
         assert abs(score - expected) < 1e-10
 
+    def test_unknown_bypass_risk(self):
+        """Without BR, BF and DC are re-weighted instead of counting BR as zero."""
+        score = composite_hrg_score(0.6, 0.4, None, alpha=0.4, beta=0.3, gamma=0.3)
+        assert abs(score - (0.4 * 0.6 + 0.3 * 0.4) / 0.7) < 1e-10
+        with pytest.raises(ValueError):
+            composite_hrg_score(0.6, 0.4, None, alpha=0.0, beta=0.0, gamma=1.0)
+
 
 class TestRiskInterpretation:
     def test_low_risk(self):
@@ -117,3 +229,19 @@ class TestRiskInterpretation:
 
     def test_critical_risk(self):
         assert interpret_risk_level(0.8) == "Critical"
+
+
+class TestVectorizedComposite:
+    def test_risk_levels_match_scalar(self):
+        """Vectorized risk levels agree with interpret_risk_level at the boundaries."""
+        scores = [0.0, 0.29, 0.3, 0.49, 0.5, 0.69, 0.7, 1.0]
+
+        assert list(interpret_risk_levels(scores)) == [interpret_risk_level(s) for s in scores]
+
+    def test_composite_scores_match_scalar(self):
+        """Each row scores exactly like composite_hrg_score."""
+        grid = [(0.4, 0.3, 0.3), (1.0, 0.0, 0.0), (0.2, 0.5, 0.3)]
+
+        scores = composite_hrg_scores(0.1, 0.6, 0.9, grid)
+
+        assert list(scores) == [composite_hrg_score(0.1, 0.6, 0.9, *row) for row in grid]
@@ -0,0 +1,62 @@
+"""
+Unit tests for process-pool execution.
+"""
+
+import networkx as nx
+import pytest
+from src.graph_analysis import compute_betweenness_centrality, find_critical_paths
+from src.hrg import HumanRiskGraph
+from src.metrics import bypass_risk_counts
+from src.parallel import resolve_n_jobs
+
+
+class TestParallel:
+    def test_resolve_n_jobs(self):
+        assert resolve_n_jobs(None) == 1
+        assert resolve_n_jobs(3) == 3
+        assert resolve_n_jobs(-1) >= 1
+        with pytest.raises(ValueError):
+            resolve_n_jobs(0)
+
+    def test_critical_paths_match_serial(self, random_org):
+        """Parallel path enumeration returns the serial list exactly."""
+        graph, edge_types, criticality = random_org(60, 150, 7)
+        critical = {node for node, crit in criticality.items() if crit >= 0.5}
+
+        serial = find_critical_paths(graph, critical, edge_types)
+        assert find_critical_paths(graph, critical, edge_types, n_jobs=2) == serial
+        assert find_critical_paths(graph, critical, edge_types, cutoff=3, n_jobs=3) == (
+            find_critical_paths(graph, critical, edge_types, cutoff=3)
+        )
+
+    def test_path_counts_match_serial(self, random_org):
+        """Parallel counts, including the per-source breakdown, match serial."""
+        graph, edge_types, criticality = random_org(60, 150, 8)
+
+        serial = bypass_risk_counts(graph, criticality, edge_types, 0.5, by_source=True)
+        parallel = bypass_risk_counts(graph, criticality, edge_types, 0.5, by_source=True, n_jobs=2)
+        assert parallel == serial
+
+    def test_betweenness_matches_serial(self, random_org):
+        """Parallel betweenness equals the serial scores exactly, whatever the split."""
+        graph, _, _ = random_org(80, 240, 9)
+
+        serial = compute_betweenness_centrality(graph)
+        two = compute_betweenness_centrality(graph, n_jobs=2)
+        three = compute_betweenness_centrality(graph, n_jobs=3)
+
+        assert two == serial and three == serial
+        assert list(serial) == list(graph)
+        assert serial == pytest.approx(nx.betweenness_centrality(graph), rel=1e-12, abs=1e-15)
+
+    def test_calculate_n_jobs(self, random_org):
+        """calculate(n_jobs=...) gives the same results as serial."""
+        graph, edge_types, criticality = random_org(50, 120, 10)
+        people = [{"id": node, "criticality": criticality[node]} for node in graph]
+        dependencies = [
+            {"from": u, "to": v, "type": edge_types[(u, v)], "weight": 0.5}
+            for u, v in graph.edges()
+        ]
+
+        hrg = HumanRiskGraph(people, dependencies)
+        assert hrg.calculate(n_jobs=2) == hrg.calculate()
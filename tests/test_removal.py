@@ -0,0 +1,94 @@
+"""
+Unit tests for all-nodes removal impact analysis.
+"""
+
+import networkx as nx
+import pytest
+from src.hrg import HumanRiskGraph
+from src.metrics import bus_factor_score
+from src.removal import removal_bus_factors, removal_disconnected_nodes
+
+
+class TestSimulateAllRemovals:
+    @pytest.mark.parametrize("n,m,seed", [(12, 14, 1), (25, 30, 2), (30, 60, 3), (40, 45, 4)])
+    def test_matches_simulate_node_removal(self, n, m, seed, random_hrg):
+        """Every node's impact equals the per-node simulation."""
+        hrg = random_hrg(n, m, seed)
+        impacts = hrg.simulate_all_removals()
+        original_bf = hrg.calculate()["bus_factor"]
+
+        assert list(impacts) == list(hrg.graph.nodes())
+        for node, impact in impacts.items():
+            expected = hrg.simulate_node_removal(node)
+            assert impact["original_score"] == expected["original_score"]
+            assert impact["new_score"] == pytest.approx(expected["new_score"], abs=1e-9)
+            assert impact["score_change"] == pytest.approx(expected["score_change"], abs=1e-9)
+            assert set(impact["disconnected_nodes"]) == set(expected["disconnected_nodes"])
+            assert len(impact["disconnected_nodes"]) == len(expected["disconnected_nodes"])
+
+            reduced = hrg.graph.copy()
+            reduced.remove_node(node)
+            new_bf = bus_factor_score(reduced, hrg.criticality)
+            assert impact["bus_factor_change"] == pytest.approx(new_bf - original_bf, abs=1e-12)
+
+    def test_parallel_matches_serial(self, random_hrg):
+        """Splitting path enumeration across workers gives the same scores."""
+        hrg = random_hrg(30, 50, 5)
+
+        serial = hrg.simulate_all_removals()
+        parallel = hrg.simulate_all_removals(n_jobs=2)
+
+        for node in serial:
+            assert parallel[node]["new_score"] == pytest.approx(serial[node]["new_score"])
+
+    def test_chain(self):
+        """Removing the middle of a chain cuts off the shorter side."""
+        people = [{"id": name, "role": "Engineer", "criticality": 0.8} for name in "ABCDE"]
+        dependencies = [
+            {"from": u, "to": v, "type": "approval", "weight": 0.5}
+            for u, v in ["AB", "BC", "CD", "DE"]
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        impacts = hrg.simulate_all_removals()
+
+        assert impacts["B"]["disconnected_nodes"] == ["A"]
+        assert impacts["C"]["disconnected_nodes"] == ["D", "E"]
+        assert impacts["A"]["disconnected_nodes"] == []
+
+
+class TestRemovalDisconnectedNodes:
+    def test_ties_follow_graph_order(self):
+        """Equal-size pieces keep the one that comes first in graph order."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(["X", "A", "B", "C", "Z"])
+        graph.add_edges_from([("A", "B"), ("B", "C"), ("X", "Z")])
+
+        result = removal_disconnected_nodes(graph)
+
+        assert result["B"] == ["A", "C"]
+        assert result["X"] == ["Z"]
+        assert result["A"] == ["B", "C"]
+
+
+class TestRemovalBusFactors:
+    @pytest.mark.parametrize(
+        "graph",
+        [
+            nx.cycle_graph(8, create_using=nx.DiGraph),
+            nx.DiGraph(nx.wheel_graph(7)),
+            nx.DiGraph(nx.grid_2d_graph(3, 4)),
+            nx.DiGraph([(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 5), (5, 2), (5, 6)]),
+        ],
+        ids=["cycle", "wheel", "grid", "blocks"],
+    )
+    def test_matches_recomputation(self, graph):
+        """Separation pairs and bridges are handled like a recomputed bus factor."""
+        criticality = {node: (i % 5 + 1) / 5 for i, node in enumerate(graph)}
+
+        result = removal_bus_factors(graph, criticality)
+
+        for node in graph:
+            reduced = graph.copy()
+            reduced.remove_node(node)
+            expected = bus_factor_score(reduced, criticality)
+            assert result[node] == pytest.approx(expected, abs=1e-12)
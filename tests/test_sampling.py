@@ -0,0 +1,261 @@
+"""
+Unit tests for the sampling bypass risk estimator and time-bounded calculate().
+"""
+
+import random
+import time
+
+import pytest
+from src.context import AnalysisContext
+from src.graph_analysis import build_bypass_index
+from src.hrg import HumanRiskGraph
+from src.sampling import estimate_bypass_risk, sample_path_counts
+
+
+def critical_sources(hrg, threshold=0.7):
+    return [node for node, crit in hrg.criticality.items() if crit >= threshold]
+
+
+class TestSamplePathCounts:
+    def test_two_walks_average_to_exact(self):
+        """Both possible walks, averaged, give the exact counts."""
+        people = [{"id": name, "role": "Engineer", "criticality": 0.8} for name in "ABCD"]
+        dependencies = [
+            {"from": "A", "to": "B", "type": "escalation", "weight": 0.5},
+            {"from": "B", "to": "C", "type": "approval", "weight": 0.5},
+            {"from": "C", "to": "D", "type": "escalation", "weight": 0.5},
+            {"from": "B", "to": "D", "type": "bypass", "weight": 0.5},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        index = build_bypass_index(hrg.graph, hrg.edge_types)
+
+        # Critical paths: A-B-C and A-B-C-D (bypassed by B->D); A-B-D has no approval
+        counts = hrg.context.source_path_counts(["A"])["A"]
+        estimates = {
+            sample_path_counts(hrg.graph, "A", hrg.edge_types, index, random.Random(seed))
+            for seed in range(20)
+        }
+
+        assert len(estimates) == 2
+        mean = [sum(e[k] for e in estimates) / 2 for k in range(2)]
+        assert tuple(mean) == pytest.approx(counts)
+
+    @pytest.mark.parametrize("n,m,seed", [(20, 35, 1), (30, 60, 2)])
+    def test_unbiased(self, n, m, seed, random_hrg):
+        """Averaged walks converge to the exact per-source counts."""
+        hrg = random_hrg(n, m, seed)
+        index = build_bypass_index(hrg.graph, hrg.edge_types)
+        source = max(hrg.graph, key=hrg.graph.out_degree)
+        bypassable, total = hrg.context.source_path_counts([source])[source]
+
+        rng = random.Random(seed)
+        walks = [
+            sample_path_counts(hrg.graph, source, hrg.edge_types, index, rng) for _ in range(20000)
+        ]
+
+        assert sum(t for _, t in walks) / len(walks) == pytest.approx(total, rel=0.05)
+        assert sum(b for b, _ in walks) / len(walks) == pytest.approx(bypassable, rel=0.05, abs=1)
+
+
+class TestEstimateBypassRisk:
+    @pytest.mark.parametrize("proposal", ["importance", "uniform"])
+    @pytest.mark.parametrize("n,m,seed", [(30, 60, 1), (60, 150, 2)])
+    def test_interval_covers_exact(self, n, m, seed, proposal, random_hrg):
+        """The confidence interval covers the exact bypass risk."""
+        hrg = random_hrg(n, m, seed)
+        exact = hrg.calculate(bypass_method="exact")["bypass_risk"]
+
+        result = estimate_bypass_risk(
+            hrg.graph,
+            critical_sources(hrg),
+            hrg.edge_types,
+            ci_width=0.03,
+            time_budget=None,
+            proposal=proposal,
+            seed=seed,
+        )
+
+        low, high = result["ci"]
+        assert low <= exact <= high
+        assert high - low <= 0.03
+        assert low <= result["estimate"] <= high
+
+    def test_max_samples_and_seed(self, random_hrg):
+        """max_samples bounds the walks and a seed makes results repeatable."""
+        hrg = random_hrg(30, 60, 3)
+        sources = critical_sources(hrg)
+
+        first = estimate_bypass_risk(
+            hrg.graph, sources, hrg.edge_types, ci_width=0, time_budget=None, max_samples=500
+        )
+        second = estimate_bypass_risk(
+            hrg.graph, sources, hrg.edge_types, ci_width=0, time_budget=None, max_samples=500
+        )
+
+        assert first == second
+        assert 500 <= first["samples"] < 500 + 64
+
+    def test_no_sources(self, random_hrg):
+        """Without critical sources the estimate is zero."""
+        hrg = random_hrg(10, 12, 4)
+
+        result = estimate_bypass_risk(hrg.graph, [], hrg.edge_types)
+
+        assert result == {"estimate": 0.0, "ci": (0.0, 0.0), "samples": 0}
+
+    def test_rejects_unbounded(self, random_hrg):
+        """Sampling needs some stopping rule."""
+        hrg = random_hrg(10, 12, 5)
+
+        with pytest.raises(ValueError):
+            estimate_bypass_risk(hrg.graph, ["n0"], hrg.edge_types, ci_width=0, time_budget=None)
+
+
+class TestCalculateBypassMethod:
+    def test_auto_is_exact_under_limit(self, random_hrg):
+        """Below path_limit, auto mode gives the exact score."""
+        hrg = random_hrg(30, 60, 6)
+
+        auto = hrg.calculate(bypass_method="auto")
+        exact = hrg.calculate(bypass_method="exact")
+
+        assert auto["bypass_risk_method"] == "exact"
+        assert auto["bypass_risk"] == exact["bypass_risk"]
+        assert "bypass_risk_ci" not in auto
+
+    def test_exact_by_default(self, random_hrg):
+        """Without bypass_method, BR is counted exactly however many paths there are."""
+        hrg = random_hrg(40, 90, 7)
+
+        result = hrg.calculate(path_limit=10)
+
+        assert result["bypass_risk_method"] == "exact"
+        assert result == hrg.calculate(bypass_method="exact")
+
+    @pytest.mark.parametrize("n_jobs", [None, 2])
+    def test_auto_falls_back_over_limit(self, n_jobs, random_hrg):
+        """Above path_limit, auto mode samples and reports an interval."""
+        hrg = random_hrg(40, 90, 7)
+        exact = hrg.calculate(bypass_method="exact")["bypass_risk"]
+
+        result = random_hrg(40, 90, 7).calculate(
+            bypass_method="auto", path_limit=10, ci_width=0.03, sample_time=None, n_jobs=n_jobs
+        )
+
+        assert result["bypass_risk_method"] == "sampled"
+        low, high = result["bypass_risk_ci"]
+        assert low <= exact <= high
+        assert result["bypass_risk_samples"] > 0
+
+    def test_forced_sampling(self, random_hrg):
+        """bypass_method='sample' samples even small graphs."""
+        hrg = random_hrg(20, 30, 8)
+
+        result = hrg.calculate(bypass_method="sample", sample_time=None)
+
+        assert result["bypass_risk_method"] == "sampled"
+
+    def test_unknown_method(self, random_hrg):
+        """An unknown bypass_method is rejected."""
+        hrg = random_hrg(10, 12, 9)
+
+        with pytest.raises(ValueError):
+            hrg.calculate(bypass_method="guess")
+
+
+class TestBoundedPathCounts:
+    def test_limit(self, random_hrg):
+        """source_path_counts gives up past path_limit and keeps exact counts below it."""
+        hrg = random_hrg(30, 60, 10)
+        sources = critical_sources(hrg)
+        exact = AnalysisContext(hrg.graph, hrg.edge_types).source_path_counts(sources)
+        total = sum(count for _, count in exact.values())
+
+        context = AnalysisContext(hrg.graph, hrg.edge_types)
+        assert context.source_path_counts(sources, path_limit=total - 1) is None
+        assert context.source_path_counts(sources, path_limit=total) == exact
+        assert context.source_path_counts(sources, n_jobs=2, path_limit=total - 1) is None
+        fresh = AnalysisContext(hrg.graph, hrg.edge_types)
+        assert fresh.source_path_counts(sources, n_jobs=2, path_limit=total) == exact
+
+
+class FakeClock:
+    """time.monotonic replacement that advances one second per call."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class TestTimeBudget:
+    def test_generous_budget_is_exact(self, random_hrg):
+        """A budget that is not reached leaves the result exact."""
+        hrg = random_hrg(30, 60, 11)
+        exact = random_hrg(30, 60, 11).calculate(bypass_method="exact")
+
+        result = hrg.calculate(time_budget=60)
+
+        assert result["approximate"] is False
+        assert result["coverage"] == 1.0
+        assert result["bypass_risk"] == exact["bypass_risk"]
+
+    def test_partial_counts(self, monkeypatch, random_hrg):
+        """Counting stops at the deadline and BR covers the counted sources."""
+        hrg = random_hrg(30, 60, 12)
+        sources = critical_sources(hrg)
+        exact = AnalysisContext(hrg.graph, hrg.edge_types).source_path_counts(sources)
+        monkeypatch.setattr("time.monotonic", FakeClock())
+
+        # One clock read before each source: three sources fit before t=4
+        counts, finished = hrg.context.bounded_path_counts(sources, deadline=4.0)
+
+        assert not finished
+        assert counts == {source: exact[source] for source in sources[:3]}
+
+    def test_partial_result(self, monkeypatch, random_hrg):
+        """Out of time, calculate() flags BR as partial with its coverage."""
+        hrg = random_hrg(30, 60, 13)
+        exact = random_hrg(30, 60, 13).calculate(bypass_method="exact")
+        sources = critical_sources(hrg)
+        counts = AnalysisContext(hrg.graph, hrg.edge_types).source_path_counts(sources[:2])
+        monkeypatch.setattr("time.monotonic", FakeClock())
+
+        result = hrg.calculate(deadline=3.0)
+
+        assert result["bypass_risk_method"] == "partial"
+        assert result["approximate"] is True
+        assert result["coverage"] == pytest.approx(2 / len(sources))
+        bypassable = sum(b for b, _ in counts.values())
+        total = sum(t for _, t in counts.values())
+        assert result["bypass_risk"] == pytest.approx(bypassable / total)
+        assert result["bus_factor"] == exact["bus_factor"]
+        assert result["decision_concentration"] == exact["decision_concentration"]
+
+    @pytest.mark.parametrize("n_jobs", [None, 2])
+    def test_expired_deadline(self, n_jobs, random_hrg):
+        """A deadline that has already passed counts nothing."""
+        hrg = random_hrg(30, 60, 14)
+
+        result = hrg.calculate(deadline=time.monotonic() - 1, n_jobs=n_jobs)
+
+        assert result["bypass_risk_method"] == "partial"
+        assert result["coverage"] == 0.0
+        assert result["bypass_risk"] is None
+        weighted = (0.4 * result["bus_factor"] + 0.3 * result["decision_concentration"]) / 0.7
+        assert result["composite_score"] == pytest.approx(weighted)
+
+    def test_budget_bounds_latency(self, monkeypatch, random_hrg):
+        """A dense graph stops at its time budget instead of counting every path."""
+        hrg = random_hrg(300, 1800, 15)
+        clock = FakeClock()
+        monkeypatch.setattr("time.monotonic", clock)
+
+        result = hrg.calculate(bypass_method="exact", time_budget=20.0)
+
+        assert result["approximate"] is True
+        assert 0.0 < result["coverage"] < 1.0
+        # The clock is read before each source and every 1024 paths
+        assert clock.now <= 22.0
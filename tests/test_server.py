@@ -0,0 +1,181 @@
+"""
+Unit tests for the local analysis server.
+"""
+
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+from src.hrg import HumanRiskGraph
+from src.server import AnalysisServer, RequestError, _GraphMissing, _init_worker, _run
+from src.snapshot import MAGIC as SNAPSHOT_MAGIC
+from src.snapshot import save_snapshot
+
+
+@pytest.fixture
+def server():
+    """AnalysisServer on a free port, with its event loop in a thread."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = AnalysisServer(n_jobs=1, cache_size=2)
+    asyncio.run_coroutine_threadsafe(server.start("127.0.0.1", 0), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=30)
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    payload = json.loads(response.read())
+    conn.close()
+    return response, payload
+
+
+def round_trip(value):
+    return json.loads(json.dumps(value, default=list))
+
+
+class TestAnalysisServer:
+    def test_upload_and_query(self, server, random_data):
+        """Queries on an uploaded graph match calling HumanRiskGraph directly."""
+        data = random_data(25, 50, 1)
+        hrg = HumanRiskGraph(data["people"], data["dependencies"])
+        node = data["people"][0]["id"]
+
+        response, loaded = request(server, "POST", "/graphs", json.dumps(data))
+        assert response.status == 200
+        assert loaded["people"] == 25
+        graph = f"/graphs/{loaded['graph_id']}"
+
+        _, results = request(server, "GET", f"{graph}/calculate?alpha=0.5&beta=0.25&gamma=0.25")
+        assert results == round_trip(hrg.calculate(alpha=0.5, beta=0.25, gamma=0.25))
+        _, analysis = request(server, "GET", f"{graph}/nodes/{node}")
+        assert analysis == round_trip(hrg.analyze_node(node))
+        _, removal = request(server, "GET", f"{graph}/removal/{node}")
+        assert removal == round_trip(hrg.simulate_node_removal(node))
+
+    def test_repeated_queries_hit_cache(self, server, random_data):
+        """Uploading the same content again reuses the graph; repeated queries reuse results."""
+        body = json.dumps(random_data(20, 40, 2))
+        _, first = request(server, "POST", "/graphs", body)
+        _, second = request(server, "POST", "/graphs", body)
+        assert first == second
+
+        response, _ = request(server, "POST", "/calculate", body)
+        assert response.getheader("X-Cache") == "miss"
+        response, _ = request(server, "GET", f"/graphs/{first['graph_id']}/calculate")
+        assert response.getheader("X-Cache") == "hit"
+
+    def test_keep_alive(self, server):
+        """Several requests share one connection."""
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=30)
+        for _ in range(3):
+            conn.request("GET", "/health")
+            response = conn.getresponse()
+            assert json.loads(response.read())["status"] == "ok"
+        conn.close()
+
+    def test_ndjson_and_integer_ids(self, server):
+        """NDJSON uploads work and integer IDs resolve from the URL."""
+        lines = [json.dumps({"id": i, "criticality": 0.8}) for i in range(3)]
+        lines += [json.dumps({"from": 0, "to": i, "type": "approval"}) for i in (1, 2)]
+        headers = {"Content-Type": "application/x-ndjson"}
+
+        _, loaded = request(server, "POST", "/graphs", "\n".join(lines), headers)
+        response, analysis = request(server, "GET", f"/graphs/{loaded['graph_id']}/nodes/0")
+
+        assert loaded["dependencies"] == 2
+        assert response.status == 200 and analysis["out_degree"] == 2
+
+    def test_snapshot_upload(self, server, tmp_path, random_data):
+        """Uploaded snapshots are recognized, calculated on and analyzed by node."""
+        data = random_data(25, 50, 3)
+        hrg = HumanRiskGraph(data["people"], data["dependencies"])
+        save_snapshot(hrg, tmp_path / "org.hrgs")
+        node = data["people"][0]["id"]
+
+        response, loaded = request(server, "POST", "/graphs", (tmp_path / "org.hrgs").read_bytes())
+        assert response.status == 200 and loaded["people"] == 25
+        graph = f"/graphs/{loaded['graph_id']}"
+
+        _, results = request(server, "GET", f"{graph}/calculate")
+        expected = round_trip(hrg.calculate())
+        assert set(results.pop("articulation_points")) == set(expected.pop("articulation_points"))
+        assert results == pytest.approx(expected)
+        _, analysis = request(server, "GET", f"{graph}/nodes/{node}")
+        assert analysis == round_trip(hrg.analyze_node(node))
+
+        response, payload = request(server, "POST", "/graphs", SNAPSHOT_MAGIC + b"garbage")
+        assert response.status == 400 and "snapshot" in payload["error"]
+
+    def test_worker_crash_replaces_pool_once(self, server, random_data):
+        """A crashed pool fails its request and is replaced by a single new pool."""
+        _, loaded = request(server, "POST", "/graphs", json.dumps(random_data(5, 5, 5)))
+        broken = server._pool
+        for process in list(broken._processes.values()):
+            process.kill()
+
+        response, _ = request(server, "GET", f"/graphs/{loaded['graph_id']}/calculate")
+        assert response.status == 500
+        replacement = server._pool
+        assert replacement is not broken
+
+        response, _ = request(server, "GET", f"/graphs/{loaded['graph_id']}/calculate")
+        assert response.status == 200
+        assert server._pool is replacement
+
+    def test_lru_eviction(self, server, random_data):
+        """The least recently used graph is dropped beyond cache_size."""
+        ids = []
+        for seed in range(3):
+            _, loaded = request(server, "POST", "/graphs", json.dumps(random_data(5, 5, seed)))
+            ids.append(loaded["graph_id"])
+
+        assert request(server, "GET", f"/graphs/{ids[0]}/calculate")[0].status == 404
+        assert request(server, "GET", f"/graphs/{ids[2]}/calculate")[0].status == 200
+
+    @pytest.mark.parametrize(
+        "method,path,body,status",
+        [
+            ("POST", "/graphs", '{"people": [', 400),
+            ("POST", "/graphs", '{"people": []}', 400),
+            ("GET", "/graphs/unknown/calculate", None, 404),
+            ("GET", "/graphs/GRAPH/nodes/nobody", None, 404),
+            ("GET", "/graphs/GRAPH/calculate?colour=red", None, 400),
+            ("GET", "/graphs/GRAPH/calculate?bypass_method=guess", None, 400),
+            ("GET", "/graphs/GRAPH/calculate?alpha=[1]", None, 400),
+            ("DELETE", "/graphs/GRAPH", None, 404),
+        ],
+    )
+    def test_errors(self, server, method, path, body, status, random_data):
+        """Bad uploads and queries get an error status and message."""
+        _, loaded = request(server, "POST", "/graphs", json.dumps(random_data(5, 5, 4)))
+
+        response, payload = request(server, method, path.replace("GRAPH", loaded["graph_id"]), body)
+
+        assert response.status == status
+        assert "error" in payload
+
+
+class TestWorker:
+    def test_worker_cache(self, random_data):
+        """Workers rebuild a graph only when sent its content."""
+        _init_worker(cache_size=1)
+        first = json.dumps(random_data(5, 5, 1)).encode()
+        second = json.dumps(random_data(5, 5, 2)).encode()
+
+        _run("a", first, "json", "load", None, {})
+        assert json.loads(_run("a", None, "json", "calculate", None, {}))["composite_score"] >= 0
+        _run("b", second, "json", "load", None, {})
+
+        with pytest.raises(_GraphMissing):
+            _run("a", None, "json", "calculate", None, {})
+        with pytest.raises(RequestError):
+            _run("b", None, "json", "analyze_node", "missing", {})
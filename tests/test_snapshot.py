@@ -0,0 +1,162 @@
+"""
+Unit tests for binary graph snapshots.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+from src.hrg import HumanRiskGraph
+from src.loaders import load_graph
+from src.snapshot import load_snapshot, save_snapshot
+
+
+class TestSnapshot:
+    def test_round_trip(self, tmp_path, random_hrg, assert_same_graph):
+        """A loaded snapshot rebuilds the same graph, in the same order."""
+        hrg = random_hrg(40, 90, 1)
+        path = tmp_path / "org.hrgs"
+
+        save_snapshot(hrg, path)
+        snapshot = load_snapshot(path)
+
+        assert snapshot.number_of_nodes() == 40
+        assert snapshot.number_of_edges() == hrg.graph.number_of_edges()
+        assert_same_graph(snapshot.to_hrg(), hrg)
+        assert_same_graph(load_graph(path), hrg)
+
+    def test_after_mutations(self, tmp_path, random_hrg, assert_same_graph):
+        """Removed people and dependencies are left out; edited ones keep their values."""
+        hrg = random_hrg(30, 70, 2)
+        hrg.remove_person("P3")
+        for u, v in list(hrg.edge_types)[:10]:
+            hrg.remove_dependency(u, v)
+        hrg.add_dependency("P0", "P1", "bypass", 0.9)
+        hrg.update_criticality("P2", 0.99)
+        path = tmp_path / "org.hrgs"
+
+        save_snapshot(hrg, path)
+
+        assert_same_graph(load_snapshot(path).to_hrg(), hrg)
+
+    def test_extra_types_and_unlisted_people(self, tmp_path, assert_same_graph):
+        """Other type names and people named only by dependencies round-trip."""
+        people = [{"id": "A", "criticality": 0.9}, {"id": "B", "criticality": 0.8}]
+        dependencies = [
+            {"from": "A", "to": "Z", "type": "review", "weight": 0.4},
+            {"from": "Y", "to": "B", "type": "approval"},
+            {"from": "B", "to": "A", "type": "bypass"},
+            {"from": "Z", "to": "A", "type": "consult"},
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+        path = tmp_path / "org.hrgs"
+
+        save_snapshot(hrg, path)
+        snapshot = load_snapshot(path)
+
+        assert snapshot.number_of_nodes() == 4 and snapshot.n_people == 2
+        assert snapshot.type_names == ["review", "consult"]
+        assert_same_graph(snapshot.to_hrg(), hrg)
+        assert snapshot.to_csr().type_names == hrg.to_csr().type_names
+        results = snapshot.calculate(critical_threshold=0.0)
+        expected = hrg.calculate(critical_threshold=0.0)
+        assert set(results.pop("articulation_points")) == set(expected.pop("articulation_points"))
+        assert results == pytest.approx(expected)
+
+    def test_integer_ids_and_roles(self, tmp_path):
+        """Integer IDs stay integers and roles round-trip."""
+        people = [
+            {"id": i, "role": ["SRE", "Manager"][i % 2], "criticality": i / 10} for i in range(5)
+        ]
+        dependencies = [{"from": i, "to": (i + 1) % 5, "type": "approval"} for i in range(5)]
+        hrg = HumanRiskGraph(people, dependencies)
+        path = tmp_path / "org.hrgs"
+
+        save_snapshot(hrg, path)
+        loaded = load_snapshot(path).to_hrg()
+
+        assert list(loaded.graph) == [0, 1, 2, 3, 4]
+        assert loaded.people == people
+
+    def test_csr_view(self, tmp_path, random_hrg):
+        """to_csr maps the file and matches HumanRiskGraph.to_csr."""
+        hrg = random_hrg(30, 60, 3)
+        path = tmp_path / "org.hrgs"
+        save_snapshot(hrg, path)
+        snapshot = load_snapshot(path)
+
+        csr = snapshot.to_csr()
+        expected = hrg.to_csr()
+
+        assert csr.ids == expected.ids
+        np.testing.assert_array_equal(csr.indptr, expected.indptr)
+        np.testing.assert_array_equal(csr.indices, expected.indices)
+        np.testing.assert_array_equal(csr.edge_types, expected.edge_types)
+        np.testing.assert_array_equal(csr.weights, expected.weights)
+        assert not csr.weights.flags.writeable
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {
+                "critical_threshold": 0.3,
+                "bypass_method": "auto",
+                "path_limit": 50,
+                "sample_time": None,
+            },
+        ],
+    )
+    def test_calculate_on_csr(self, tmp_path, monkeypatch, kwargs, random_hrg):
+        """calculate matches HumanRiskGraph.calculate; the DiGraph is built only to sample."""
+        hrg = random_hrg(40, 100, 5)
+        path = tmp_path / "org.hrgs"
+        save_snapshot(hrg, path)
+        snapshot = load_snapshot(path)
+        expected = snapshot.to_hrg().calculate(**kwargs)
+        sampled = expected["bypass_risk_method"] == "sampled"
+        if not sampled:
+            monkeypatch.setattr(type(snapshot), "to_hrg", None)
+
+        results = snapshot.calculate(**kwargs)
+
+        assert sampled == ("path_limit" in kwargs)
+        assert set(results.pop("articulation_points")) == set(expected.pop("articulation_points"))
+        assert results == pytest.approx(expected)
+
+    def test_pickle_reopens(self, tmp_path, random_hrg):
+        """Pickling sends the path, not the arrays."""
+        hrg = random_hrg(20, 30, 4)
+        path = tmp_path / "org.hrgs"
+        save_snapshot(hrg, path)
+        snapshot = load_snapshot(path)
+
+        payload = pickle.dumps(snapshot)
+
+        assert len(payload) < 200
+        np.testing.assert_array_equal(pickle.loads(payload).weights, snapshot.weights)
+
+    def test_empty_graph(self, tmp_path):
+        """A graph without people or dependencies round-trips."""
+        path = tmp_path / "empty.hrgs"
+
+        save_snapshot(HumanRiskGraph([], []), path)
+
+        assert load_snapshot(path).to_hrg().graph.number_of_nodes() == 0
+
+    def test_rejects(self, tmp_path):
+        """Unsupported graphs and non-snapshot files are rejected."""
+        mixed = HumanRiskGraph([{"id": "A"}, {"id": 1}], [])
+        with pytest.raises(ValueError):
+            save_snapshot(mixed, tmp_path / "mixed.hrgs")
+
+        numbered_type = HumanRiskGraph(
+            [{"id": "A"}, {"id": "B"}], [{"from": "A", "to": "B", "type": 7}]
+        )
+        with pytest.raises(ValueError):
+            save_snapshot(numbered_type, tmp_path / "numbered.hrgs")
+
+        other = tmp_path / "org.json"
+        other.write_text('{"people": [], "dependencies": []}')
+        with pytest.raises(ValueError):
+            load_snapshot(other)
@@ -0,0 +1,223 @@
+"""
+Unit tests for compact edge storage.
+"""
+
+import copy
+import pickle
+from collections.abc import MutableMapping
+
+import networkx as nx
+import pytest
+from src.hrg import HumanRiskGraph
+from src.store import EdgeRecord, EdgeStore
+
+
+def reference_dicts(dependencies):
+    """edge_types and weights as the plain dicts the constructor used to build."""
+    edge_types = {(d["from"], d["to"]): d.get("type", "unknown") for d in dependencies}
+    weights = {(d["from"], d["to"]): d.get("weight", 0.5) for d in dependencies}
+    return edge_types, weights
+
+
+class TestEdgeViews:
+    dependencies = [
+        {"from": "A", "to": "B", "type": "approval", "weight": 0.8},
+        {"from": "B", "to": "C", "type": "review", "weight": 0.3},
+        {"from": "A", "to": "C"},
+        {"from": "A", "to": "B", "type": "bypass", "weight": 0.1},
+    ]
+
+    def test_match_plain_dicts(self):
+        """Views equal the dicts, in the same order, including repeated and unknown types."""
+        hrg = HumanRiskGraph([{"id": "A"}, {"id": "B"}, {"id": "C"}], self.dependencies)
+        edge_types, weights = reference_dicts(self.dependencies)
+
+        assert hrg.edge_types == edge_types
+        assert hrg.weights == weights
+        assert list(hrg.edge_types.items()) == list(edge_types.items())
+        assert list(hrg.weights) == list(weights)
+        assert hrg.edge_types[("B", "C")] == "review"
+        assert hrg.edge_types.get(("C", "A")) is None
+        assert ("A", "C") in hrg.weights and ("C", "A") not in hrg.weights
+        with pytest.raises(KeyError):
+            hrg.weights[("C", "A")]
+
+    def test_graph_attributes(self):
+        """Graph edge data reads from the store and copies to plain dicts."""
+        hrg = HumanRiskGraph([{"id": "A"}, {"id": "B"}, {"id": "C"}], self.dependencies)
+
+        assert hrg.graph.edges["A", "B"] == {"edge_type": "bypass", "weight": 0.1}
+        hrg.graph.edges["A", "B"]["color"] = "red"
+        assert hrg.graph.edges["A", "B"]["color"] == "red"
+
+        exported = hrg.export_graph()
+        assert type(exported.edges["A", "B"]) is dict
+        undirected = hrg.graph.to_undirected()
+        assert type(undirected.edges["A", "B"]) is dict
+        assert nx.utils.edges_equal(exported.edges(data=True), hrg.graph.edges(data=True))
+
+    def test_pickle_round_trip(self, random_hrg):
+        """Pickled graphs (as sent to worker processes) keep their views working."""
+        hrg = random_hrg(20, 30, 1)
+
+        graph, edge_types = pickle.loads(pickle.dumps((hrg.graph, hrg.edge_types)))
+
+        assert edge_types == hrg.edge_types
+        for u, v in graph.edges():
+            assert graph.edges[u, v]["edge_type"] == edge_types[(u, v)]
+
+    def test_assign_existing_edge(self):
+        """Assigning through a view updates the edge; unknown edges are rejected."""
+        hrg = HumanRiskGraph([{"id": "A"}, {"id": "B"}, {"id": "C"}], self.dependencies)
+        assert isinstance(hrg.edge_types, MutableMapping)
+        assert not isinstance(hrg.edge_types, dict)
+        assert type(dict(hrg.edge_types)) is dict
+
+        hrg.weights[("A", "C")] = 0.9
+        hrg.edge_types[("A", "C")] = "approval"
+
+        assert hrg.graph.edges["A", "C"] == {"edge_type": "approval", "weight": 0.9}
+        with pytest.raises(KeyError):
+            hrg.weights[("C", "A")] = 0.5
+
+    def test_delete_rejected(self):
+        """Deleting through a view is refused; the edge keeps its type and weight."""
+        hrg = HumanRiskGraph([{"id": "A"}, {"id": "B"}, {"id": "C"}], self.dependencies)
+
+        for view in (hrg.edge_types, hrg.weights):
+            with pytest.raises(TypeError):
+                del view[("A", "C")]
+
+        assert hrg.graph.edges["A", "C"] == {"edge_type": "unknown", "weight": 0.5}
+
+
+class TestEdgeStore:
+    def test_mutations_track_dicts(self, random_hrg):
+        """Adding and removing dependencies keeps the views equal to plain dicts."""
+        hrg = random_hrg(30, 60, 2)
+        edge_types, weights = reference_dicts(hrg.dependencies)
+
+        for u, v in list(hrg.edge_types)[:20]:
+            hrg.remove_dependency(u, v)
+            del edge_types[(u, v)], weights[(u, v)]
+        hrg.add_dependency("P0", "P1", "approval", 0.25)
+        edge_types[("P0", "P1")] = "approval"
+        weights[("P0", "P1")] = 0.25
+        hrg.remove_person("P2")
+        for edge in [edge for edge in edge_types if "P2" in edge]:
+            del edge_types[edge], weights[edge]
+
+        assert list(hrg.edge_types.items()) == list(edge_types.items())
+        assert list(hrg.weights.items()) == list(weights.items())
+
+    def test_compaction(self):
+        """Removing most edges compacts the arrays and keeps lookups valid."""
+        people = [{"id": i} for i in range(100)]
+        dependencies = [
+            {"from": i, "to": j, "type": "approval", "weight": i / 100}
+            for i in range(100)
+            for j in range(i + 1, min(i + 30, 100))
+        ]
+        hrg = HumanRiskGraph(people, dependencies)
+
+        for dep in dependencies[::3] + dependencies[1::3]:
+            hrg.remove_dependency(dep["from"], dep["to"])
+
+        store = hrg._edges
+        assert len(store) == len(dependencies[2::3])
+        assert len(store.records) < len(dependencies)
+        assert hrg.weights == {(d["from"], d["to"]): d["weight"] for d in dependencies[2::3]}
+
+    def test_removed_record_keeps_values(self):
+        """A record detached from the store still reads its last values."""
+        store = EdgeStore()
+        graph = nx.DiGraph()
+        store.set_edge(graph, "A", "B", "escalation", 0.4)
+        record = graph.edges["A", "B"]
+
+        store.remove(graph, "A", "B")
+
+        assert isinstance(record, EdgeRecord)
+        assert dict(record) == {"edge_type": "escalation", "weight": 0.4}
+        assert copy.deepcopy(record) == {"edge_type": "escalation", "weight": 0.4}
+
+    def test_compact_footprint(self, random_hrg):
+        """Typed arrays take 17 bytes per edge."""
+        hrg = random_hrg(40, 80, 3)
+
+        assert hrg._edges.nbytes == 17 * hrg.graph.number_of_edges()
+
+
+def scanned(hrg, edge_type):
+    """Edges of one type, by scanning every edge."""
+    return {edge for edge, kind in hrg.edge_types.items() if kind == edge_type}
+
+
+class TestTypeIndex:
+    def test_matches_scan_after_mutations(self, random_hrg):
+        """The per-type adjacency tracks additions, removals and type changes."""
+        hrg = random_hrg(40, 120, 4)
+        edges = list(hrg.edge_types)
+        # Build the indexes first, so the mutations below have to maintain them
+        hrg._edges.index_types(["approval", "bypass"], incoming=True)
+
+        for u, v in edges[:30]:
+            hrg.remove_dependency(u, v)
+        hrg.add_dependency(*edges[0], "bypass", 0.4)
+        hrg.add_dependency(*edges[40], "approval", 0.4)
+        hrg.edge_types[edges[41]] = "bypass"
+        hrg.graph.edges[edges[42]]["edge_type"] = "approval"
+        hrg.remove_person("P5")
+
+        for edge_type in ("approval", "bypass", "escalation"):
+            expected = scanned(hrg, edge_type)
+            assert set(hrg.edge_types.edges_of_type(edge_type)) == expected
+            adjacency = hrg.edge_types.out_adjacency(edge_type)
+            assert {(u, v) for u, targets in adjacency.items() for v in targets} == expected
+            for node in hrg.graph:
+                assert set(hrg.edge_types.successors(node, edge_type)) == {
+                    v for u, v in expected if u == node
+                }
+                assert set(hrg.edge_types.predecessors(node, edge_type)) == {
+                    u for u, v in expected if v == node
+                }
+
+    def test_from_arrays_and_extra_types(self):
+        """Types are indexed on first query, in-edges only when asked for."""
+        hrg = HumanRiskGraph.from_arrays(
+            ["A", "B", "C"],
+            ["Engineer"] * 3,
+            [0.8, 0.5, 0.9],
+            src=[0, 1, 0, 2],
+            dst=[1, 2, 2, 0],
+            type_codes=[0, 2, 0, 1],
+            weight=[0.5, 0.5, 0.5, 0.5],
+        )
+        assert not hrg._edges.out_index
+        assert set(hrg.edge_types.edges_of_type("approval")) == scanned(hrg, "approval")
+        assert set(hrg.edge_types.edges_of_type("bypass")) == scanned(hrg, "bypass")
+        assert len(hrg._edges.out_index) == 2 and not hrg._edges.in_index
+
+        hrg.add_dependency("B", "A", "review", 0.3)
+        assert list(hrg.edge_types.edges_of_type("review")) == [("B", "A")]
+        hrg.add_dependency("C", "B", "review", 0.3)
+        assert hrg.edge_types.predecessors("B", "review").keys() == {"C"}
+        assert list(hrg.edge_types.edges_of_type("audit")) == []
+
+    def test_metrics_match_plain_dicts(self, random_hrg):
+        """Metrics give the same scores through the index and through plain dicts."""
+        from src.graph_analysis import build_bypass_index
+        from src.metrics import bypass_risk_score, decision_concentration_score
+
+        hrg = random_hrg(40, 90, 5)
+        edge_types, weights = dict(hrg.edge_types.items()), dict(hrg.weights.items())
+
+        assert decision_concentration_score(
+            hrg.graph, hrg.edge_types, hrg.weights
+        ) == decision_concentration_score(hrg.graph, edge_types, weights)
+        assert build_bypass_index(hrg.graph, hrg.edge_types) == build_bypass_index(
+            hrg.graph, edge_types
+        )
+        assert bypass_risk_score(hrg.graph, hrg.criticality, hrg.edge_types) == bypass_risk_score(
+            hrg.graph, hrg.criticality, edge_types
+        )
@@ -0,0 +1,96 @@
+"""
+Unit tests for Monte Carlo uncertainty analysis.
+"""
+
+import numpy as np
+import pytest
+from src.hrg import HumanRiskGraph
+from src.uncertainty import METRICS, NoiseModel, score_replicates
+
+
+def perturbed(hrg, criticality, weights):
+    """HumanRiskGraph with the same topology and the given values."""
+    people = [
+        {"id": node, "role": "Engineer", "criticality": crit}
+        for node, crit in zip(hrg.criticality, criticality)
+    ]
+    dependencies = [
+        {"from": u, "to": v, "type": hrg.edge_types[(u, v)], "weight": weight}
+        for (u, v), weight in zip(hrg.weights, weights)
+    ]
+    return HumanRiskGraph(people, dependencies)
+
+
+class TestScoreReplicates:
+    @pytest.mark.parametrize("n,m,seed", [(15, 20, 1), (30, 45, 2), (40, 80, 3)])
+    def test_matches_calculate(self, n, m, seed, random_hrg):
+        """Each replicate scores exactly like calculate() on the perturbed graph."""
+        hrg = random_hrg(n, m, seed)
+        rng = np.random.default_rng(seed)
+        crit = NoiseModel("uniform", 0.3).sample(
+            np.fromiter(hrg.criticality.values(), dtype=float), rng, 5
+        )
+        weights = NoiseModel("normal", 0.2).sample(
+            np.fromiter(hrg.weights.values(), dtype=float), rng, 5
+        )
+
+        samples = score_replicates(hrg, crit, weights, critical_threshold=0.6)
+
+        for i in range(5):
+            expected = perturbed(hrg, crit[i], weights[i]).calculate(critical_threshold=0.6)
+            for metric in METRICS:
+                assert samples[metric][i] == pytest.approx(expected[metric], abs=1e-12)
+
+
+class TestCalculateUncertainty:
+    def test_zero_noise_matches_point_estimate(self, random_hrg):
+        """With no noise every percentile equals the calculate() value."""
+        hrg = random_hrg(25, 35, 4)
+        expected = hrg.calculate()
+
+        result = hrg.calculate_uncertainty(
+            n_replicates=20, criticality_noise=None, weight_noise=None
+        )
+
+        for metric in METRICS:
+            assert result[metric]["std"] == pytest.approx(0.0, abs=1e-12)
+            for value in result[metric]["percentiles"].values():
+                assert value == pytest.approx(expected[metric], abs=1e-12)
+        assert result["risk_levels"][expected["risk_level"]] == 1.0
+
+    def test_seeded_and_reproducible(self, random_hrg):
+        """The same seed gives the same samples, with or without workers."""
+        hrg = random_hrg(30, 50, 5)
+
+        first = hrg.calculate_uncertainty(n_replicates=300, seed=7, return_samples=True)
+        second = random_hrg(30, 50, 5).calculate_uncertainty(
+            n_replicates=300, seed=7, n_jobs=2, return_samples=True
+        )
+        other = hrg.calculate_uncertainty(n_replicates=300, seed=8, return_samples=True)
+
+        for metric in METRICS:
+            np.testing.assert_array_equal(first["samples"][metric], second["samples"][metric])
+        assert not np.array_equal(
+            first["samples"]["composite_score"], other["samples"]["composite_score"]
+        )
+
+    def test_summary_shape(self, random_hrg):
+        """Percentiles are ordered and risk level fractions sum to one."""
+        hrg = random_hrg(20, 30, 6)
+
+        result = hrg.calculate_uncertainty(n_replicates=500, percentiles=(10, 50, 90))
+
+        assert result["n_replicates"] == 500
+        for metric in METRICS:
+            points = result[metric]["percentiles"]
+            assert list(points) == [10, 50, 90]
+            assert points[10] <= points[50] <= points[90]
+            assert 0.0 <= points[10] and points[90] <= 1.0
+        assert sum(result["risk_levels"].values()) == pytest.approx(1.0)
+
+    def test_unknown_distribution(self, random_hrg):
+        """An unknown noise distribution is rejected."""
+        hrg = random_hrg(10, 12, 7)
+
+        with pytest.raises(ValueError):
+            hrg.calculate_uncertainty(n_replicates=5, weight_noise=NoiseModel("cauchy", 0.1))